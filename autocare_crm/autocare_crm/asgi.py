@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+실시간 통계 스트림(crm.views.live_stream, LIVE_EVENTS_TRANSPORT='sse')은 이 ASGI 앱으로
+실행할 때만 동작한다. WSGI(gunicorn 동기 워커)로 배포하면 LIVE_EVENTS_TRANSPORT='poll'(기본값)로 두고
+대시보드가 crm.views.live_events_api 를 주기적으로 조회하도록 한다.
 """
 
 import os
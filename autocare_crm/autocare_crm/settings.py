@@ -27,13 +27,14 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'crm.middleware.RequestMetricsMiddleware',  # 요청별 성능 측정
 ]
 
 ROOT_URLCONF = 'autocare_crm.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'crm.metrics.InstrumentedDjangoTemplates',  # 렌더링 시간 측정용 DjangoTemplates
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -91,6 +92,9 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# 업로드 파일 저장 위치 (백그라운드 업로드 작업 원본 파일)
+MEDIA_ROOT = config('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # 로그인 설정
@@ -99,15 +103,54 @@ LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/login/'
 
 # 캐싱 (메모리 캐시)
+# shared: gunicorn 워커 간 공유 캐시 (사이드바 통계 등)
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'autocare-crm-cache',
-    }
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('SHARED_CACHE_DIR', default=str(BASE_DIR / 'cache')),
+    },
 }
 
+# 요청별 성능 측정 (URL 이름별 최근 N건 보관, 헤더는 Server-Timing)
+# 모든 쿼리에 측정 래퍼가 붙으므로 기본값은 DEBUG 일 때만, 운영에서 측정하려면 REQUEST_METRICS_ENABLED=True
+# 동기 뷰만 측정한다 (async 뷰는 제외)
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=DEBUG, cast=bool)
+REQUEST_METRICS_WINDOW = config('REQUEST_METRICS_WINDOW', default=200, cast=int)
+REQUEST_METRICS_HEADER = config('REQUEST_METRICS_HEADER', default=DEBUG, cast=bool)
+
+# 업무 시간 (시간대별 통화 분포 기준, 시작 시 이상 ~ 종료 시 미만)
+BUSINESS_HOURS = (
+    config('BUSINESS_HOUR_START', default=9, cast=int),
+    config('BUSINESS_HOUR_END', default=19, cast=int),
+)
+
+# 대시보드 실시간 갱신 방식
+# poll: 주기적으로 이벤트 조회 API 호출 (WSGI/gunicorn 기본값)
+# sse: Server-Sent Events 스트림 (ASGI 서버(uvicorn 등)로 실행할 때만, WSGI 에서는 스트림이 열리지 않음)
+LIVE_EVENTS_TRANSPORT = config('LIVE_EVENTS_TRANSPORT', default='poll')
+LIVE_EVENTS_POLL_INTERVAL = config('LIVE_EVENTS_POLL_INTERVAL', default=10, cast=int)  # 폴링 주기 (초)
+
+# 팀장/관리자 대시보드 스냅샷 유지 시간 (초, 0이면 매 요청 계산)
+BOARD_SNAPSHOT_FRESHNESS = config('BOARD_SNAPSHOT_FRESHNESS', default=30, cast=int)
+
+# 목록 화면 전체 건수 표시 방식
+# exact: 매 요청 COUNT / cached: 조건별 COUNT 결과를 공유 캐시에 보관 / capped: 상한까지만 세고 "N+" 표시
+LIST_COUNT_MODE = config('LIST_COUNT_MODE', default='cached')
+LIST_COUNT_CACHE_TIMEOUT = config('LIST_COUNT_CACHE_TIMEOUT', default=300, cast=int)
+LIST_COUNT_CAP = config('LIST_COUNT_CAP', default=10000, cast=int)
+
+# 고객 업로드 시 한 번에 읽어 정제/저장하는 행 수 (메모리 사용량이 이 값에 비례)
+IMPORT_CHUNK_SIZE = config('IMPORT_CHUNK_SIZE', default=5000, cast=int)
+# 처리 중 작업의 하트비트가 이 시간(초) 동안 없으면 워커가 중단된 것으로 보고 다른 워커가 이어서 처리
+IMPORT_JOB_STALE_SECONDS = config('IMPORT_JOB_STALE_SECONDS', default=300, cast=int)
+
 # 파일 업로드 설정
-FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
+# 이 크기를 넘는 업로드 파일은 메모리 대신 임시 파일에 저장된다 (고객 업로드는 청크 단위로 읽음)
+FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
 SECURE_BROWSER_XSS_FILTER = True
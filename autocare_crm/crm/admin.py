@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from django.utils.html import format_html
 from django.urls import reverse
-from .models import Customer, CallRecord, UploadHistory, UserProfile, CallFollowUp, CallAssignment
+from .models import Customer, CallRecord, UploadHistory, ImportJob, UserProfile, CallFollowUp, CallAssignment
 
 
 # UserProfile을 User와 함께 표시하기 위한 Inline
@@ -101,6 +101,14 @@ class UploadHistoryAdmin(admin.ModelAdmin):
     search_fields = ('file_name', 'notes')
     date_hierarchy = 'upload_date'
 
+# ImportJob Admin
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('file_name', 'uploaded_by', 'status', 'rows_parsed', 'total_rows', 'new_records', 'updated_records', 'error_count', 'attempts', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('file_name', 'message')
+    date_hierarchy = 'created_at'
+
 # CallFollowUp Admin
 @admin.register(CallFollowUp)
 class CallFollowUpAdmin(admin.ModelAdmin):
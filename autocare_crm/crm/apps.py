@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def reinstall_search_index(sender, using='default', **kwargs):
+    """테이블 재생성 마이그레이션으로 지워진 검색 색인 트리거 복구"""
+    from django.db import connections
+    from .search import SEARCH_TABLE, install_search_index
+    connection = connections[using]
+    if SEARCH_TABLE in connection.introspection.table_names():
+        install_search_index(connection)
 
 
 class CrmConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'crm'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(reinstall_search_index, sender=self)
@@ -0,0 +1,168 @@
+# crm/cleaning.py
+"""고객 업로드 파일 정제 (열 단위 처리)
+
+업로드 화면(upload_data)과 bulk_import/import_excel_data 명령이 함께 사용한다.
+행마다 정규식/strptime 을 호출하지 않고 DataFrame 열 전체를 pandas 문자열/날짜
+연산으로 한 번에 정제한다.
+
+정제 결과는 모델 필드명을 열로 갖는 DataFrame 이다.
+- 문자열: 앞뒤 공백 제거, 빈 값은 ''
+- 날짜: datetime64 (파싱 실패/빈 값은 NaT)
+- 정수: int64 (빈 값/숫자가 아니면 0)
+"""
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+
+# 업로드 파일 열 이름 → 모델 필드
+COLUMN_MAPPING = {
+    '고객명': 'name',
+    '휴대전화': 'phone',
+    '전화번호': 'landline',
+    '생년월일': 'birth_date',
+    '주소': 'address',
+    '우편번호': 'postal_code',
+    '고객등급': 'customer_grade',
+    '이메일': 'email',
+    '방문수': 'visit_count',
+    '차량번호': 'vehicle_number',
+    '차량명': 'vehicle_name',
+    '모델명': 'vehicle_model',
+    '차량등록일': 'vehicle_registration_date',
+    '검사만료일': 'inspection_expiry_date',
+    '보험만기일': 'insurance_expiry_date',
+    '오일교환일': 'oil_change_date',
+    '차대번호': 'chassis_number',
+    '소속회사': 'company',
+}
+
+PHONE_FIELDS = ['phone', 'landline']
+DATE_FIELDS = [
+    'birth_date', 'vehicle_registration_date', 'inspection_expiry_date',
+    'insurance_expiry_date', 'oil_change_date',
+]
+INTEGER_FIELDS = ['visit_count']
+GRADE_FIELDS = ['customer_grade']
+TEXT_FIELDS = [
+    field for field in COLUMN_MAPPING.values()
+    if field not in PHONE_FIELDS + DATE_FIELDS + INTEGER_FIELDS + GRADE_FIELDS
+]
+REQUIRED_FIELDS = ['name', 'phone', 'vehicle_number']
+
+# 업로드 화면/bulk_import 가 저장하는 필드
+UPLOAD_FIELDS = [
+    'name', 'phone', 'vehicle_number', 'vehicle_name', 'vehicle_model', 'address',
+    'inspection_expiry_date', 'insurance_expiry_date', 'vehicle_registration_date',
+    'customer_grade', 'visit_count',
+]
+
+# 허용하는 날짜 문자열 형식 (앞에서부터 시도)
+DATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%Y.%m.%d', '%d-%m-%Y', '%d/%m/%Y', '%Y%m%d']
+
+GRADE_MAPPING = {
+    'VIP': 'vip', 'vip': 'vip',
+    '정회원': 'regular', '준회원': 'associate',
+    '신규': 'new',
+}
+
+
+def clean_text(series):
+    """문자열 정제 (빈 값은 '')"""
+    if pd.api.types.is_float_dtype(series):
+        if (series.dropna() % 1 == 0).all():
+            # 빈 칸이 섞인 정수 열은 float 로 읽히므로 '.0' 없이 정수 문자열로
+            series = series.astype('Int64')
+        else:
+            # 소수가 있는 열은 값 그대로 (2.0 → '2.0', 3.5 → '3.5')
+            return series.map(str).where(series.notna(), '').str.strip().astype(object)
+    return series.astype('string').fillna('').str.strip().astype(object)
+
+
+def clean_phones(series):
+    """전화번호 정제 (숫자만 남기고 휴대폰 번호는 하이픈 형식으로)"""
+    phones = clean_text(series).str.replace(r'\D', '', regex=True)
+    length = phones.str.len()
+
+    mobile = (length == 11) & phones.str.startswith('010')
+    digits = phones[mobile]
+    phones[mobile] = digits.str[:3] + '-' + digits.str[3:7] + '-' + digits.str[7:]
+
+    short_mobile = (length == 10) & phones.str.startswith('01')
+    digits = phones[short_mobile]
+    phones[short_mobile] = '0' + digits.str[:2] + '-' + digits.str[2:6] + '-' + digits.str[6:]
+    return phones
+
+
+def parse_dates(series):
+    """날짜 파싱 (날짜/시각 값과 DATE_FORMATS 형식 문자열), 실패는 NaT"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if series.dt.tz is not None:
+            series = series.dt.tz_localize(None)
+        return series.dt.normalize()
+
+    parsed = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    is_text = series.map(lambda value: isinstance(value, str))
+    is_date = series.map(lambda value: isinstance(value, (datetime, date)))
+
+    if is_date.any():
+        parsed.loc[is_date] = pd.to_datetime(series[is_date], errors='coerce').dt.normalize()
+
+    remaining = series[is_text].astype(str).str.strip()
+    for date_format in DATE_FORMATS:
+        if remaining.empty:
+            break
+        values = pd.to_datetime(remaining, format=date_format, errors='coerce')
+        matched = values.notna()
+        parsed.loc[values.index[matched]] = values[matched]
+        remaining = remaining[~matched]
+    return parsed
+
+
+def map_grades(series):
+    """고객등급 매핑 (알 수 없는 등급은 '')"""
+    return clean_text(series).map(GRADE_MAPPING).fillna('').astype(object)
+
+
+def clean_integers(series):
+    """정수 정제 (빈 값/숫자가 아니면 0)"""
+    return pd.to_numeric(series, errors='coerce').fillna(0).astype('int64')
+
+
+def clean_customer_frame(df):
+    """업로드 DataFrame → (정제된 DataFrame, 필수 항목 누락 행 수)
+
+    원본 열 이름(한글)과 모델 필드명을 모두 받는다. 원본에 없는 열은 빈 값으로 채운다.
+    정제된 DataFrame 의 인덱스는 원본 행 인덱스를 유지한다.
+    """
+    df = df.rename(columns=COLUMN_MAPPING)
+    cleaners = (
+        [(field, clean_text) for field in TEXT_FIELDS]
+        + [(field, clean_phones) for field in PHONE_FIELDS]
+        + [(field, parse_dates) for field in DATE_FIELDS]
+        + [(field, clean_integers) for field in INTEGER_FIELDS]
+        + [(field, map_grades) for field in GRADE_FIELDS]
+    )
+    empty = pd.Series(np.nan, index=df.index, dtype=object)
+    cleaned = pd.DataFrame({
+        field: cleaner(df[field] if field in df.columns else empty)
+        for field, cleaner in cleaners
+    }, index=df.index)
+
+    valid = np.logical_and.reduce([cleaned[field] != '' for field in REQUIRED_FIELDS])
+    return cleaned[valid], int((~valid).sum())
+
+
+def customer_records(cleaned, fields=UPLOAD_FIELDS):
+    """정제된 DataFrame → 저장용 dict 목록 (NaT 는 None, 날짜는 date)"""
+    columns = {}
+    for field in fields:
+        values = cleaned[field]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            columns[field] = np.where(values.notna(), values.dt.date, None)
+        elif pd.api.types.is_integer_dtype(values):
+            columns[field] = values.to_numpy().tolist()
+        else:
+            columns[field] = values.to_numpy()
+    return [dict(zip(fields, row)) for row in zip(*(columns[field] for field in fields))]
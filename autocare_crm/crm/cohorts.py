@@ -0,0 +1,41 @@
+# crm/cohorts.py
+"""해피콜 대상(코호트) 조회
+
+해피콜 대상 = 해피콜 예정일이 오늘 ± window 일 이내인 고객.
+예정일(happy_call_*_date)은 인덱스 컬럼이므로 범위 조회 한 번으로 처리된다.
+"""
+from datetime import timedelta
+
+from django.db.models import Q
+
+from .models import HAPPY_CALL_DAYS
+
+
+# 허용 범위 (±일)
+BOARD_WINDOW = 7  # 대시보드/팀 현황 집계용
+LIST_WINDOW = 1   # 고객 목록/콜 배정 목록용
+
+HAPPY_CALL_KEYS = list(HAPPY_CALL_DAYS)
+
+
+def happy_call_field(key, prefix=''):
+    """해피콜 예정일 필드명 (prefix='customer__' 이면 CallRecord 기준)"""
+    if key not in HAPPY_CALL_DAYS:
+        raise ValueError(f'알 수 없는 해피콜 구분: {key}')
+    return f'{prefix}happy_call_{key}_date'
+
+
+def happy_call_q(key, today, window, prefix=''):
+    """해피콜 대상 조건"""
+    field = happy_call_field(key, prefix)
+    return Q(**{f'{field}__range': (today - timedelta(days=window), today + timedelta(days=window))})
+
+
+def happy_call_inspection_date(key, today):
+    """오늘 기준 해피콜 대상의 기준 검사일 (화면 표시용)"""
+    return today - timedelta(days=HAPPY_CALL_DAYS[key])
+
+
+def filter_happy_call(queryset, key, today, window):
+    """고객 쿼리셋을 해피콜 대상으로 필터링"""
+    return queryset.filter(happy_call_q(key, today, window))
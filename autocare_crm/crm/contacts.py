@@ -0,0 +1,53 @@
+# crm/contacts.py
+"""일자별 통화 고객 집합 관리
+
+통화 기록이 저장될 때마다 (현지 날짜, 고객) 한 건을 DailyContact에 반영한다.
+"오늘 X 대상 중 몇 명과 통화했는가"는 고객 테이블 전체를 제외 조회하지 않고
+오늘 날짜의 작은 DailyContact 집합에서 바로 센다.
+"""
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import CallRecord, DailyContact
+
+
+def contact_date_of(call_record):
+    """통화 기록의 현지 날짜"""
+    return timezone.localdate(call_record.call_date)
+
+
+def sync_daily_contact(customer_id, contact_date):
+    """해당 날짜에 삭제되지 않은 통화가 있는지에 따라 DailyContact 추가/삭제"""
+    has_call = CallRecord.objects.on_local_day(contact_date).filter(
+        customer_id=customer_id,
+        is_deleted=False
+    ).exists()
+    
+    if has_call:
+        DailyContact.objects.get_or_create(customer_id=customer_id, contact_date=contact_date)
+    else:
+        DailyContact.objects.filter(customer_id=customer_id, contact_date=contact_date).delete()
+
+
+def record_call_contact(call_record, created=False):
+    """통화 기록 저장 시 DailyContact 반영"""
+    contact_date = contact_date_of(call_record)
+    
+    if created and not call_record.is_deleted:
+        # 신규 통화는 확인 없이 바로 추가
+        DailyContact.objects.get_or_create(customer_id=call_record.customer_id, contact_date=contact_date)
+    else:
+        sync_daily_contact(call_record.customer_id, contact_date)
+
+
+def contacted_counts(contact_date, conditions):
+    """조건별 해당 날짜 통화 고객 수
+
+    conditions: {이름: Q(customer__...)} → {이름: 고객 수}
+    """
+    aggregates = {
+        name: Count('id', filter=condition)
+        for name, condition in conditions.items()
+    }
+    aggregates['_total'] = Count('id')
+    return DailyContact.objects.filter(contact_date=contact_date).aggregate(**aggregates)
@@ -7,8 +7,6 @@ def manager_required(view_func):
     """팀장 이상 권한 필요"""
     @wraps(view_func)
     def wrapped_view(request, *args, **kwargs):
-        print(f"[DECORATOR] manager_required 체크: user={request.user.username}")
-
         if not hasattr(request.user, 'userprofile'):
             messages.error(request, '사용자 프로필이 없습니다.')
             return redirect('dashboard')
@@ -46,4 +44,17 @@ def ajax_manager_required(view_func):
             return JsonResponse({'success': False, 'error': '팀장 이상 권한이 필요합니다.'})
         
         return view_func(request, *args, **kwargs)
-    return wrapped_view
\ No newline at end of file
+    return wrapped_view
+
+def ajax_admin_required(view_func):
+    """AJAX 요청용 관리자 권한 체크"""
+    @wraps(view_func)
+    def wrapped_view(request, *args, **kwargs):
+        if not hasattr(request.user, 'userprofile'):
+            return JsonResponse({'success': False, 'error': '사용자 프로필이 없습니다.'}, status=403)
+        
+        if not request.user.userprofile.is_admin():
+            return JsonResponse({'success': False, 'error': '관리자 권한이 필요합니다.'}, status=403)
+        
+        return view_func(request, *args, **kwargs)
+    return wrapped_view
@@ -0,0 +1,173 @@
+# crm/events.py
+"""실시간 통계 이벤트
+
+데이터가 바뀐 트랜잭션마다 커밋 후 이벤트를 LiveEvent 테이블에 한 번만 기록한다
+(통화 저장 + 후속조치 완료처럼 여러 변경이 있어도 종류만 모아 1건).
+이벤트에는 커밋 후 사이드바 통계를 한 번 계산해 담고, 그 값은 캐시에 남아 다른 화면도 재사용한다.
+이벤트 번호는 자동 증가 id 라 여러 워커가 동시에 발행해도 겹치지 않으며,
+마지막 번호는 공유 캐시에도 보관해 새 이벤트가 없을 때는 DB 를 읽지 않는다.
+
+전달 방식 (settings.LIVE_EVENTS_TRANSPORT)
+- poll: 대시보드가 live_events_api 를 주기적으로 조회 (WSGI/gunicorn 동기 워커 기본값)
+- sse: live_stream 으로 Server-Sent Events 스트림 유지 (ASGI 서버 필요, WSGI 에서는 204 응답)
+
+이벤트 종류 (stats_changed 이벤트의 types)
+- call_counted: 새 통화 기록 집계
+- followup_completed: 후속조치 완료
+- agent_status: 상담원 상태 변경
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import LiveEvent
+from .stats import SIDEBAR_STATS_CACHE, get_sidebar_stats
+
+
+LIVE_EVENT_TYPE = 'stats_changed'
+LIVE_EVENT_TTL = 10 * 60  # 이벤트 보관 시간 (초)
+LIVE_EVENT_PRUNE_EVERY = 100  # 이 개수마다 오래된 이벤트 정리
+LATEST_EVENT_KEY = 'live_event:latest'
+
+STREAM_POLL_INTERVAL = 1      # 새 이벤트 확인 주기 (초, 공유 캐시만 확인)
+STREAM_HEARTBEAT_INTERVAL = 15  # 연결 유지용 주석 전송 주기 (초)
+STREAM_MAX_DURATION = 25      # 스트림 최대 유지 시간 (초), 이후 브라우저가 retry 후 재연결
+STREAM_RETRY = 3000           # 스트림 종료 후 재연결 대기 (밀리초)
+STREAM_MAX_EVENTS = 200       # 한 번에 읽을 최대 이벤트 수
+
+
+def live_events_config():
+    """대시보드 실시간 갱신 설정 (전달 방식 'poll'/'sse', 폴링 주기 밀리초)"""
+    return {
+        'transport': getattr(settings, 'LIVE_EVENTS_TRANSPORT', 'poll'),
+        'poll_interval': getattr(settings, 'LIVE_EVENTS_POLL_INTERVAL', 10) * 1000,
+    }
+
+
+def latest_event_id():
+    """마지막 이벤트 번호 (공유 캐시 우선)"""
+    cache = caches[SIDEBAR_STATS_CACHE]
+    latest = cache.get(LATEST_EVENT_KEY)
+    if latest is None:
+        latest = LiveEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        cache.add(LATEST_EVENT_KEY, latest, None)
+    return latest
+
+
+def _publish(event_types):
+    # 모든 로그인 사용자에게 전달되므로 고객/상담원 정보는 담지 않는다 (갱신 신호 + 전체 사이드바 통계만)
+    payload = {
+        'types': sorted(event_types),
+        'sidebar': get_sidebar_stats(),
+        'timestamp': timezone.now().isoformat(),
+    }
+
+    event = LiveEvent.objects.create(event_type=LIVE_EVENT_TYPE, data=payload)
+    # 더 큰 번호가 이미 기록돼 있으면 덮어쓰지 않는다 (동시 발행으로 잠깐 낮게 남아도 다음 이벤트 때 함께 읽힘)
+    cache = caches[SIDEBAR_STATS_CACHE]
+    if not cache.add(LATEST_EVENT_KEY, event.id, None) and (cache.get(LATEST_EVENT_KEY) or 0) < event.id:
+        cache.set(LATEST_EVENT_KEY, event.id, None)
+    if event.id % LIVE_EVENT_PRUNE_EVERY == 0:
+        LiveEvent.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=LIVE_EVENT_TTL)).delete()
+    return event.id
+
+
+class _PendingEvent:
+    """트랜잭션 하나에서 발행할 이벤트 종류 모음 (커밋 후 한 번 기록)"""
+
+    def __init__(self):
+        self.types = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        _publish(self.types)
+
+
+def publish_event(event_type):
+    """이벤트 발행 예약 (트랜잭션 커밋 후, 같은 트랜잭션의 발행은 1건으로 합침)"""
+    connection = transaction.get_connection()
+    pending = getattr(connection, 'pending_live_event', None)
+    # 같은 트랜잭션에 이미 예약된 이벤트가 있으면 종류만 추가 (롤백으로 버려졌거나 이미 실행됐으면 새로 예약)
+    if pending is not None and not pending.done and connection.in_atomic_block and any(
+        callback is pending for _, callback, *_ in connection.run_on_commit
+    ):
+        pending.types.add(event_type)
+        return
+    pending = _PendingEvent()
+    pending.types.add(event_type)
+    connection.pending_live_event = pending
+    transaction.on_commit(pending)
+
+
+def read_events(after_id):
+    """after_id 이후 이벤트 목록과 마지막 이벤트 번호 (새 이벤트가 없으면 DB 조회 없음)"""
+    latest = latest_event_id()
+    if latest <= after_id:
+        return [], latest
+
+    start = max(after_id, latest - STREAM_MAX_EVENTS)
+    events = LiveEvent.objects.filter(id__gt=start).order_by('id')[:STREAM_MAX_EVENTS]
+    events = [
+        {'id': event.id, 'type': event.event_type, 'data': event.data}
+        for event in events
+    ]
+    if events:
+        latest = max(latest, events[-1]['id'])
+    return events, latest
+
+
+def format_sse(event_type, data, event_id=None):
+    """SSE 메시지 형식"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def _snapshot():
+    last_event_id = latest_event_id()
+    return format_sse('snapshot', {'sidebar': get_sidebar_stats()}, last_event_id), last_event_id
+
+
+async def event_stream(last_event_id=None):
+    """SSE 스트림 생성기 (ASGI 전용)
+
+    처음 연결 시 현재 사이드바 통계(snapshot)를 보내고, 이후 변경분만 전달한다.
+    재연결 시(Last-Event-ID) 놓친 이벤트부터 이어서 전달한다.
+    매 주기 공유 캐시의 마지막 번호만 확인하고, 번호가 바뀌었을 때만 DB 에서 읽는다.
+    STREAM_MAX_DURATION 후 연결을 닫고 브라우저의 재연결에 맡긴다.
+    """
+    if last_event_id is None:
+        message, last_event_id = await sync_to_async(_snapshot)()
+        yield message
+
+    yield f'retry: {STREAM_RETRY}\n\n'
+
+    elapsed = 0
+    idle = 0
+    while elapsed < STREAM_MAX_DURATION:
+        events, latest = await sync_to_async(read_events)(last_event_id)
+        for event in events:
+            yield format_sse(event['type'], event['data'], event['id'])
+        last_event_id = max(last_event_id, latest)
+
+        if events:
+            idle = 0
+        elif idle >= STREAM_HEARTBEAT_INTERVAL:
+            yield ': ping\n\n'
+            idle = 0
+
+        await asyncio.sleep(STREAM_POLL_INTERVAL)
+        elapsed += STREAM_POLL_INTERVAL
+        idle += STREAM_POLL_INTERVAL
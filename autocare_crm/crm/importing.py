@@ -0,0 +1,196 @@
+# crm/importing.py
+"""고객 업로드 저장 (배치 단위 upsert)
+
+정제된 고객 레코드(crm.cleaning.customer_records)를 배치마다
+1) (휴대전화, 차량번호)로 기존 고객 값을 한 번에 조회하고
+2) 실제 검사일/우선순위·태그를 배치 전체에 열 단위로 계산한 뒤 (crm.tagging)
+3) unique_customer_vehicle 제약 기준 INSERT ... ON CONFLICT DO UPDATE 문 하나로 저장한다.
+
+기존 고객은 조회한 값에 업로드 값을 덮어쓰고 계산하므로 태그 결과는
+행마다 update_or_create + save() 하던 때와 같다.
+신규/업데이트 건수는 조회 결과로 센다 (같은 배치 안의 중복 키는 뒤의 행이 업데이트로 집계).
+upsert 는 시그널이 없으므로 해피콜 예정일이 바뀐 기존 고객의 상담원 일별 해피콜 집계와
+목록 건수 캐시는 import_customers 끝에서 직접 갱신한다.
+"""
+import pandas as pd
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, connections, transaction
+from django.utils import timezone
+
+from .models import HAPPY_CALL_DAYS, PHONE_FIELDS, Customer
+from .pagination import invalidate_list_counts
+from .rollups import refresh_stats_for_customers
+from .stats import invalidate_sidebar_stats
+from .tagging import apply_inspection_dates, apply_priority_tags
+
+
+UNIQUE_FIELDS = ['phone', 'vehicle_number']
+
+# 저장하는 필드 (id 제외 전체)
+FIELDS = [field for field in Customer._meta.concrete_fields if not field.primary_key]
+ATTNAMES = [field.attname for field in FIELDS]
+
+# 충돌 시 갱신할 필드 (생성일/키 제외 전체, save() 와 동일)
+UPDATE_FIELDS = [field.name for field in FIELDS if field.name not in UNIQUE_FIELDS + ['created_at']]
+
+# ON CONFLICT ... DO UPDATE 를 지원하는 DB (그 외는 bulk_create)
+UPSERT_VENDORS = ('sqlite', 'postgresql')
+
+# DB 드라이버에 값 그대로 넘겨도 되는 필드 타입
+PASSTHROUGH_TYPES = ('CharField', 'TextField', 'EmailField', 'IntegerField', 'BooleanField', 'ForeignKey')
+
+# 바뀌면 상담원 일별 해피콜 집계를 다시 계산해야 하는 필드
+HAPPY_CALL_DATE_FIELDS = [f'happy_call_{key}_date' for key in HAPPY_CALL_DAYS]
+
+
+def _key(values):
+    return tuple(values[field] for field in UNIQUE_FIELDS)
+
+
+def existing_customers(keys):
+    """(휴대전화, 차량번호) → 기존 고객 id 와 필드 값 (조회 1회)"""
+    if not keys:
+        return {}
+    # phone/vehicle_number 를 둘 다 IN 으로 주면 SQLite 가 복합 인덱스를 두 목록의 곱만큼 탐색하므로
+    # 휴대전화 인덱스로만 찾고 차량번호는 메모리에서 거른다
+    rows = Customer.objects.filter(phone__in={phone for phone, _ in keys}).values('id', *ATTNAMES)
+    return {_key(row): row for row in rows if _key(row) in keys}
+
+
+def new_customer_values():
+    """신규 고객 기본값"""
+    return {field.attname: field.get_default() for field in FIELDS}
+
+
+def build_customer_frame(records, data_extract_date=None):
+    """레코드 → 저장할 값 DataFrame (열: ATTNAMES), (신규, 업데이트) 건수, 해피콜 예정일이 바뀐 기존 고객 id"""
+    # 같은 키가 여러 번 나오면 마지막 행 값이 남는다
+    latest = {}
+    for record in records:
+        latest[_key(record)] = record
+    existing = existing_customers(set(latest))
+
+    defaults = new_customer_values()
+    rows = []
+    for key, record in latest.items():
+        row = dict(existing.get(key) or defaults)
+        row.update(record)
+        rows.append(row)
+    frame = pd.DataFrame(rows, columns=ATTNAMES, dtype=object)
+
+    if data_extract_date:
+        apply_inspection_dates(frame, data_extract_date)
+    apply_priority_tags(frame)
+    for field in PHONE_FIELDS:
+        digits = frame[field].fillna('').astype(str).str.replace(r'\D', '', regex=True)
+        frame[f'{field}_digits'] = digits
+        frame[f'{field}_digits_reversed'] = digits.str[::-1]
+
+    rescheduled = [
+        existing[key]['id']
+        for key, dates in zip(latest, frame[HAPPY_CALL_DATE_FIELDS].itertuples(index=False, name=None))
+        if key in existing and dates != tuple(existing[key][field] for field in HAPPY_CALL_DATE_FIELDS)
+    ]
+
+    new_count = len(latest) - len(existing)
+    return frame, new_count, len(records) - new_count, rescheduled
+
+
+def _upsert_sql():
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in FIELDS)
+    placeholders = ', '.join(['%s'] * len(FIELDS))
+    conflict = ', '.join(quote(Customer._meta.get_field(name).column) for name in UNIQUE_FIELDS)
+    updates = ', '.join(
+        f'{quote(field.column)} = EXCLUDED.{quote(field.column)}'
+        for field in FIELDS if field.name in UPDATE_FIELDS
+    )
+    return (
+        f'INSERT INTO {quote(Customer._meta.db_table)} ({columns}) VALUES ({placeholders}) '
+        f'ON CONFLICT ({conflict}) DO UPDATE SET {updates}'
+    )
+
+
+def _column_preparers(db):
+    """필드별 DB 값 변환 (문자열/숫자/불린은 그대로 전달)"""
+    preparers = []
+    for field in FIELDS:
+        internal_type = field.get_internal_type()
+        if internal_type in PASSTHROUGH_TYPES:
+            preparers.append(None)
+        elif internal_type == 'DateField':
+            preparers.append(db.ops.adapt_datefield_value)
+        elif internal_type == 'DateTimeField':
+            preparers.append(db.ops.adapt_datetimefield_value)
+        else:
+            preparers.append(lambda value, field=field: field.get_db_prep_save(value, db))
+    return preparers
+
+
+def upsert_customers(records, data_extract_date=None):
+    """배치 저장 (조회 1회 + upsert 1회), (신규, 업데이트) 건수와 해피콜 예정일이 바뀐 기존 고객 id 반환"""
+    if not records:
+        return 0, 0, []
+    frame, new_count, updated_count, rescheduled = build_customer_frame(records, data_extract_date)
+    now = timezone.now()
+    frame['created_at'] = frame['created_at'].fillna(now)
+    frame['updated_at'] = now
+
+    if connection.vendor not in UPSERT_VENDORS:
+        Customer.objects.bulk_create(
+            [Customer(**row) for row in frame.astype(object).to_dict('records')],
+            update_conflicts=True,
+            unique_fields=UNIQUE_FIELDS,
+            update_fields=UPDATE_FIELDS,
+        )
+        return new_count, updated_count, rescheduled
+
+    # ORM bulk_create 는 행·필드마다 값 변환을 거치고 SQLite 에서는 18행 단위로 나뉘므로
+    # 같은 upsert 문 하나를 executemany 로 실행한다.
+    # connection 프록시는 속성 접근마다 스레드 로컬을 조회하므로 실제 연결 객체를 한 번만 꺼낸다
+    db = connections[DEFAULT_DB_ALIAS]
+    columns = []
+    for prepare, attname in zip(_column_preparers(db), ATTNAMES):
+        values = frame[attname].astype(object).tolist()
+        columns.append([prepare(value) for value in values] if prepare else values)
+    with db.cursor() as cursor:
+        cursor.executemany(_upsert_sql(), list(zip(*columns)))
+    return new_count, updated_count, rescheduled
+
+
+def import_customers(records, data_extract_date=None, batch_size=1000, progress=None):
+    """전체 레코드를 배치로 저장, (신규, 업데이트, 오류) 건수 반환
+
+    배치 저장이 실패하면 그 배치만 행 단위로 다시 저장해 오류 행을 건너뛴다.
+    progress: 배치마다 처리한 행 수로 호출 (선택)
+    """
+    new_count = updated_count = error_count = 0
+    rescheduled = set()
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        try:
+            with transaction.atomic():
+                batch_new, batch_updated, batch_rescheduled = upsert_customers(batch, data_extract_date)
+        except (DatabaseError, ValueError):
+            batch_new = batch_updated = 0
+            batch_rescheduled = []
+            for record in batch:
+                try:
+                    with transaction.atomic():
+                        row_new, row_updated, row_rescheduled = upsert_customers([record], data_extract_date)
+                except (DatabaseError, ValueError):
+                    error_count += 1
+                    continue
+                batch_new += row_new
+                batch_updated += row_updated
+                batch_rescheduled += row_rescheduled
+        new_count += batch_new
+        updated_count += batch_updated
+        rescheduled.update(batch_rescheduled)
+        if progress:
+            progress(start + len(batch))
+    # upsert 는 시그널이 없으므로 해피콜 집계, 사이드바 통계와 목록 건수 캐시를 직접 갱신 (커밋 후)
+    if rescheduled:
+        refresh_stats_for_customers(rescheduled, batch_size=batch_size)
+    invalidate_sidebar_stats()
+    invalidate_list_counts()
+    return new_count, updated_count, error_count
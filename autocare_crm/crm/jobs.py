@@ -0,0 +1,164 @@
+# crm/jobs.py
+"""고객 업로드 백그라운드 작업 (DB 큐)
+
+업로드 화면은 파일을 저장하고 ImportJob(대기)만 만든 뒤 바로 응답한다.
+run_import_jobs 명령(워커)이 대기 작업을 하나씩 가져가 청크 단위로 처리한다.
+
+- 가져가기: 상태/하트비트 조건부 UPDATE 로 한 워커만 작업을 차지하고 claim_token 을 새로 발급한다
+- 진행 상황: 청크 저장과 같은 트랜잭션에서 처리 행 수/건수를 갱신하므로
+  중단되어도 마지막으로 커밋된 청크 다음 행부터 이어서 처리한다
+- 중단 감지: 하트비트가 IMPORT_JOB_STALE_SECONDS 동안 없는 처리 중 작업은 다시 가져갈 수 있다
+- 소유 확인: 진행 상황/완료는 claim_token 이 그대로일 때만 저장한다. 느려진 워커의 작업을
+  다른 워커가 다시 가져갔으면 저장 행이 0건이 되므로 그 청크를 롤백하고 손을 뗀다 (ImportJobLost)
+"""
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import ImportJob, UploadHistory
+from .streaming import ImportSummary, estimate_upload_rows, import_chunk, read_upload_chunks
+
+
+DEFAULT_STALE_SECONDS = 300
+
+
+class ImportJobLost(Exception):
+    """다른 워커가 작업을 다시 가져가 더 이상 이 워커의 작업이 아님"""
+
+
+def stale_seconds():
+    """하트비트가 끊긴 작업을 중단된 것으로 보는 시간 (초)"""
+    return getattr(settings, 'IMPORT_JOB_STALE_SECONDS', DEFAULT_STALE_SECONDS)
+
+
+def enqueue_import(uploaded_file, user, data_extract_date=None):
+    """업로드 파일 저장 후 대기 작업 생성"""
+    return ImportJob.objects.create(
+        uploaded_by=user,
+        file=uploaded_file,
+        file_name=uploaded_file.name,
+        data_extract_date=data_extract_date,
+    )
+
+
+def claimable_jobs():
+    """대기 중이거나 하트비트가 끊긴 처리 중 작업 (오래된 순)"""
+    stale_before = timezone.now() - timedelta(seconds=stale_seconds())
+    return ImportJob.objects.filter(
+        Q(status='pending') | Q(status='running', heartbeat_at__lt=stale_before)
+    ).order_by('created_at')
+
+
+def claim_next_job():
+    """다음 작업을 차지해 반환 (없으면 None)
+
+    조회한 상태/하트비트가 그대로일 때만 UPDATE 하므로 여러 워커가 동시에 가져가도 하나만 성공한다.
+    """
+    for job in claimable_jobs()[:10]:
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(
+            pk=job.pk, status=job.status, heartbeat_at=job.heartbeat_at
+        ).update(
+            status='running',
+            claim_token=uuid.uuid4().hex,
+            heartbeat_at=now,
+            started_at=job.started_at or now,
+            finished_at=None,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def retry_job(job):
+    """실패한 작업을 대기로 되돌림 (처리한 행 다음부터 이어서 처리)"""
+    ImportJob.objects.filter(pk=job.pk, status='failed').update(status='pending', message='')
+
+
+def _owned(job):
+    """이 워커가 차지한 상태 그대로인 작업 (조건부 UPDATE 용)"""
+    return ImportJob.objects.filter(pk=job.pk, status='running', claim_token=job.claim_token)
+
+
+def _save_owned(job, **fields):
+    """작업 필드 저장 (다른 워커가 가져갔으면 ImportJobLost)"""
+    if not _owned(job).update(**fields):
+        raise ImportJobLost(f'업로드 작업 #{job.pk}을(를) 다른 워커가 이어받았습니다.')
+    for name, value in fields.items():
+        setattr(job, name, value)
+
+
+def _finish(job, summary):
+    # 업로드 이력 생성과 완료 표시를 함께 커밋 (중간에 죽거나 작업을 잃으면 이력도 남지 않음)
+    with transaction.atomic():
+        history = UploadHistory.objects.create(
+            uploaded_by=job.uploaded_by,
+            file_name=job.file_name,
+            total_records=job.rows_written,
+            new_records=job.new_records,
+            updated_records=job.updated_records,
+            error_count=job.error_count,
+            notes=(
+                f"백그라운드 업로드 완료. 총 {job.rows_parsed:,}행 처리. 데이터 추출일: {job.data_extract_date}. "
+                f"최대 메모리 {job.peak_memory_mb:,.0f}MB (+{summary.memory_growth_mb:,.0f}MB)"
+                + (f", 재시작 {job.attempts - 1}회" if job.attempts > 1 else "")
+            ),
+        )
+        _save_owned(job, status='completed', finished_at=timezone.now(), upload_history=history)
+
+    # 처리가 끝난 원본 파일은 보관하지 않는다
+    if job.file:
+        job.file.delete(save=True)
+
+
+def run_import_job(job, chunk_size=None, batch_size=1000, progress=None):
+    """차지한 작업을 처리 (rows_parsed 행부터 이어서)
+
+    progress: 청크를 커밋할 때마다 job 으로 호출 (선택)
+    실패하면 failed 로 표시하고, 워커 종료(Ctrl+C 등)로 중단되면 대기로 되돌려 다음 워커가 이어받게 한다.
+    다른 워커가 작업을 다시 가져갔으면 마지막 청크를 롤백하고 ImportJobLost 를 낸다 (작업 상태는 건드리지 않음).
+    """
+    summary = ImportSummary()
+    try:
+        path = job.file.path
+        if job.total_rows is None:
+            _save_owned(job, total_rows=estimate_upload_rows(path, job.file_name))
+
+        for chunk in read_upload_chunks(path, job.file_name, chunk_size, start_row=job.rows_parsed):
+            summary.sample_memory()
+            # 청크 저장과 진행 상황 갱신을 함께 커밋 (rows_parsed = 다음 재시작 위치)
+            with transaction.atomic():
+                new_count, updated_count, error_count = import_chunk(
+                    chunk, job.data_extract_date, batch_size=batch_size
+                )
+                summary.sample_memory()
+                # 다른 워커가 가져갔으면 0건 → ImportJobLost 로 이 청크 저장까지 롤백
+                _save_owned(
+                    job,
+                    rows_parsed=int(chunk.index[-1]) + 1,
+                    new_records=job.new_records + new_count,
+                    updated_records=job.updated_records + updated_count,
+                    error_count=job.error_count + error_count,
+                    peak_memory_mb=max(job.peak_memory_mb, summary.peak_memory_mb),
+                    heartbeat_at=timezone.now(),
+                )
+            if progress:
+                progress(job)
+
+        _finish(job, summary)
+    except ImportJobLost:
+        raise
+    except Exception as e:
+        _owned(job).update(status='failed', message=str(e), finished_at=timezone.now())
+        job.refresh_from_db()
+        raise
+    except BaseException:
+        _owned(job).update(status='pending')
+        raise
+    return job
@@ -0,0 +1,196 @@
+# crm/management/commands/benchmark_views.py
+"""화면/API 응답 시간 벤치마크
+
+crm/urls.py 의 모든 화면과 JSON API를 GET으로 호출해 응답 시간과 쿼리 수를 측정하고
+JSON 리포트로 출력한다. 배포 전 빌드 간 비교용 (--compare 이전리포트.json).
+
+예) python manage.py generate_load_data --customers 1000000 --calls 10000000
+    python manage.py benchmark_views --repeat 5 --output bench.json
+"""
+import json
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from crm.models import Customer, CallRecord, CallAssignment
+from crm.urls import urlpatterns
+
+
+# 벤치마크에서 제외하는 URL (스트리밍)
+SKIP_VIEWS = {'live_stream'}
+
+# 화면별 추가 조회 조건 (필터/기간이 있는 화면은 대표 조건도 함께 측정)
+EXTRA_QUERIES = {
+    'customer_list': [{'search': '김'}, {'happy_call': '3month'}],
+    'call_records': [{'search': '김'}],
+    'call_assignment': [{'customer_type': 'happy_3month'}],
+    'admin_dashboard': [{'date_from': '{month_ago}'}],
+    'team_dashboard': [{'date_from': '{month_ago}'}],
+}
+
+
+def percentile(values, rate):
+    values = sorted(values)
+    return values[int(round(rate * (len(values) - 1)))]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, cwd=settings.BASE_DIR, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = '전체 화면/API 응답 시간 벤치마크 (JSON 리포트)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', type=str, default='load_admin', help='측정에 사용할 계정 (기본값: load_admin)')
+        parser.add_argument('--repeat', type=int, default=5, help='화면별 반복 횟수 (기본값: 5)')
+        parser.add_argument('--warmup', type=int, default=1, help='측정 전 예열 횟수 (기본값: 1)')
+        parser.add_argument('--cold', action='store_true', help='매 요청 전 공유 캐시 비우기 (스냅샷/사이드바 캐시 미사용 측정)')
+        parser.add_argument('--only', nargs='*', help='측정할 URL 이름만 지정')
+        parser.add_argument('--output', type=str, help='리포트 저장 경로 (없으면 표준출력)')
+        parser.add_argument('--compare', type=str, help='비교할 이전 리포트 경로')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"계정 '{options['username']}'이 없습니다. generate_load_data를 먼저 실행하세요.")
+
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*' and not h.startswith('.')), 'localhost')
+        client = Client(raise_request_exception=False, HTTP_HOST=host)
+        client.force_login(user)
+
+        results = []
+        for name, url in self.target_urls(options['only']):
+            self.stderr.write(f'  측정 중: {url}')
+            results.append(self.measure(client, name, url, options))
+
+        report = {
+            'generated_at': timezone.now(),
+            'git_revision': git_revision(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'username': user.username,
+            'repeat': options['repeat'],
+            'cold': options['cold'],
+            'dataset': {
+                'customers': Customer.objects.count(),
+                'call_records': CallRecord.objects.count(),
+                'assignments': CallAssignment.objects.count(),
+                'users': User.objects.count(),
+            },
+            'results': results,
+        }
+        output = json.dumps(report, cls=DjangoJSONEncoder, ensure_ascii=False, indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+            self.stderr.write(self.style.SUCCESS(f"✅ 리포트 저장: {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def sample_kwargs(self):
+        """URL 인자별 예시 값"""
+        call = CallRecord.objects.filter(is_deleted=False).order_by('-id').first()
+        assignment = CallAssignment.objects.order_by('-id').first()
+        agent = User.objects.filter(userprofile__role='agent', is_active=True).order_by('id').first()
+        return {
+            'pk': call.customer_id if call else Customer.objects.values_list('id', flat=True).first(),
+            'call_id': call.id if call else None,
+            'assignment_id': assignment.id if assignment else None,
+            'agent_id': agent.id if agent else None,
+        }
+
+    def target_urls(self, only=None):
+        """(URL 이름, URL) 목록"""
+        kwargs_values = self.sample_kwargs()
+        month_ago = (timezone.localdate() - timedelta(days=30)).isoformat()
+
+        for pattern in urlpatterns:
+            name = pattern.name
+            if not name or name in SKIP_VIEWS or (only and name not in only):
+                continue
+
+            kwargs = {key: kwargs_values.get(key) for key in pattern.pattern.converters}
+            if any(value is None for value in kwargs.values()):
+                self.stderr.write(self.style.WARNING(f'  건너뜀 (예시 데이터 없음): {name}'))
+                continue
+
+            url = reverse(name, kwargs=kwargs)
+            yield name, url
+            for params in EXTRA_QUERIES.get(name, []):
+                query = '&'.join(f'{key}={value.format(month_ago=month_ago)}' for key, value in params.items())
+                yield name, f'{url}?{query}'
+
+    def measure(self, client, name, url, options):
+        """반복 호출 후 응답 시간/쿼리 수 요약"""
+        for _ in range(options['warmup']):
+            client.get(url)
+
+        timings = []
+        query_counts = []
+        response = None
+        for _ in range(max(options['repeat'], 1)):
+            if options['cold']:
+                caches['shared'].clear()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(url)
+                elapsed = time.perf_counter() - started
+            timings.append(round(elapsed * 1000, 2))
+            query_counts.append(len(queries))
+
+        return {
+            'name': name,
+            'url': url,
+            'status': response.status_code,
+            'bytes': len(response.content),
+            'ms': {
+                'min': min(timings),
+                'median': round(statistics.median(timings), 2),
+                'p95': percentile(timings, 0.95),
+                'max': max(timings),
+            },
+            'queries': max(query_counts),
+        }
+
+    def compare(self, path, results):
+        """이전 리포트 대비 중앙값 변화 출력"""
+        with open(path, encoding='utf-8') as f:
+            previous = {item['url']: item for item in json.load(f)['results']}
+
+        self.stderr.write('\n이전 리포트 대비 (중앙값 ms / 쿼리 수)')
+        for item in results:
+            before = previous.get(item['url'])
+            if not before:
+                self.stderr.write(f"  {item['url']}: 신규 {item['ms']['median']}ms / {item['queries']}")
+                continue
+            ratio = item['ms']['median'] / before['ms']['median'] if before['ms']['median'] else 0
+            line = (
+                f"  {item['url']}: {before['ms']['median']} → {item['ms']['median']}ms "
+                f"(x{ratio:.2f}) / {before['queries']} → {item['queries']}"
+            )
+            self.stderr.write(self.style.ERROR(line) if ratio > 1.2 else line)
@@ -1,11 +1,9 @@
 # crm/management/commands/bulk_import.py
 from django.core.management.base import BaseCommand
-from django.db import transaction
-from crm.models import Customer, UploadHistory
+from crm.cleaning import UPLOAD_FIELDS
+from crm.models import UploadHistory
+from crm.streaming import chunk_size_setting, read_upload_chunks, stream_customer_import
 from django.contrib.auth.models import User
-import pandas as pd
-import re
-from datetime import datetime
 
 class Command(BaseCommand):
     help = '대용량 엑셀 파일을 안전하게 업로드'
@@ -13,151 +11,45 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('file_path', type=str, help='엑셀 파일 경로')
         parser.add_argument('--batch-size', type=int, default=500, help='배치 크기 (기본값: 500)')
+        parser.add_argument('--chunk-size', type=int, default=None, help='한 번에 읽는 행 수 (기본값: IMPORT_CHUNK_SIZE 설정)')
         parser.add_argument('--dry-run', action='store_true', help='실제 저장하지 않고 테스트만')
 
-    def clean_phone_number(self, phone):
-        """전화번호 정제"""
-        if not phone or pd.isna(phone):
-            return ''
-        phone = re.sub(r'[^\d]', '', str(phone))
-        if len(phone) == 11 and phone.startswith('010'):
-            return f"{phone[:3]}-{phone[3:7]}-{phone[7:]}"
-        elif len(phone) == 10 and phone.startswith('01'):
-            return f"0{phone[:2]}-{phone[2:6]}-{phone[6:]}"
-        return phone
-
-    def parse_date(self, date_value):
-        """날짜 파싱"""
-        if pd.isna(date_value) or not date_value:
-            return None
-        if hasattr(date_value, 'date'):
-            return date_value.date()
-        return None
-
-    def map_customer_grade(self, grade_str):
-        """고객등급 매핑"""
-        if not grade_str or pd.isna(grade_str):
-            return ''
-        grade_mapping = {
-            'VIP': 'vip', 'vip': 'vip',
-            '정회원': 'regular', '준회원': 'associate',
-            '신규': 'new',
-        }
-        return grade_mapping.get(str(grade_str).strip(), '')
-
-    def process_batch(self, batch_data):
-        """배치 데이터 처리"""
-        batch_new = 0
-        batch_updated = 0
-        
-        for phone, vehicle_number, customer_data in batch_data:
-            try:
-                customer, created = Customer.objects.update_or_create(
-                    phone=phone,
-                    vehicle_number=vehicle_number,
-                    defaults=customer_data
-                )
-                
-                # 우선순위와 태그 업데이트
-                customer.update_priority_tags()
-                customer.save()
-                
-                if created:
-                    batch_new += 1
-                else:
-                    batch_updated += 1
-                    
-            except Exception as e:
-                self.stdout.write(f'❌ 오류: {phone}, {vehicle_number} - {str(e)}')
-                continue
-                
-        return batch_new, batch_updated
-
     def handle(self, *args, **options):
         file_path = options['file_path']
         batch_size = options['batch_size']
+        chunk_size = options['chunk_size'] or chunk_size_setting()
         dry_run = options['dry_run']
         
         self.stdout.write(f'📂 파일 읽는 중: {file_path}')
         
         try:
-            # 엑셀 파일 읽기
-            if file_path.endswith('.csv'):
-                df = pd.read_csv(file_path, encoding='utf-8')
-            else:
-                df = pd.read_excel(file_path, sheet_name='고객')
-                
-            total_rows = len(df)
-            self.stdout.write(f'📊 총 {total_rows:,}개 행 발견')
-            
-            new_count = 0
-            updated_count = 0
-            error_count = 0
-            batch_data = []
-            
             if dry_run:
                 self.stdout.write(self.style.WARNING('🧪 DRY RUN 모드 - 실제로 저장하지 않습니다'))
             
-            # 데이터 처리
-            for index, row in df.iterrows():
-                try:
-                    # 진행률 표시
-                    if (index + 1) % 1000 == 0:
-                        progress = ((index + 1) / total_rows) * 100
-                        self.stdout.write(f'⏳ 진행률: {progress:.1f}% ({index + 1:,}/{total_rows:,})')
-                    
-                    # 필수 필드 검증
-                    name = str(row.get('고객명', '')).strip()
-                    phone = self.clean_phone_number(row.get('휴대전화', ''))
-                    vehicle_number = str(row.get('차량번호', '')).strip()
-                    
-                    if not name or not phone or not vehicle_number:
-                        error_count += 1
-                        continue
-                    
-                    # 고객 데이터 준비
-                    customer_data = {
-                        'name': name,
-                        'phone': phone,
-                        'vehicle_number': vehicle_number,
-                        'vehicle_name': str(row.get('차량명', '') or '').strip(),
-                        'vehicle_model': str(row.get('모델명', '') or '').strip(),
-                        'address': str(row.get('주소', '') or '').strip(),
-                        'inspection_expiry_date': self.parse_date(row.get('검사만료일')),
-                        'insurance_expiry_date': self.parse_date(row.get('보험만기일')),
-                        'vehicle_registration_date': self.parse_date(row.get('차량등록일')),
-                        'customer_grade': self.map_customer_grade(row.get('고객등급', '')),
-                        'visit_count': int(row.get('방문수', 0)) if pd.notna(row.get('방문수')) else 0,
-                        'last_inspection_completed': self.parse_date(row.get('검사만료일')),  # 임시로 설정
-                    }
-                    
-                    batch_data.append((phone, vehicle_number, customer_data))
-                    
-                    # 배치 처리
-                    if len(batch_data) >= batch_size:
-                        if not dry_run:
-                            with transaction.atomic():
-                                batch_new, batch_updated = self.process_batch(batch_data)
-                                new_count += batch_new
-                                updated_count += batch_updated
-                        else:
-                            new_count += len(batch_data)  # dry run에서는 모두 새로운 것으로 가정
-                        
-                        batch_data = []
-                        
-                except Exception as e:
-                    error_count += 1
-                    continue
+            def set_last_inspection(cleaned):
+                cleaned['last_inspection_completed'] = cleaned['inspection_expiry_date']  # 임시로 설정
+                return cleaned
+            
+            # 청크 단위로 읽어 정제/저장 (파일 전체를 메모리에 올리지 않음)
+            # 배치마다 기존 고객 조회 1회 + upsert 1회
+            def report_progress(summary):
+                self.stdout.write(
+                    f'⏳ {summary.total_rows:,}행 처리 '
+                    f'(신규 {summary.new_count:,}, 업데이트 {summary.updated_count:,}, 오류 {summary.error_count:,}, '
+                    f'메모리 {summary.peak_memory_mb:,.0f}MB)'
+                )
             
-            # 남은 데이터 처리
-            if batch_data:
-                if not dry_run:
-                    with transaction.atomic():
-                        batch_new, batch_updated = self.process_batch(batch_data)
-                        new_count += batch_new
-                        updated_count += batch_updated
-                else:
-                    new_count += len(batch_data)
+            summary = stream_customer_import(
+                read_upload_chunks(file_path, file_path, chunk_size),
+                fields=UPLOAD_FIELDS + ['last_inspection_completed'],
+                prepare=set_last_inspection,
+                batch_size=batch_size,
+                progress=report_progress,
+                dry_run=dry_run,
+            )
+            new_count = summary.new_count  # dry run에서는 유효 행을 모두 신규로 가정
+            updated_count = summary.updated_count
+            error_count = summary.error_count
             
             # 결과 출력
             self.stdout.write(self.style.SUCCESS(f"""
@@ -169,7 +61,8 @@ class Command(BaseCommand):
   - 오류: {error_count:,}건
   - 총 처리: {new_count + updated_count:,}건
 
-⏱️  배치 크기: {batch_size}개씩 처리
+⏱️  배치 크기: {batch_size}개씩 처리 (읽기 {chunk_size:,}행씩)
+💾 최대 메모리: {summary.peak_memory_mb:,.0f}MB (시작 대비 +{summary.memory_growth_mb:,.0f}MB)
 """))
             
             # 업로드 이력 저장 (실제 업로드인 경우)
@@ -184,7 +77,10 @@ class Command(BaseCommand):
                             new_records=new_count,
                             updated_records=updated_count,
                             error_count=error_count,
-                            notes=f"명령어 대량 업로드 완료 (배치크기: {batch_size})"
+                            notes=(
+                                f"명령어 대량 업로드 완료 (배치크기: {batch_size}, 총 {summary.total_rows:,}행, "
+                                f"최대 메모리 {summary.peak_memory_mb:,.0f}MB)"
+                            )
                         )
                 except Exception:
                     pass  # 이력 저장 실패해도 무시
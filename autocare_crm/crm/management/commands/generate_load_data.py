@@ -0,0 +1,303 @@
+# crm/management/commands/generate_load_data.py
+"""부하 테스트용 대용량 가상 데이터 생성
+
+같은 --seed 로 실행하면 (실행 날짜 기준) 같은 데이터가 만들어진다.
+생성된 고객은 data_source='synthetic', 사용자는 'load_' 로 시작하므로
+--flush 로 가상 데이터만 삭제할 수 있다.
+
+예) python manage.py generate_load_data --customers 1000000 --calls 10000000 --teams 20
+"""
+import random
+import time
+from datetime import datetime, timedelta, time as dt_time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from crm.models import Customer, CallRecord, CallAssignment, CallFollowUp, CustomerVisibility, DailyContact, UserProfile
+from crm.rollups import rebuild_agent_daily_stats
+from crm.stats import invalidate_sidebar_stats
+from crm.visibility import rebuild_customer_visibility
+
+
+SYNTHETIC_SOURCE = 'synthetic'
+USERNAME_PREFIX = 'load_'
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN_NAMES = ['민준', '서연', '도윤', '하은', '시우', '지유', '주원', '서윤', '하준', '지민', '예준', '수아', '현우', '지우', '건우']
+VEHICLES = [
+    ('소나타', 'DN8'), ('K5', 'DL3'), ('그랜저', 'GN7'), ('아반떼', 'CN7'), ('투싼', 'NX4'),
+    ('스포티지', 'NQ5'), ('K3', 'BD'), ('모닝', 'JA'), ('카니발', 'KA4'), ('싼타페', 'MX5'),
+    ('제네시스 G80', 'RG3'), ('포터2', 'HR'),
+]
+PLATE_LETTERS = '가나다라마거너더러머버서어저고노도로모보소오조구누두루무부수우주'
+
+# (값, 가중치)
+GRADES = [('vip', 3), ('regular', 25), ('associate', 20), ('new', 22), ('', 30)]
+CUSTOMER_STATUSES = [('pending', 55), ('contacted', 20), ('interested', 8), ('not_interested', 10), ('callback', 5), ('converted', 2)]
+CALL_RESULTS = [('connected', 55), ('no_answer', 25), ('busy', 10), ('callback_requested', 7), ('wrong_number', 3)]
+INTEREST_TYPES = [(None, 45), ('none', 25), ('insurance', 10), ('maintenance', 12), ('financing', 4), ('multiple', 4)]
+ATTITUDES = [(None, 40), ('positive', 20), ('neutral', 30), ('negative', 10)]
+ASSIGNMENT_STATUSES = [('pending', 45), ('in_progress', 15), ('completed', 35), ('cancelled', 5)]
+ASSIGNMENT_PRIORITIES = [('urgent', 5), ('high', 20), ('normal', 60), ('low', 15)]
+# 시간대별 통화 비중 (점심시간 감소)
+CALL_HOURS = [(9, 8), (10, 13), (11, 13), (12, 4), (13, 8), (14, 13), (15, 13), (16, 12), (17, 10), (18, 6)]
+
+
+def weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+class Command(BaseCommand):
+    help = '부하 테스트용 대용량 가상 데이터 생성 (bulk_create, 고정 seed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=10000, help='고객 수 (기본값: 10000)')
+        parser.add_argument('--calls', type=int, default=100000, help='통화 기록 수 (기본값: 100000)')
+        parser.add_argument('--assignments', type=int, default=None, help='콜 배정 수 (기본값: 고객 수의 5%%)')
+        parser.add_argument('--teams', type=int, default=5, help='팀 수 (기본값: 5)')
+        parser.add_argument('--agents-per-team', type=int, default=8, help='팀별 상담원 수 (기본값: 8)')
+        parser.add_argument('--days', type=int, default=90, help='통화 기록 기간 (일, 기본값: 90)')
+        parser.add_argument('--seed', type=int, default=42, help='난수 seed (기본값: 42)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='배치 크기 (기본값: 5000)')
+        parser.add_argument('--password', type=str, default='load1234', help='가상 계정 비밀번호')
+        parser.add_argument('--flush', action='store_true', help='기존 가상 데이터 삭제 후 생성')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.today = timezone.localdate()
+        started = time.perf_counter()
+
+        if options['flush']:
+            self.flush()
+
+        agents_by_team = self.create_users(options['teams'], options['agents_per_team'], options['password'])
+        customer_ids = self.create_customers(options['customers'])
+        if not customer_ids:
+            self.stdout.write(self.style.WARNING('생성된 고객이 없어 통화 기록을 만들지 않습니다.'))
+            return
+
+        self.create_calls(options['calls'], customer_ids, agents_by_team, options['days'])
+        # bulk_create는 시그널을 보내지 않으므로 상담원 일별 집계는 기간 전체 재계산
+        self.stdout.write('상담원 일별 집계 계산 중...')
+        rebuild_agent_daily_stats(self.today - timedelta(days=options['days']), self.today)
+
+        assignments = options['assignments']
+        if assignments is None:
+            assignments = len(customer_ids) // 20
+        self.create_assignments(assignments, customer_ids, agents_by_team)
+        self.stdout.write('상담원 조회 가능 고객 계산 중...')
+        rebuild_customer_visibility()
+
+        invalidate_sidebar_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 가상 데이터 생성 완료 ({time.perf_counter() - started:.1f}초)'
+        ))
+
+    # ------------------------------------------------------------------
+    def flush(self):
+        """가상 데이터 삭제
+
+        CallRecord에 삭제 시그널이 있어 일반 delete()는 전체 행을 읽어온다.
+        가상 데이터는 통째로 지우므로 SQL DELETE로 바로 삭제한다.
+        """
+        self.stdout.write('기존 가상 데이터 삭제 중...')
+        with transaction.atomic():
+            customers = Customer.objects.filter(data_source=SYNTHETIC_SOURCE)
+            calls = CallRecord.objects.filter(customer__in=customers)
+            for queryset in [
+                DailyContact.objects.filter(customer__in=customers),
+                CustomerVisibility.objects.filter(customer__in=customers),
+                CallFollowUp.objects.filter(call_record__in=calls),
+                CallAssignment.objects.filter(customer__in=customers),
+                calls,
+                customers,
+            ]:
+                queryset._raw_delete(queryset.db)
+            User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def create_users(self, team_count, agents_per_team, password):
+        """팀장/상담원 계정 생성 (이미 있으면 재사용)"""
+        password_hash = make_password(password)
+        agents_by_team = {}
+
+        admin, created = User.objects.get_or_create(
+            username=f'{USERNAME_PREFIX}admin',
+            defaults={'password': password_hash, 'is_staff': True}
+        )
+        if created:
+            UserProfile.objects.create(user=admin, role='admin', team='운영팀', daily_call_target=0)
+
+        for t in range(1, team_count + 1):
+            team = f'가상{t:02d}팀'
+            usernames = [f'{USERNAME_PREFIX}mgr{t:02d}'] + [
+                f'{USERNAME_PREFIX}agent{t:02d}_{i:02d}' for i in range(1, agents_per_team + 1)
+            ]
+            existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+            new_users = User.objects.bulk_create([
+                User(username=username, password=password_hash)
+                for username in usernames if username not in existing
+            ])
+            UserProfile.objects.bulk_create([
+                UserProfile(
+                    user=user,
+                    role='manager' if user.username == usernames[0] else 'agent',
+                    team=team,
+                    daily_call_target=50 if user.username == usernames[0] else 100,
+                )
+                for user in new_users
+            ])
+
+            members = {user.username: user.id for user in User.objects.filter(username__in=usernames)}
+            agents_by_team[team] = {
+                'manager': members[usernames[0]],
+                'agents': [members[username] for username in usernames[1:]],
+            }
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 계정 준비: {team_count}개 팀, 팀별 상담원 {agents_per_team}명 (+팀장)'
+        ))
+        return agents_by_team
+
+    def create_customers(self, count):
+        """고객 생성 (전화번호/차량번호는 순번 기반으로 고유)"""
+        offset = Customer.objects.filter(data_source=SYNTHETIC_SOURCE).count()
+        rng = self.rng
+        created = 0
+
+        for start in range(offset, offset + count, self.batch_size):
+            batch = []
+            for i in range(start, min(start + self.batch_size, offset + count)):
+                vehicle_name, vehicle_model = rng.choice(VEHICLES)
+                customer = Customer(
+                    name=rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES),
+                    phone=f'019-{(i // 10000) % 10000:04d}-{i % 10000:04d}',
+                    vehicle_number=f'{10 + i % 90}{PLATE_LETTERS[(i // 90) % len(PLATE_LETTERS)]}{(i // 2970) % 10000:04d}',
+                    vehicle_name=vehicle_name,
+                    vehicle_model=vehicle_model,
+                    customer_grade=weighted(rng, GRADES),
+                    visit_count=min(int(rng.expovariate(0.4)), 30),
+                    inspection_expiry_date=self.today + timedelta(days=rng.randint(-1800, 730)),
+                    status=weighted(rng, CUSTOMER_STATUSES),
+                    data_source=SYNTHETIC_SOURCE,
+                )
+                customer.calculate_inspection_date(self.today)
+                customer.update_priority_tags()
+                customer.update_phone_digits()  # bulk_create는 save()를 거치지 않음
+                batch.append(customer)
+
+            with transaction.atomic():
+                Customer.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+            self.stdout.write(f'  고객 {created:,}/{count:,}')
+
+        return list(
+            Customer.objects.filter(data_source=SYNTHETIC_SOURCE).order_by('id').values_list('id', flat=True)
+        )
+
+    def random_call_date(self, days):
+        """최근일 비중이 높은 업무시간 통화일시"""
+        rng = self.rng
+        day = self.today - timedelta(days=int(days * rng.random() ** 1.5))
+        moment = datetime.combine(day, dt_time(weighted(rng, CALL_HOURS), rng.randint(0, 59), rng.randint(0, 59)))
+        call_date = timezone.make_aware(moment)
+        if call_date > timezone.now():
+            call_date -= timedelta(days=1)
+        return call_date
+
+    def create_calls(self, count, customer_ids, agents_by_team, days):
+        """통화 기록 생성 + DailyContact 반영 (bulk_create는 시그널을 보내지 않음)"""
+        rng = self.rng
+        callers = []
+        weights = []
+        for team in agents_by_team.values():
+            # 상담원마다 업무량 차이, 팀장은 소량 통화
+            for agent_id in team['agents']:
+                callers.append(agent_id)
+                weights.append(rng.uniform(0.5, 1.5))
+            callers.append(team['manager'])
+            weights.append(0.2)
+
+        pending_parents = []  # 후속조치 대상 통화 (후속 통화의 원통화 후보)
+        created = 0
+
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for _ in range(min(self.batch_size, count - start)):
+                call_result = weighted(rng, CALL_RESULTS)
+                requires_follow_up = call_result in ('connected', 'callback_requested') and rng.random() < 0.3
+                call = CallRecord(
+                    customer_id=rng.choice(customer_ids),
+                    caller_id=rng.choices(callers, weights)[0],
+                    call_date=self.random_call_date(days),
+                    call_result=call_result,
+                    interest_type=weighted(rng, INTEREST_TYPES) if call_result == 'connected' else None,
+                    customer_attitude=weighted(rng, ATTITUDES) if call_result == 'connected' else None,
+                    notes='가상 상담 내용',
+                    requires_follow_up=requires_follow_up,
+                    follow_up_completed=requires_follow_up and rng.random() < 0.6,
+                    is_deleted=rng.random() < 0.02,
+                )
+                if requires_follow_up:
+                    call.follow_up_date = call.call_date.date() + timedelta(days=rng.randint(1, 14))
+                if pending_parents and rng.random() < 0.08:
+                    parent_id, parent_customer_id, parent_date = pending_parents.pop(rng.randrange(len(pending_parents)))
+                    call.parent_call_id = parent_id
+                    call.customer_id = parent_customer_id
+                    call.call_date = max(call.call_date, parent_date + timedelta(hours=1))
+                batch.append(call)
+
+            with transaction.atomic():
+                CallRecord.objects.bulk_create(batch, batch_size=self.batch_size)
+                DailyContact.objects.bulk_create(
+                    [
+                        DailyContact(customer_id=customer_id, contact_date=contact_date)
+                        for customer_id, contact_date in {
+                            (call.customer_id, timezone.localdate(call.call_date))
+                            for call in batch if not call.is_deleted
+                        }
+                    ],
+                    batch_size=self.batch_size,
+                    ignore_conflicts=True
+                )
+
+            pending_parents.extend(
+                (call.id, call.customer_id, call.call_date)
+                for call in batch
+                if call.requires_follow_up and call.id and call.call_date < timezone.now() - timedelta(hours=1)
+            )
+            pending_parents = pending_parents[-self.batch_size:]
+            created += len(batch)
+            self.stdout.write(f'  통화 기록 {created:,}/{count:,}')
+
+    def create_assignments(self, count, customer_ids, agents_by_team):
+        """콜 배정 생성 (팀장 → 팀원)"""
+        rng = self.rng
+        teams = list(agents_by_team.values())
+        created = 0
+        now = timezone.now()
+
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for _ in range(min(self.batch_size, count - start)):
+                team = rng.choice(teams)
+                status = weighted(rng, ASSIGNMENT_STATUSES)
+                batch.append(CallAssignment(
+                    customer_id=rng.choice(customer_ids),
+                    assigned_to_id=rng.choice(team['agents']),
+                    assigned_by_id=team['manager'],
+                    status=status,
+                    priority=weighted(rng, ASSIGNMENT_PRIORITIES),
+                    due_date=self.today + timedelta(days=rng.randint(0, 7)),
+                    completed_at=now - timedelta(minutes=rng.randint(0, 480)) if status == 'completed' else None,
+                ))
+            with transaction.atomic():
+                CallAssignment.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ 콜 배정 {created:,}건 생성'))
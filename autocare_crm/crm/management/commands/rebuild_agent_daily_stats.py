@@ -0,0 +1,45 @@
+# crm/management/commands/rebuild_agent_daily_stats.py
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from crm.rollups import rebuild_agent_daily_stats
+
+
+class Command(BaseCommand):
+    help = '상담원 일별 집계(AgentDailyStats)를 통화 기록으로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date-from',
+            type=str,
+            help='시작일 (YYYY-MM-DD 형식). 기본값: 첫 통화일',
+        )
+        parser.add_argument(
+            '--date-to',
+            type=str,
+            help='종료일 (YYYY-MM-DD 형식). 기본값: 마지막 통화일',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='최근 N일만 재계산 (해피콜 예정일 변경 후 등)',
+        )
+
+    def parse_date(self, value):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'잘못된 날짜 형식입니다: {value}')
+
+    def handle(self, *args, **options):
+        date_from = self.parse_date(options['date_from']) if options.get('date_from') else None
+        date_to = self.parse_date(options['date_to']) if options.get('date_to') else None
+
+        if options.get('days'):
+            date_to = date_to or timezone.localdate()
+            date_from = date_to - timedelta(days=options['days'] - 1)
+
+        created = rebuild_agent_daily_stats(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f'✅ 상담원 일별 집계 {created:,}건 재계산 완료'))
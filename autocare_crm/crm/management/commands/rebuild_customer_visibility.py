@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from crm.visibility import rebuild_customer_visibility
+
+
+class Command(BaseCommand):
+    help = '상담원별 조회 가능 고객(CustomerVisibility)을 배정/통화 기록으로 다시 계산합니다.'
+
+    def handle(self, *args, **options):
+        created = rebuild_customer_visibility()
+        self.stdout.write(self.style.SUCCESS(f'✅ 상담원 조회 가능 고객 {created:,}건 재계산 완료'))
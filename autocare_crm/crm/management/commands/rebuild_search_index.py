@@ -0,0 +1,14 @@
+# crm/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand, CommandError
+
+from crm.models import Customer
+from crm.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = '고객 검색 색인(FTS5)을 고객 테이블 기준으로 다시 만듭니다.'
+
+    def handle(self, *args, **options):
+        if not install_search_index(rebuild=True):
+            raise CommandError('검색 색인은 SQLite에서만 사용합니다.')
+        self.stdout.write(self.style.SUCCESS(f'✅ 고객 {Customer.objects.count():,}명 검색 색인 재생성 완료'))
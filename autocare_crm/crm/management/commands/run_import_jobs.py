@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from crm.jobs import ImportJobLost, claim_next_job, retry_job, run_import_job
+from crm.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = '고객 업로드 백그라운드 작업(ImportJob)을 처리하는 워커. 중단된 작업은 마지막으로 저장한 청크 다음부터 이어서 처리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='대기 작업을 모두 처리하면 종료')
+        parser.add_argument('--poll-interval', type=float, default=5, help='대기 작업 확인 주기 (초, 기본값: 5)')
+        parser.add_argument('--chunk-size', type=int, default=None, help='한 번에 읽는 행 수 (기본값: IMPORT_CHUNK_SIZE 설정)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='upsert 배치 크기 (기본값: 1000)')
+        parser.add_argument('--retry', type=int, metavar='JOB_ID', help='실패한 작업을 대기로 되돌린 뒤 처리')
+
+    def handle(self, *args, **options):
+        if options['retry']:
+            try:
+                retry_job(ImportJob.objects.get(pk=options['retry'], status='failed'))
+            except ImportJob.DoesNotExist:
+                raise CommandError(f'실패한 업로드 작업 #{options["retry"]}이(가) 없습니다.')
+
+        self.stdout.write('🚚 업로드 작업 워커 시작')
+        while True:
+            # 오래 떠 있는 워커가 끊긴 DB 연결을 계속 쓰지 않도록 작업마다 정리
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            resumed = f' ({job.rows_parsed:,}행부터 이어서)' if job.rows_parsed else ''
+            self.stdout.write(f'📂 작업 #{job.pk} {job.file_name} 처리 시작{resumed}')
+            try:
+                run_import_job(
+                    job,
+                    chunk_size=options['chunk_size'],
+                    batch_size=options['batch_size'],
+                    progress=self.report_progress,
+                )
+            except ImportJobLost as e:
+                self.stdout.write(self.style.WARNING(f'⚠️ {e} 처리를 중단합니다.'))
+                continue
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'❌ 작업 #{job.pk} 실패: {e}'))
+                continue
+
+            self.stdout.write(self.style.SUCCESS(
+                f'🎉 작업 #{job.pk} 완료: 신규 {job.new_records:,}건, 업데이트 {job.updated_records:,}건, '
+                f'오류 {job.error_count:,}건 (최대 메모리 {job.peak_memory_mb:,.0f}MB)'
+            ))
+
+    def report_progress(self, job):
+        total = f'/{job.total_rows:,}' if job.total_rows else ''
+        self.stdout.write(
+            f'⏳ 작업 #{job.pk}: {job.rows_parsed:,}{total}행 처리 '
+            f'(신규 {job.new_records:,}, 업데이트 {job.updated_records:,}, 오류 {job.error_count:,})'
+        )
@@ -2,6 +2,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from crm.models import Customer
+from crm.stats import invalidate_sidebar_stats
 from datetime import datetime, timedelta
 import logging
 
@@ -146,6 +147,8 @@ class Command(BaseCommand):
             
             if dry_run:
                 transaction.set_rollback(True)
+            else:
+                invalidate_sidebar_stats()
         
         # 결과 요약
         self.stdout.write('\n' + '='*50)
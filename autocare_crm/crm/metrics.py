@@ -0,0 +1,177 @@
+# crm/metrics.py
+"""요청별 성능 측정 (쿼리 수, DB 시간, 템플릿 렌더링 시간, 전체 응답 시간)
+
+RequestMetricsMiddleware가 요청마다 측정값을 만들고,
+URL 이름별 최근 N건을 프로세스 메모리(MetricsStore)에 보관한다.
+관리자 전용 API(request_metrics_api)에서 요약을 조회할 수 있다.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.template.exceptions import TemplateDoesNotExist
+from django.utils import timezone
+
+
+DEFAULT_WINDOW = 200          # URL 이름별 보관 건수
+SLOW_QUERY_LIMIT = 5          # 요약에 포함할 느린 쿼리 수
+SQL_PREVIEW_LENGTH = 300
+
+_current_metrics = contextvars.ContextVar('crm_request_metrics', default=None)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+class RequestMetrics:
+    """요청 1건의 측정값"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.total_time = 0.0
+        self.slow_queries = []  # (소요 시간, SQL)
+
+    def record_query(self, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+        self.slow_queries.append((duration, sql[:SQL_PREVIEW_LENGTH]))
+        if len(self.slow_queries) > SLOW_QUERY_LIMIT:
+            self.slow_queries.sort(reverse=True)
+            self.slow_queries.pop()
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper 용 쿼리 측정"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_query(sql, time.perf_counter() - started)
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+
+    def server_timing(self):
+        """Server-Timing 헤더 값"""
+        return (
+            f'db;desc="{self.query_count} queries";dur={_ms(self.db_time)}, '
+            f'template;dur={_ms(self.template_time)}, '
+            f'total;dur={_ms(self.total_time)}'
+        )
+
+
+def start_request_metrics():
+    metrics = RequestMetrics()
+    return metrics, _current_metrics.set(metrics)
+
+
+def stop_request_metrics(token):
+    _current_metrics.reset(token)
+
+
+class MetricsStore:
+    """URL 이름별 최근 측정값 (프로세스 메모리, 스레드 안전)"""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, view_name, metrics):
+        sample = {
+            'at': timezone.now(),
+            'total_ms': _ms(metrics.total_time),
+            'db_ms': _ms(metrics.db_time),
+            'template_ms': _ms(metrics.template_time),
+            'queries': metrics.query_count,
+            'slow_queries': [
+                {'sql': sql, 'ms': _ms(duration)}
+                for duration, sql in sorted(metrics.slow_queries, reverse=True)
+            ],
+        }
+        with self._lock:
+            samples = self._samples.get(view_name)
+            if samples is None:
+                samples = self._samples[view_name] = deque(maxlen=self.window)
+            samples.append(sample)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self, view_name=None):
+        """URL 이름별 요약 (p95 응답 시간 느린 순)"""
+        with self._lock:
+            snapshot = {
+                name: list(samples)
+                for name, samples in self._samples.items()
+                if view_name is None or name == view_name
+            }
+
+        views = [self._summarize(name, samples) for name, samples in snapshot.items()]
+        return sorted(views, key=lambda item: item['total_ms']['p95'], reverse=True)
+
+    @staticmethod
+    def _summarize(name, samples):
+        def stats(key):
+            values = sorted(sample[key] for sample in samples)
+            return {
+                'avg': round(sum(values) / len(values), 2),
+                'p50': values[int(round(0.50 * (len(values) - 1)))],
+                'p95': values[int(round(0.95 * (len(values) - 1)))],
+                'max': values[-1],
+            }
+
+        slow_queries = sorted(
+            (query for sample in samples for query in sample['slow_queries']),
+            key=lambda query: query['ms'],
+            reverse=True
+        )[:SLOW_QUERY_LIMIT]
+
+        return {
+            'view': name,
+            'count': len(samples),
+            'last_seen': samples[-1]['at'],
+            'total_ms': stats('total_ms'),
+            'db_ms': stats('db_ms'),
+            'template_ms': stats('template_ms'),
+            'queries': stats('queries'),
+            'slowest_queries': slow_queries,
+        }
+
+
+request_metrics = MetricsStore(getattr(settings, 'REQUEST_METRICS_WINDOW', DEFAULT_WINDOW))
+
+
+class InstrumentedTemplate(Template):
+    """렌더링 시간을 현재 요청 측정값에 더하는 템플릿"""
+
+    def render(self, context=None, request=None):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """템플릿 렌더링 시간 측정용 Django 템플릿 백엔드"""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
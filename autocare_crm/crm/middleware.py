@@ -0,0 +1,49 @@
+# crm/middleware.py
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from .metrics import request_metrics, start_request_metrics, stop_request_metrics
+
+
+class RequestMetricsMiddleware:
+    """URL 이름별 쿼리 수/DB 시간/템플릿 시간/응답 시간 측정
+
+    REQUEST_METRICS_HEADER 설정 시 Server-Timing 헤더로 측정값을 내려준다.
+    동기 전용이다. 쿼리는 요청 스레드의 execute_wrapper 로 세는데, async 뷰(live_stream 등)의 쿼리는
+    sync_to_async 스레드에서 실행되어 잡히지 않으므로 async 뷰의 측정값은 보관하지 않는다.
+    """
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_METRICS_ENABLED', settings.DEBUG)
+        self.add_header = getattr(settings, 'REQUEST_METRICS_HEADER', False)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics, token = start_request_metrics()
+        try:
+            with connection.execute_wrapper(metrics.query_wrapper):
+                response = self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        metrics.finish()
+        if getattr(request, 'skip_request_metrics', False):
+            return response
+
+        match = request.resolver_match
+        view_name = (match.view_name if match else None) or 'unresolved'
+        request_metrics.add(view_name, metrics)
+
+        if self.add_header:
+            response['Server-Timing'] = metrics.server_timing()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if iscoroutinefunction(view_func):
+            request.skip_request_metrics = True
+        return None
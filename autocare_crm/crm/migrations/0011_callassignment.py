@@ -18,8 +18,6 @@ class Migration(migrations.Migration):
             fields=[
                 ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
                 ('assigned_date', models.DateTimeField(auto_now_add=True)),
-                ('due_date', models.DateField(blank=True, null=True, verbose_name='처리기한')),
-                ('priority', models.CharField(choices=[('urgent', '긴급'), ('high', '높음'), ('normal', '보통'), ('low', '낮음')], default='normal', max_length=10)),
                 ('status', models.CharField(choices=[('pending', '대기'), ('in_progress', '진행중'), ('completed', '완료'), ('cancelled', '취소')], default='pending', max_length=20)),
                 ('notes', models.TextField(blank=True, verbose_name='배정메모')),
                 ('completed_date', models.DateTimeField(blank=True, null=True)),
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:08
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+HAPPY_CALL_DAYS = {
+    '3month': 90,
+    '6month': 180,
+    '12month': 365,
+    '18month': 548,
+}
+
+
+def fill_happy_call_dates(apps, schema_editor):
+    """기존 고객의 해피콜 예정일 채우기"""
+    Customer = apps.get_model('crm', 'Customer')
+    fields = [f'happy_call_{key}_date' for key in HAPPY_CALL_DAYS]
+    batch = []
+    queryset = Customer.objects.filter(actual_inspection_date__isnull=False).only('id', 'actual_inspection_date')
+    for customer in queryset.iterator(chunk_size=2000):
+        for key, days in HAPPY_CALL_DAYS.items():
+            setattr(customer, f'happy_call_{key}_date', customer.actual_inspection_date + timedelta(days=days))
+        batch.append(customer)
+        if len(batch) >= 2000:
+            Customer.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Customer.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0014_customer_actual_inspection_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='happy_call_12month_date',
+            field=models.DateField(blank=True, db_index=True, null=True, verbose_name='12개월콜 예정일'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='happy_call_18month_date',
+            field=models.DateField(blank=True, db_index=True, null=True, verbose_name='18개월콜 예정일'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='happy_call_3month_date',
+            field=models.DateField(blank=True, db_index=True, null=True, verbose_name='3개월콜 예정일'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='happy_call_6month_date',
+            field=models.DateField(blank=True, db_index=True, null=True, verbose_name='6개월콜 예정일'),
+        ),
+        migrations.RunPython(fill_happy_call_dates, migrations.RunPython.noop),
+    ]
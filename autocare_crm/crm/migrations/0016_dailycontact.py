@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def fill_daily_contacts(apps, schema_editor):
+    """기존 통화 기록으로 일별 통화 고객 채우기"""
+    CallRecord = apps.get_model('crm', 'CallRecord')
+    DailyContact = apps.get_model('crm', 'DailyContact')
+    seen = set()
+    batch = []
+    calls = CallRecord.objects.filter(is_deleted=False).values_list('customer_id', 'call_date')
+    for customer_id, call_date in calls.iterator(chunk_size=5000):
+        key = (timezone.localdate(call_date), customer_id)
+        if key in seen:
+            continue
+        seen.add(key)
+        batch.append(DailyContact(contact_date=key[0], customer_id=customer_id))
+        if len(batch) >= 5000:
+            DailyContact.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        DailyContact.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0015_customer_happy_call_dates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyContact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact_date', models.DateField(verbose_name='통화일')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_contacts', to='crm.customer')),
+            ],
+            options={
+                'verbose_name': '일별통화고객',
+                'verbose_name_plural': '일별통화고객들',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailycontact',
+            constraint=models.UniqueConstraint(fields=('contact_date', 'customer'), name='unique_daily_contact'),
+        ),
+        migrations.RunPython(fill_daily_contacts, migrations.RunPython.noop),
+    ]
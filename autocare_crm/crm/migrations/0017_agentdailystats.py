@@ -0,0 +1,109 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:27
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+import django.db.models.deletion
+from django.utils import timezone
+
+
+RESULTS = ['connected', 'no_answer', 'busy', 'wrong_number', 'callback_requested']
+INTERESTS = ['insurance', 'maintenance', 'financing', 'multiple', 'none']
+HAPPY_CALLS = ['3month', '6month', '12month', '18month']
+HAPPY_CALL_WINDOW = 7
+
+
+def fill_agent_daily_stats(apps, schema_editor):
+    """기존 통화 기록으로 상담원 일별 집계 채우기 (날짜별 쿼리 1회)"""
+    CallRecord = apps.get_model('crm', 'CallRecord')
+    AgentDailyStats = apps.get_model('crm', 'AgentDailyStats')
+    calls = CallRecord.objects.filter(is_deleted=False)
+    bounds = calls.aggregate(first=Min('call_date'), last=Max('call_date'))
+    if bounds['first'] is None:
+        return
+
+    stat_date = timezone.localdate(bounds['first'])
+    last_date = timezone.localdate(bounds['last'])
+    while stat_date <= last_date:
+        start = timezone.make_aware(datetime.combine(stat_date, time.min))
+        window = (stat_date - timedelta(days=HAPPY_CALL_WINDOW), stat_date + timedelta(days=HAPPY_CALL_WINDOW))
+
+        aggregates = {'total_calls': Count('id'), 'last_call_at': Max('call_date')}
+        for result in RESULTS:
+            aggregates[f'{result}_calls'] = Count('id', filter=Q(call_result=result))
+        for interest in INTERESTS:
+            aggregates[f'interest_{interest}_calls'] = Count('id', filter=Q(interest_type=interest))
+        aggregates['followup_required'] = Count('id', filter=Q(requires_follow_up=True))
+        aggregates['followup_completed'] = Count('id', filter=Q(requires_follow_up=True, follow_up_completed=True))
+        for key in HAPPY_CALLS:
+            aggregates[f'happy_call_{key}_calls'] = Count(
+                'id', filter=Q(**{f'customer__happy_call_{key}_date__range': window})
+            )
+
+        rows = calls.filter(
+            call_date__gte=start,
+            call_date__lt=start + timedelta(days=1)
+        ).values('caller_id').annotate(**aggregates).order_by()
+        AgentDailyStats.objects.bulk_create([AgentDailyStats(stat_date=stat_date, **row) for row in rows])
+        stat_date += timedelta(days=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('crm', '0016_dailycontact'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgentDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stat_date', models.DateField(verbose_name='통화일')),
+                ('total_calls', models.IntegerField(default=0, verbose_name='전체통화')),
+                ('connected_calls', models.IntegerField(default=0, verbose_name='통화성공')),
+                ('no_answer_calls', models.IntegerField(default=0, verbose_name='부재중')),
+                ('busy_calls', models.IntegerField(default=0, verbose_name='통화중')),
+                ('wrong_number_calls', models.IntegerField(default=0, verbose_name='잘못된번호')),
+                ('callback_requested_calls', models.IntegerField(default=0, verbose_name='재통화요청')),
+                ('interest_insurance_calls', models.IntegerField(default=0, verbose_name='보험관심')),
+                ('interest_maintenance_calls', models.IntegerField(default=0, verbose_name='소모품교체관심')),
+                ('interest_financing_calls', models.IntegerField(default=0, verbose_name='자동차금융관심')),
+                ('interest_multiple_calls', models.IntegerField(default=0, verbose_name='복수관심')),
+                ('interest_none_calls', models.IntegerField(default=0, verbose_name='관심없음')),
+                ('followup_required', models.IntegerField(default=0, verbose_name='후속조치필요')),
+                ('followup_completed', models.IntegerField(default=0, verbose_name='후속조치완료')),
+                ('happy_call_3month_calls', models.IntegerField(default=0, verbose_name='3개월콜')),
+                ('happy_call_6month_calls', models.IntegerField(default=0, verbose_name='6개월콜')),
+                ('happy_call_12month_calls', models.IntegerField(default=0, verbose_name='12개월콜')),
+                ('happy_call_18month_calls', models.IntegerField(default=0, verbose_name='18개월콜')),
+                ('last_call_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막통화일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+            ],
+            options={
+                'verbose_name': '상담원일별집계',
+                'verbose_name_plural': '상담원일별집계들',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='callrecord',
+            index=models.Index(fields=['caller', 'call_date'], name='crm_callrec_caller__77659e_idx'),
+        ),
+        migrations.AddField(
+            model_name='agentdailystats',
+            name='caller',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL, verbose_name='상담원'),
+        ),
+        migrations.AddIndex(
+            model_name='agentdailystats',
+            index=models.Index(fields=['stat_date', 'caller'], name='crm_agentda_stat_da_df5567_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='agentdailystats',
+            constraint=models.UniqueConstraint(fields=('caller', 'stat_date'), name='unique_agent_daily_stats'),
+        ),
+        migrations.RunPython(fill_agent_daily_stats, migrations.RunPython.noop),
+    ]
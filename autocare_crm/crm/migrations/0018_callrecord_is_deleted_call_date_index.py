@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0017_agentdailystats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='callrecord',
+            index=models.Index(fields=['is_deleted', 'call_date'], name='crm_callrec_is_dele_16b523_idx'),
+        ),
+    ]
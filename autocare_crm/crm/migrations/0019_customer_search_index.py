@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# 고객 검색 FTS5 trigram 색인 (SQLite 전용)
+# 이 시점의 색인 컬럼: name, phone, vehicle_number (숫자 컬럼은 0020 에서 추가)
+CREATE_SEARCH_INDEX = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS crm_customer_search USING fts5("
+    "name, phone, vehicle_number, content='crm_customer', content_rowid='id', tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS crm_customer_search_ai AFTER INSERT ON crm_customer BEGIN
+        INSERT INTO crm_customer_search(rowid, name, phone, vehicle_number)
+        VALUES (new.id, new.name, new.phone, new.vehicle_number);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS crm_customer_search_ad AFTER DELETE ON crm_customer BEGIN
+        INSERT INTO crm_customer_search(crm_customer_search, rowid, name, phone, vehicle_number)
+        VALUES ('delete', old.id, old.name, old.phone, old.vehicle_number);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS crm_customer_search_au AFTER UPDATE OF name, phone, vehicle_number ON crm_customer BEGIN
+        INSERT INTO crm_customer_search(crm_customer_search, rowid, name, phone, vehicle_number)
+        VALUES ('delete', old.id, old.name, old.phone, old.vehicle_number);
+        INSERT INTO crm_customer_search(rowid, name, phone, vehicle_number)
+        VALUES (new.id, new.name, new.phone, new.vehicle_number);
+    END""",
+    # 기존 고객 색인
+    "INSERT INTO crm_customer_search(crm_customer_search) VALUES ('rebuild')",
+]
+
+DROP_SEARCH_INDEX = [
+    "DROP TRIGGER IF EXISTS crm_customer_search_ai",
+    "DROP TRIGGER IF EXISTS crm_customer_search_ad",
+    "DROP TRIGGER IF EXISTS crm_customer_search_au",
+    "DROP TABLE IF EXISTS crm_customer_search",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0018_callrecord_is_deleted_call_date_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SEARCH_INDEX, DROP_SEARCH_INDEX),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:39
+
+import re
+
+from django.db import migrations, models
+
+
+def fill_phone_digits(apps, schema_editor):
+    """기존 고객의 전화번호 숫자 정규화 컬럼 채우기"""
+    Customer = apps.get_model('crm', 'Customer')
+    fields = ['phone_digits', 'phone_digits_reversed', 'landline_digits', 'landline_digits_reversed']
+    batch = []
+    for customer in Customer.objects.only('id', 'phone', 'landline').iterator(chunk_size=2000):
+        for field in ['phone', 'landline']:
+            digits = re.sub(r'\D', '', getattr(customer, field) or '')
+            setattr(customer, f'{field}_digits', digits)
+            setattr(customer, f'{field}_digits_reversed', digits[::-1])
+        batch.append(customer)
+        if len(batch) >= 2000:
+            Customer.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Customer.objects.bulk_update(batch, fields)
+
+
+# 고객 검색 색인에 숫자 컬럼 추가 (FTS5 는 컬럼 변경이 안 되므로 다시 만들고 전체 재색인)
+def _search_index_sql(columns):
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    return [
+        "DROP TRIGGER IF EXISTS crm_customer_search_ai",
+        "DROP TRIGGER IF EXISTS crm_customer_search_ad",
+        "DROP TRIGGER IF EXISTS crm_customer_search_au",
+        "DROP TABLE IF EXISTS crm_customer_search",
+        f"CREATE VIRTUAL TABLE crm_customer_search USING fts5("
+        f"{names}, content='crm_customer', content_rowid='id', tokenize='trigram')",
+        f"""CREATE TRIGGER crm_customer_search_ai AFTER INSERT ON crm_customer BEGIN
+            INSERT INTO crm_customer_search(rowid, {names}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER crm_customer_search_ad AFTER DELETE ON crm_customer BEGIN
+            INSERT INTO crm_customer_search(crm_customer_search, rowid, {names}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER crm_customer_search_au AFTER UPDATE OF {names} ON crm_customer BEGIN
+            INSERT INTO crm_customer_search(crm_customer_search, rowid, {names}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO crm_customer_search(rowid, {names}) VALUES (new.id, {new_values});
+        END""",
+        "INSERT INTO crm_customer_search(crm_customer_search) VALUES ('rebuild')",
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0019_customer_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='landline_digits',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='전화번호(숫자)'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='landline_digits_reversed',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='전화번호(숫자 역순)'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='phone_digits',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='휴대전화(숫자)'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='phone_digits_reversed',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='휴대전화(숫자 역순)'),
+        ),
+        migrations.RunPython(fill_phone_digits, migrations.RunPython.noop),
+        migrations.RunSQL(
+            _search_index_sql(('name', 'phone', 'vehicle_number', 'phone_digits', 'landline_digits')),
+            _search_index_sql(('name', 'phone', 'vehicle_number')),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+ACTIVE_ASSIGNMENT_STATUSES = ['pending', 'in_progress']
+
+
+def fill_customer_visibility(apps, schema_editor):
+    """기존 배정/통화 기록으로 상담원별 조회 가능 고객 채우기"""
+    CallAssignment = apps.get_model('crm', 'CallAssignment')
+    CallRecord = apps.get_model('crm', 'CallRecord')
+    CustomerVisibility = apps.get_model('crm', 'CustomerVisibility')
+
+    assigned = set(CallAssignment.objects.filter(
+        status__in=ACTIVE_ASSIGNMENT_STATUSES
+    ).values_list('assigned_to_id', 'customer_id').distinct())
+    called = set(CallRecord.objects.values_list('caller_id', 'customer_id').distinct())
+    CustomerVisibility.objects.bulk_create([
+        CustomerVisibility(agent_id=agent_id, customer_id=customer_id,
+                           is_assigned=(agent_id, customer_id) in assigned,
+                           has_called=(agent_id, customer_id) in called)
+        for agent_id, customer_id in assigned | called
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('crm', '0020_customer_phone_digits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerVisibility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_assigned', models.BooleanField(default=False, verbose_name='배정중')),
+                ('has_called', models.BooleanField(default=False, verbose_name='통화이력')),
+                ('agent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visible_customers', to=settings.AUTH_USER_MODEL, verbose_name='상담원')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibility', to='crm.customer', verbose_name='고객')),
+            ],
+            options={
+                'verbose_name': '상담원조회고객',
+                'verbose_name_plural': '상담원조회고객들',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='customervisibility',
+            constraint=models.UniqueConstraint(fields=('agent', 'customer'), name='unique_customer_visibility'),
+        ),
+        migrations.RunPython(fill_customer_visibility, migrations.RunPython.noop),
+    ]
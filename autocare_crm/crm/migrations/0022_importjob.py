@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('crm', '0021_customervisibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(blank=True, upload_to='imports/%Y/%m/')),
+                ('file_name', models.CharField(max_length=200)),
+                ('data_extract_date', models.DateField(blank=True, null=True, verbose_name='데이터 추출일')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '처리 중'), ('completed', '완료'), ('failed', '실패')], db_index=True, default='pending', max_length=20)),
+                ('total_rows', models.IntegerField(blank=True, null=True, verbose_name='전체 행 수(추정)')),
+                ('rows_parsed', models.IntegerField(default=0, verbose_name='처리한 행 수')),
+                ('new_records', models.IntegerField(default=0)),
+                ('updated_records', models.IntegerField(default=0)),
+                ('error_count', models.IntegerField(default=0)),
+                ('peak_memory_mb', models.FloatField(default=0, verbose_name='최대 메모리(MB)')),
+                ('message', models.TextField(blank=True)),
+                ('attempts', models.IntegerField(default=0, verbose_name='처리 시도 횟수')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('upload_history', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='crm.uploadhistory')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '업로드작업',
+                'verbose_name_plural': '업로드작업들',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
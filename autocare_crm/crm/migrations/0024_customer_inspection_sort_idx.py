@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:24
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0023_liveevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(django.db.models.functions.comparison.Coalesce('actual_inspection_date', django.db.models.expressions.RawSQL("'9999-12-31'", [], output_field=models.DateField())), django.db.models.functions.comparison.Coalesce('inspection_expiry_date', django.db.models.expressions.RawSQL("'9999-12-31'", [], output_field=models.DateField())), models.F('id'), name='customer_inspection_sort_idx'),
+        ),
+    ]
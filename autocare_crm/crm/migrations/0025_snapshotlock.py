@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0024_customer_inspection_sort_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnapshotLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=150, unique=True)),
+                ('token', models.CharField(max_length=32)),
+                ('locked_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': '스냅샷락',
+                'verbose_name_plural': '스냅샷락들',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0025_snapshotlock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='claim_token',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
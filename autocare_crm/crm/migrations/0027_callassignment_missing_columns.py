@@ -0,0 +1,34 @@
+# crm/migrations/0027_callassignment_missing_columns.py
+from django.db import migrations
+
+
+MISSING_FIELDS = ['due_date', 'priority']
+
+
+def add_missing_columns(apps, schema_editor):
+    """모델 상태에는 있지만 DB 에 없는 콜배정 컬럼 추가
+
+    0011/0012 의 중복 컬럼 문제로 0012 를 --fake 처리한 DB 는 due_date/priority 컬럼이 빠져 있을 수 있다.
+    """
+    CallAssignment = apps.get_model('crm', 'CallAssignment')
+    table = CallAssignment._meta.db_table
+    with schema_editor.connection.cursor() as cursor:
+        columns = {
+            column.name
+            for column in schema_editor.connection.introspection.get_table_description(cursor, table)
+        }
+    for field_name in MISSING_FIELDS:
+        field = CallAssignment._meta.get_field(field_name)
+        if field.column not in columns:
+            schema_editor.add_field(CallAssignment, field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0026_importjob_claim_token'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_missing_columns, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,57 @@
 # crm/models.py
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.models import User
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import re
+
+
+# 해피콜 시점별 경과 일수 (실제 검사일 기준)
+HAPPY_CALL_DAYS = {
+    '3month': 90,
+    '6month': 180,
+    '12month': 365,
+    '18month': 548,
+}
+
+# 숫자 정규화 컬럼을 두는 전화번호 필드
+PHONE_FIELDS = ('phone', 'landline')
+
+
+# 고객 목록 기본 정렬 (실제 검사일 → 검사만료일, NULL 은 맨 뒤)
+# NULLS LAST 정렬은 인덱스를 못 타므로 NULL 을 먼 미래 날짜로 바꾼 식으로 정렬하고 같은 식으로 복합 인덱스를 둔다
+NULL_DATE_LAST = date(9999, 12, 31)
+
+
+def _null_date_last():
+    # 쿼리 파라미터로 넘기면 인덱스 식과 같은 식으로 인식되지 않으므로 SQL 리터럴로 넣는다
+    return models.expressions.RawSQL(f"'{NULL_DATE_LAST.isoformat()}'", [], output_field=models.DateField())
+
+
+def inspection_sort_expressions():
+    """고객 목록 기본 정렬 키 이름 → NULL 없는 정렬 식 (인덱스 정의용)"""
+    return {
+        'inspection_sort_date': Coalesce('actual_inspection_date', _null_date_last()),
+        'expiry_sort_date': Coalesce('inspection_expiry_date', _null_date_last()),
+    }
+
+
+def inspection_sort_annotations():
+    """inspection_sort_expressions 를 NULL 없는 날짜 필드로 감싼 식 (annotate 용, SQL 은 같다)
+
+    Coalesce 는 첫 인자의 필드(null=True)를 결과 필드로 쓰므로 키셋 페이지네이션이 NULL 조건을 붙이지 않도록 감싼다.
+    """
+    return {
+        name: models.ExpressionWrapper(expression, output_field=models.DateField())
+        for name, expression in inspection_sort_expressions().items()
+    }
+
+
+def phone_digits(value):
+    """전화번호에서 숫자만 추출 (010-1234-5678 → 01012345678)"""
+    return re.sub(r'\D', '', value or '')
 
 
 class Customer(models.Model):
@@ -10,6 +59,12 @@ class Customer(models.Model):
     name = models.CharField(max_length=50, verbose_name='고객명')
     phone = models.CharField(max_length=20, db_index=True, verbose_name='휴대전화')
     landline = models.CharField(max_length=20, blank=True, verbose_name='전화번호')
+    
+    # 전화번호 검색용 (숫자만 / 숫자 역순, 저장 시 update_phone_digits에서 갱신)
+    phone_digits = models.CharField(max_length=20, blank=True, db_index=True, editable=False, verbose_name='휴대전화(숫자)')
+    phone_digits_reversed = models.CharField(max_length=20, blank=True, db_index=True, editable=False, verbose_name='휴대전화(숫자 역순)')
+    landline_digits = models.CharField(max_length=20, blank=True, db_index=True, editable=False, verbose_name='전화번호(숫자)')
+    landline_digits_reversed = models.CharField(max_length=20, blank=True, db_index=True, editable=False, verbose_name='전화번호(숫자 역순)')
     birth_date = models.DateField(null=True, blank=True, verbose_name='생년월일')
     address = models.TextField(blank=True, verbose_name='주소')
     postal_code = models.CharField(max_length=10, blank=True, verbose_name='우편번호')
@@ -129,6 +184,34 @@ class Customer(models.Model):
         verbose_name='데이터 추출일'
     )
     
+    # 해피콜 예정일 (실제 검사일 + 경과 일수, calculate_inspection_date에서 갱신)
+    happy_call_3month_date = models.DateField(null=True, blank=True, db_index=True, verbose_name='3개월콜 예정일')
+    happy_call_6month_date = models.DateField(null=True, blank=True, db_index=True, verbose_name='6개월콜 예정일')
+    happy_call_12month_date = models.DateField(null=True, blank=True, db_index=True, verbose_name='12개월콜 예정일')
+    happy_call_18month_date = models.DateField(null=True, blank=True, db_index=True, verbose_name='18개월콜 예정일')
+    
+    def update_phone_digits(self):
+        """전화번호 숫자 정규화 컬럼 갱신 (bulk_create 등 save()를 거치지 않는 경로는 직접 호출)"""
+        for field in PHONE_FIELDS:
+            digits = phone_digits(getattr(self, field))
+            setattr(self, f'{field}_digits', digits)
+            setattr(self, f'{field}_digits_reversed', digits[::-1])
+    
+    def save(self, *args, **kwargs):
+        self.update_phone_digits()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(PHONE_FIELDS):
+            kwargs['update_fields'] = set(update_fields) | {
+                f'{field}_digits{suffix}' for field in PHONE_FIELDS for suffix in ('', '_reversed')
+            }
+        super().save(*args, **kwargs)
+    
+    def update_happy_call_dates(self):
+        """실제 검사일 기준 해피콜 예정일 갱신"""
+        for key, days in HAPPY_CALL_DAYS.items():
+            due_date = self.actual_inspection_date + timedelta(days=days) if self.actual_inspection_date else None
+            setattr(self, f'happy_call_{key}_date', due_date)
+    
     def calculate_inspection_date(self, extract_date):
         """데이터 추출일 기준으로 실제 검사일 계산"""
         if self.inspection_expiry_date:
@@ -141,6 +224,7 @@ class Customer(models.Model):
                 # 마지막 검사일 = 만료일 - 2년
                 self.actual_inspection_date = self.inspection_expiry_date - timedelta(days=730)
             self.data_extracted_date = extract_date
+            self.update_happy_call_dates()
             return self.actual_inspection_date
         return None
 
@@ -153,6 +237,11 @@ class Customer(models.Model):
             models.Index(fields=['inspection_expiry_date']),
             models.Index(fields=['priority']),
             models.Index(fields=['customer_grade']),
+            # 고객 목록 기본 정렬 + 키셋 페이지네이션 (inspection_sort_expressions 와 같은 식)
+            models.Index(
+                *inspection_sort_expressions().values(), models.F('id'),
+                name='customer_inspection_sort_idx',
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -300,6 +389,34 @@ class Customer(models.Model):
             return '안전'
 
 
+def local_day_range(date_from, date_to):
+    """현지 날짜 기간의 시작/끝 시각 [start, end)
+
+    call_date__date 조건은 행마다 시간대 변환 함수를 실행해 인덱스를 쓰지 못하므로,
+    날짜 조건은 시각 범위로 바꿔 call_date 인덱스 범위 탐색이 되게 한다.
+    """
+    start = timezone.make_aware(datetime.combine(date_from, datetime.min.time()))
+    end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+    return start, end
+
+
+class CallRecordQuerySet(models.QuerySet):
+    """통화 기록 날짜 조건 (현지 날짜 → 통화일시 범위)"""
+
+    def on_local_day(self, day):
+        """현지 날짜 하루의 통화"""
+        return self.between_local_days(day, day)
+
+    def between_local_days(self, date_from=None, date_to=None):
+        """현지 날짜 기간(양 끝 포함)의 통화, 한쪽을 비우면 그쪽은 제한 없음"""
+        queryset = self
+        if date_from is not None:
+            queryset = queryset.filter(call_date__gte=local_day_range(date_from, date_from)[0])
+        if date_to is not None:
+            queryset = queryset.filter(call_date__lt=local_day_range(date_to, date_to)[1])
+        return queryset
+
+
 class CallRecord(models.Model):
     # 기본 정보
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='call_records')
@@ -374,6 +491,12 @@ class CallRecord(models.Model):
         verbose_name = '통화기록'
         verbose_name_plural = '통화기록들'
         ordering = ['-call_date']
+        indexes = [
+            models.Index(fields=['caller', 'call_date']),  # 상담원별 기간 조회 / 일별 집계 갱신용
+            models.Index(fields=['is_deleted', 'call_date']),  # 전체 기간 조회용
+        ]
+    
+    objects = CallRecordQuerySet.as_manager()
         
     def __str__(self):
         return f"{self.customer.name} - {self.call_date.strftime('%Y-%m-%d %H:%M')}"
@@ -411,6 +534,65 @@ class UploadHistory(models.Model):
         return f"{self.file_name} - {self.upload_date.strftime('%Y-%m-%d')}"
 
 
+class ImportJob(models.Model):
+    """고객 업로드 백그라운드 작업 (run_import_jobs 명령이 처리)"""
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '처리 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='import_jobs')
+    file = models.FileField(upload_to='imports/%Y/%m/', blank=True)
+    file_name = models.CharField(max_length=200)
+    data_extract_date = models.DateField(null=True, blank=True, verbose_name='데이터 추출일')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+
+    # 진행 상황 (청크 저장과 같은 트랜잭션에서 갱신되므로 rows_parsed 가 재시작 위치)
+    total_rows = models.IntegerField(null=True, blank=True, verbose_name='전체 행 수(추정)')
+    rows_parsed = models.IntegerField(default=0, verbose_name='처리한 행 수')
+    new_records = models.IntegerField(default=0)
+    updated_records = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    peak_memory_mb = models.FloatField(default=0, verbose_name='최대 메모리(MB)')
+    message = models.TextField(blank=True)
+    attempts = models.IntegerField(default=0, verbose_name='처리 시도 횟수')
+    # 작업을 차지한 워커 표시 (가져갈 때마다 새로 발급, 진행 상황은 이 값이 그대로일 때만 저장)
+    claim_token = models.CharField(max_length=32, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    upload_history = models.ForeignKey(UploadHistory, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        verbose_name = '업로드작업'
+        verbose_name_plural = '업로드작업들'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+
+    @property
+    def rows_written(self):
+        return self.new_records + self.updated_records
+
+    @property
+    def is_active(self):
+        return self.status in ('pending', 'running')
+
+    @property
+    def progress_percent(self):
+        """진행률 (전체 행 수를 모르면 None)"""
+        if self.status == 'completed':
+            return 100
+        if not self.total_rows:
+            return None
+        return min(99, int(self.rows_parsed * 100 / self.total_rows))
+
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     ROLE_CHOICES = [
@@ -517,4 +699,130 @@ class CallAssignment(models.Model):
         verbose_name = '콜배정'
         verbose_name_plural = '콜배정들'
         ordering = ['-assigned_at']
-    
\ No newline at end of file
+    
+
+class DailyContact(models.Model):
+    """일자별 통화 고객 (현지 날짜 기준, 고객당 하루 1건)"""
+    contact_date = models.DateField(verbose_name='통화일')
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='daily_contacts')
+    
+    class Meta:
+        verbose_name = '일별통화고객'
+        verbose_name_plural = '일별통화고객들'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['contact_date', 'customer'],
+                name='unique_daily_contact'
+            )
+        ]
+        
+    def __str__(self):
+        return f"{self.contact_date} - {self.customer_id}"
+
+
+class CustomerVisibility(models.Model):
+    """상담원별 조회 가능 고객 (배정 중이거나 통화한 적이 있는 고객, 상담원·고객당 1건)
+
+    배정 생성/취소와 통화 기록 저장/삭제 시 해당 (상담원, 고객) 행만 갱신된다 (crm.visibility).
+    상담원 고객 목록은 통화 기록 전체를 조인하지 않고 이 테이블과 한 번만 조인한다.
+    """
+    agent = models.ForeignKey(User, on_delete=models.CASCADE, related_name='visible_customers', verbose_name='상담원')
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='visibility', verbose_name='고객')
+    is_assigned = models.BooleanField(default=False, verbose_name='배정중')
+    has_called = models.BooleanField(default=False, verbose_name='통화이력')
+    
+    class Meta:
+        verbose_name = '상담원조회고객'
+        verbose_name_plural = '상담원조회고객들'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['agent', 'customer'],
+                name='unique_customer_visibility'
+            )
+        ]
+        
+    def __str__(self):
+        return f"{self.agent_id} - {self.customer_id}"
+
+
+class AgentDailyStats(models.Model):
+    """상담원 일별 통화 집계 (현지 날짜 기준, 상담원당 하루 1건)
+
+    통화 기록 저장/삭제 시 해당 (상담원, 날짜) 행만 다시 계산된다 (crm.rollups).
+    성과 화면은 원본 통화 기록 대신 이 테이블을 합산한다.
+    """
+    caller = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_stats', verbose_name='상담원')
+    stat_date = models.DateField(verbose_name='통화일')
+    
+    total_calls = models.IntegerField(default=0, verbose_name='전체통화')
+    
+    # 통화 상태별
+    connected_calls = models.IntegerField(default=0, verbose_name='통화성공')
+    no_answer_calls = models.IntegerField(default=0, verbose_name='부재중')
+    busy_calls = models.IntegerField(default=0, verbose_name='통화중')
+    wrong_number_calls = models.IntegerField(default=0, verbose_name='잘못된번호')
+    callback_requested_calls = models.IntegerField(default=0, verbose_name='재통화요청')
+    
+    # 관심분야별
+    interest_insurance_calls = models.IntegerField(default=0, verbose_name='보험관심')
+    interest_maintenance_calls = models.IntegerField(default=0, verbose_name='소모품교체관심')
+    interest_financing_calls = models.IntegerField(default=0, verbose_name='자동차금융관심')
+    interest_multiple_calls = models.IntegerField(default=0, verbose_name='복수관심')
+    interest_none_calls = models.IntegerField(default=0, verbose_name='관심없음')
+    
+    # 후속조치
+    followup_required = models.IntegerField(default=0, verbose_name='후속조치필요')
+    followup_completed = models.IntegerField(default=0, verbose_name='후속조치완료')
+    
+    # 해피콜 대상 고객 통화 (통화일 ± 7일 기준)
+    happy_call_3month_calls = models.IntegerField(default=0, verbose_name='3개월콜')
+    happy_call_6month_calls = models.IntegerField(default=0, verbose_name='6개월콜')
+    happy_call_12month_calls = models.IntegerField(default=0, verbose_name='12개월콜')
+    happy_call_18month_calls = models.IntegerField(default=0, verbose_name='18개월콜')
+    
+    last_call_at = models.DateTimeField(null=True, blank=True, verbose_name='마지막통화일시')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
+    
+    class Meta:
+        verbose_name = '상담원일별집계'
+        verbose_name_plural = '상담원일별집계들'
+        indexes = [
+            models.Index(fields=['stat_date', 'caller']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['caller', 'stat_date'],
+                name='unique_agent_daily_stats'
+            )
+        ]
+        
+    def __str__(self):
+        return f"{self.stat_date} - {self.caller_id}"
+
+
+class LiveEvent(models.Model):
+    """실시간 통계 이벤트 (이벤트 번호 = 자동 증가 id, 여러 워커가 동시에 발행해도 겹치지 않음)"""
+    event_type = models.CharField(max_length=30)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = '실시간이벤트'
+        verbose_name_plural = '실시간이벤트들'
+
+    def __str__(self):
+        return f"#{self.pk} {self.event_type}"
+
+
+class SnapshotLock(models.Model):
+    """보드 스냅샷 계산 락 (키 고유 제약으로 여러 워커 중 하나만 INSERT 에 성공해 계산)"""
+    key = models.CharField(max_length=150, unique=True)
+    token = models.CharField(max_length=32)
+    locked_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = '스냅샷락'
+        verbose_name_plural = '스냅샷락들'
+
+    def __str__(self):
+        return self.key
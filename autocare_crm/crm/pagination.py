@@ -0,0 +1,279 @@
+# crm/pagination.py
+"""목록 화면 키셋(커서) 페이지네이션
+
+OFFSET 대신 "이전 페이지 마지막 행의 정렬 값 이후" 조건으로 다음 페이지를 읽으므로
+몇 번째 페이지든 첫 페이지와 비용이 같다. 정렬 값이 같은 행은 id로 구분한다.
+커서는 서명된 문자열이라 사용자가 임의로 만들 수 없고, 잘못된 커서는 첫 페이지로 처리한다.
+
+전체 건수는 LIST_COUNT_MODE 설정에 따라 정확한 COUNT, 캐시된 COUNT,
+상한까지만 센 근사값 중 하나로 표시한다.
+캐시된 COUNT/집계는 통화 기록·배정·고객이 바뀔 때마다(invalidate_list_counts) 버전이 바뀌어 버려진다.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Q
+
+
+PER_PAGE = 50
+CURSOR_PARAM = 'cursor'
+CURSOR_SALT = 'crm.pagination'
+COUNT_CACHE = 'shared'
+COUNT_CACHE_KEY = 'list_count:{version}:{digest}'
+COUNT_VERSION_KEY = 'list_count:version'
+
+
+def invalidate_list_counts():
+    """캐시된 목록 건수/집계 무효화 (트랜잭션 커밋 후)
+
+    키마다 지우지 않고 버전 값을 새로 정해 이전 결과를 모두 버린다.
+    증가가 아니라 새 값을 쓰므로 여러 워커가 동시에 호출해도 안전하다.
+    """
+    transaction.on_commit(lambda: caches[COUNT_CACHE].set(COUNT_VERSION_KEY, uuid.uuid4().hex, None))
+
+
+def _cache_key(queryset, extra=''):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f'{sql}|{params!r}|{extra}'.encode()).hexdigest()
+    version = caches[COUNT_CACHE].get(COUNT_VERSION_KEY, '0')
+    return COUNT_CACHE_KEY.format(version=version, digest=digest)
+
+
+def cached_aggregate(queryset, **aggregates):
+    """조건별 집계 결과를 공유 캐시에 보관 (LIST_COUNT_MODE 가 cached 일 때)"""
+    if getattr(settings, 'LIST_COUNT_MODE', 'cached') != 'cached':
+        return queryset.aggregate(**aggregates)
+    cache = caches[COUNT_CACHE]
+    key = _cache_key(queryset.order_by(), extra=repr(sorted(aggregates.items())))
+    result = cache.get(key)
+    if result is None:
+        result = queryset.aggregate(**aggregates)
+        cache.set(key, result, getattr(settings, 'LIST_COUNT_CACHE_TIMEOUT', 300))
+    return result
+
+
+def list_count(queryset):
+    """전체 건수 (건수, 근사값 여부)"""
+    mode = getattr(settings, 'LIST_COUNT_MODE', 'cached')
+    queryset = queryset.order_by()
+    if mode == 'capped':
+        cap = getattr(settings, 'LIST_COUNT_CAP', 10000)
+        count = queryset[:cap + 1].count()
+        return min(count, cap), count > cap
+    if mode == 'cached':
+        cache = caches[COUNT_CACHE]
+        key = _cache_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, getattr(settings, 'LIST_COUNT_CACHE_TIMEOUT', 300))
+        return count, False
+    return queryset.count(), False
+
+
+class SortKey:
+    """정렬 키 하나 (필드, 내림차순 여부, NULL 위치)
+
+    output_field: 커서 값 변환용 모델 필드 (annotate 한 식이면 그 output_field)
+    """
+
+    def __init__(self, field, descending, output_field, nulls_last):
+        self.field = field
+        self.descending = descending
+        self.output_field = output_field
+        self.nullable = output_field.null
+        self.nulls_last = nulls_last
+
+    def reversed(self):
+        return SortKey(self.field, not self.descending, self.output_field, not self.nulls_last)
+
+    def order_expression(self):
+        expression = F(self.field)
+        nulls = {}
+        if self.nullable:
+            nulls = {'nulls_last': True} if self.nulls_last else {'nulls_first': True}
+        return expression.desc(**nulls) if self.descending else expression.asc(**nulls)
+
+    def equal_q(self, value):
+        if value is None:
+            return Q(**{f'{self.field}__isnull': True})
+        return Q(**{self.field: value})
+
+    def after_q(self, value):
+        """정렬 순서상 value 뒤에 오는 행"""
+        if value is None:
+            # NULL이 끝이면 뒤에 오는 값이 없고, 처음이면 NULL이 아닌 값 전부가 뒤에 온다
+            return Q(pk__in=[]) if self.nulls_last else Q(**{f'{self.field}__isnull': False})
+        condition = Q(**{f'{self.field}__{"lt" if self.descending else "gt"}': value})
+        if self.nullable and self.nulls_last:
+            condition |= Q(**{f'{self.field}__isnull': True})
+        return condition
+
+
+def _output_field(queryset, name):
+    annotation = queryset.query.annotations.get(name)
+    if annotation is not None:
+        return annotation.output_field
+    return queryset.model._meta.get_field(name)
+
+
+def sort_keys(queryset, ordering, nulls_last=True):
+    """order_by 형식 정렬 목록 → SortKey 목록 (마지막에 id 추가)
+
+    모델 필드 외에 annotate 한 이름도 쓸 수 있다 (NULL 없는 정렬 식 등).
+    """
+    keys = []
+    for name in ordering:
+        field = name.lstrip('-')
+        keys.append(SortKey(field, name.startswith('-'), _output_field(queryset, field), nulls_last))
+    if not any(key.field in ('id', 'pk') for key in keys):
+        keys.append(SortKey('id', False, _output_field(queryset, 'id'), nulls_last))
+    return keys
+
+
+def seek_q(keys, values):
+    """커서 위치 이후 조건: (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+
+    첫 키가 NULL 이 없으면 k1 >= v1 조건을 함께 걸어 OR 조건에서도 인덱스 범위 탐색이 되게 한다.
+    """
+    condition = Q(pk__in=[])
+    for i, key in enumerate(keys):
+        step = key.after_q(values[i])
+        for previous, value in zip(keys[:i], values[:i]):
+            step &= previous.equal_q(value)
+        condition |= step
+    first = keys[0]
+    if not first.nullable:
+        condition &= Q(**{f'{first.field}__{"lte" if first.descending else "gte"}': values[0]})
+    return condition
+
+
+def _cursor_value(value):
+    # 날짜/시각은 마이크로초까지 그대로 보존 (DjangoJSONEncoder는 밀리초로 자름)
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def encode_cursor(keys, obj, backwards=False):
+    values = [_cursor_value(getattr(obj, key.field)) for key in keys]
+    payload = json.dumps({'v': values, 'b': backwards})
+    return signing.dumps(payload, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(keys, cursor):
+    """커서 → (정렬 값 목록, 이전 방향 여부), 잘못된 커서는 None"""
+    try:
+        payload = json.loads(signing.loads(cursor, salt=CURSOR_SALT))
+        values = [
+            key.output_field.to_python(value)
+            for key, value in zip(keys, payload['v'], strict=True)
+        ]
+        return values, bool(payload['b'])
+    except (signing.BadSignature, ValidationError, ValueError, KeyError, TypeError):
+        return None
+
+
+class KeysetPage:
+    """키셋 페이지 (템플릿에서 목록처럼 순회)"""
+
+    def __init__(self, items, request, next_cursor=None, previous_cursor=None, total=None, total_is_estimate=False):
+        self.items = items
+        self.request = request
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _query(self, cursor):
+        params = self.request.GET.copy()
+        params.pop(CURSOR_PARAM, None)
+        params.pop('page', None)
+        if cursor:
+            params[CURSOR_PARAM] = cursor
+        return params.urlencode()
+
+    @property
+    def first_query(self):
+        return self._query(None)
+
+    @property
+    def next_query(self):
+        return self._query(self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self._query(self.previous_cursor)
+
+    @property
+    def total_display(self):
+        if self.total is None:
+            return '-'
+        return f'{self.total:,}+' if self.total_is_estimate else f'{self.total:,}'
+
+
+def keyset_paginate(request, queryset, ordering, per_page=PER_PAGE, nulls_last=True, with_total=True):
+    """정렬 목록(ordering) 기준 키셋 페이지
+
+    nulls_last: NULL 값 위치 (True 면 정렬 방향과 관계없이 맨 뒤)
+    """
+    keys = sort_keys(queryset, ordering, nulls_last=nulls_last)
+    total, total_is_estimate = list_count(queryset) if with_total else (None, False)
+
+    decoded = decode_cursor(keys, request.GET.get(CURSOR_PARAM, ''))
+    values, backwards = decoded if decoded else (None, False)
+    page_keys = [key.reversed() for key in keys] if backwards else keys
+
+    page_query = queryset.order_by(*[key.order_expression() for key in page_keys])
+    if values is not None:
+        page_query = page_query.filter(seek_q(page_keys, values))
+    rows = list(page_query[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if backwards:
+        if not has_more:
+            # 첫 페이지까지 돌아온 경우 첫 페이지를 그대로 보여준다
+            rows = list(queryset.order_by(*[key.order_expression() for key in keys])[:per_page + 1])
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            has_previous = False
+        else:
+            rows.reverse()
+            has_next = has_previous = True
+    else:
+        has_next = has_more
+        has_previous = values is not None
+
+    return KeysetPage(
+        rows,
+        request,
+        next_cursor=encode_cursor(keys, rows[-1]) if has_next and rows else None,
+        previous_cursor=encode_cursor(keys, rows[0], backwards=True) if has_previous and rows else None,
+        total=total,
+        total_is_estimate=total_is_estimate,
+    )
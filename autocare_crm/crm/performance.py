@@ -0,0 +1,347 @@
+# crm/performance.py
+"""상담원/팀 성과 집계
+
+팀별 성과는 팀 수와 관계없이 caller__userprofile__team 으로 묶은 쿼리 1회로 계산한다.
+상담원별 성과와 일/주/월별 추이는 원본 통화 기록 대신 상담원 일별 집계
+(AgentDailyStats)를 합산하므로 비용이 통화 수가 아닌 상담원 수 × 일수에 비례한다.
+시간대별 통화 분포는 기간 전체를 한 번에 시간(30분) 단위로 묶어 계산한다.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Case, Count, DateField, F, FilteredRelation, IntegerField, Max, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, ExtractHour, TruncMonth, TruncWeek
+
+from .models import AgentDailyStats, CallRecord, CallAssignment, local_day_range
+from .cohorts import HAPPY_CALL_KEYS
+from .presence import get_presence
+from .stats import INTERESTED_TYPES
+
+
+def _by_key(rows, key):
+    return {row.pop(key): row for row in rows}
+
+
+def _sum(expression, condition=None):
+    return Coalesce(Sum(expression, filter=condition), 0)
+
+
+def interested_calls_expression():
+    """관심 고객 통화 수 (AgentDailyStats 관심분야별 합)"""
+    fields = [F(f'interest_{interest}_calls') for interest in INTERESTED_TYPES]
+    expression = fields[0]
+    for field in fields[1:]:
+        expression = expression + field
+    return expression
+
+
+def agent_call_metrics(agent_ids, date_from, date_to, today):
+    """상담원별 통화 집계 (상담원 일별 집계 쿼리 1회)
+
+    기간(date_from ~ date_to) 통계와 기간 중 오늘 통계를 함께 계산한다.
+    """
+    is_today = Q(stat_date=today)
+
+    aggregates = {
+        'total_calls': _sum('total_calls'),
+        'connected_calls': _sum('connected_calls'),
+        'interested_calls': _sum(interested_calls_expression()),
+        'followup_required': _sum('followup_required'),
+        'followup_completed': _sum('followup_completed'),
+        'today_total': _sum('total_calls', is_today),
+        'today_connected': _sum('connected_calls', is_today),
+        'last_activity': Max('last_call_at', filter=is_today),
+    }
+    for key in HAPPY_CALL_KEYS:
+        aggregates[f'happy_call_{key}'] = _sum(f'happy_call_{key}_calls', is_today)
+
+    # 집계 테이블 필드와 이름이 같은 별칭은 이후 Sum('total_calls') 등이 별칭을 가리키게 되므로 접두어를 붙인다
+    rows = AgentDailyStats.objects.filter(
+        caller_id__in=agent_ids,
+        stat_date__gte=date_from,
+        stat_date__lte=date_to,
+    ).values('caller_id').annotate(
+        **{f'agg_{name}': aggregate for name, aggregate in aggregates.items()}
+    ).order_by()
+    return {
+        row['caller_id']: {name: row[f'agg_{name}'] for name in aggregates}
+        for row in rows
+    }
+
+
+def agent_assignment_metrics(agent_ids, today):
+    """상담원별 오늘 배정/완료 건수 (쿼리 1회)"""
+    assigned_today = Q(assigned_at__date=today, status__in=['pending', 'in_progress'])
+    completed_today = Q(status='completed', completed_at__date=today)
+
+    rows = CallAssignment.objects.filter(
+        assigned_today | completed_today,
+        assigned_to_id__in=agent_ids
+    ).values('assigned_to_id').annotate(
+        assigned_today=Count('id', filter=assigned_today),
+        completed_today=Count('id', filter=completed_today),
+    ).order_by()
+    return _by_key(rows, 'assigned_to_id')
+
+
+def empty_agent_metrics():
+    """통화/배정 기록이 없는 상담원의 기본값"""
+    metrics = {
+        'total_calls': 0,
+        'connected_calls': 0,
+        'interested_calls': 0,
+        'followup_required': 0,
+        'followup_completed': 0,
+        'today_total': 0,
+        'today_connected': 0,
+        'last_activity': None,
+        'assigned_today': 0,
+        'completed_today': 0,
+    }
+    for key in HAPPY_CALL_KEYS:
+        metrics[f'happy_call_{key}'] = 0
+    return metrics
+
+
+def agent_metrics(agent_ids, date_from, date_to, today):
+    """상담원별 성과 지표 {agent_id: {...}} (쿼리 2회)"""
+    calls = agent_call_metrics(agent_ids, date_from, date_to, today)
+    assignments = agent_assignment_metrics(agent_ids, today)
+
+    metrics = {}
+    for agent_id in agent_ids:
+        row = empty_agent_metrics()
+        row.update(calls.get(agent_id, {}))
+        row.update(assignments.get(agent_id, {}))
+        metrics[agent_id] = row
+    return metrics
+
+
+def team_call_metrics(teams, date_from, date_to):
+    """팀별 통화 집계 {team: {...}} (팀으로 묶은 쿼리 1회)
+
+    활성 구성원(팀장 포함)의 통화만 센다. 관심 고객은 고객 기준 중복 제거.
+    """
+    requires_follow_up = Q(requires_follow_up=True)
+
+    rows = CallRecord.objects.between_local_days(date_from, date_to).filter(
+        caller__userprofile__team__in=teams,
+        caller__is_active=True,
+        is_deleted=False
+    ).values(team=F('caller__userprofile__team')).annotate(
+        total_calls=Count('id'),
+        connected_calls=Count('id', filter=Q(call_result='connected')),
+        interested_customers=Count('customer', filter=Q(interest_type__in=INTERESTED_TYPES), distinct=True),
+        followup_required=Count('id', filter=requires_follow_up),
+        followup_completed=Count('id', filter=requires_follow_up & Q(follow_up_completed=True)),
+    ).order_by()
+    return _by_key(rows, 'team')
+
+
+def team_members(teams):
+    """팀별 활성 구성원 요약 {team: {'manager', 'agent_count', 'daily_target'}} (쿼리 1회)
+
+    manager: 팀장/관리자 중 가장 먼저 등록된 사용자
+    """
+    members = {}
+    users = User.objects.filter(
+        userprofile__team__in=teams,
+        is_active=True
+    ).select_related('userprofile').order_by('id')
+
+    for user in users:
+        profile = user.userprofile
+        team = members.setdefault(profile.team, {'manager': None, 'agent_count': 0, 'daily_target': 0})
+        team['agent_count'] += 1
+        team['daily_target'] += profile.daily_call_target
+        if team['manager'] is None and profile.role in ('manager', 'admin'):
+            team['manager'] = user
+    return members
+
+
+def team_metrics(teams, date_from, date_to):
+    """팀별 구성원/통화 지표 {team: {...}} (쿼리 2회)"""
+    teams = list(teams)
+    calls = team_call_metrics(teams, date_from, date_to)
+    members = team_members(teams)
+
+    metrics = {}
+    for team in teams:
+        row = {
+            'manager': None,
+            'agent_count': 0,
+            'daily_target': 0,
+            'total_calls': 0,
+            'connected_calls': 0,
+            'interested_customers': 0,
+            'followup_required': 0,
+            'followup_completed': 0,
+        }
+        row.update(members.get(team, {}))
+        row.update(calls.get(team, {}))
+        metrics[team] = row
+    return metrics
+
+
+def member_activity(members, day):
+    """구성원별 하루 통화 현황 (쿼리 1회 + 접속 상태 캐시 조회 1회)
+
+    members: User 쿼리셋
+    반환: [{'id', 'name', 'total_calls', 'connected', 'last_call', 'status'}, ...]
+    날짜 조건을 JOIN 조건에 넣어 (상담원, 통화일시) 인덱스로 그날 통화만 읽는다.
+    status 는 접속 상태 (online / idle / offline)
+    """
+    start, end = local_day_range(day, day)
+
+    rows = members.annotate(
+        day_calls=FilteredRelation('callrecord', condition=Q(
+            callrecord__call_date__gte=start,
+            callrecord__call_date__lt=end,
+            callrecord__is_deleted=False,
+        ))
+    ).values('id', 'username').annotate(
+        total_calls=Count('day_calls'),
+        connected=Count('day_calls', filter=Q(day_calls__call_result='connected')),
+        last_call=Max('day_calls__call_date'),
+    ).order_by('id')
+    rows = list(rows)
+    presence = get_presence([row['id'] for row in rows])
+
+    activity = []
+    for row in rows:
+        last_call = row['last_call']
+        activity.append({
+            'id': row['id'],
+            'name': row['username'],
+            'total_calls': row['total_calls'],
+            'connected': row['connected'],
+            'last_call': last_call.isoformat() if last_call else None,
+            'status': presence[row['id']]['status'],
+        })
+    return activity
+
+
+# 업무 시간 (시작 시 이상 ~ 종료 시 미만)
+DEFAULT_BUSINESS_HOURS = (9, 19)
+DISTRIBUTION_INTERVALS = (30, 60)
+
+
+def business_hours():
+    """설정된 업무 시간 (시작 시, 종료 시)"""
+    return getattr(settings, 'BUSINESS_HOURS', DEFAULT_BUSINESS_HOURS)
+
+
+def call_distribution(date_from, date_to, caller_ids=None, interval=60, start_hour=None, end_hour=None):
+    """시간대별 통화 분포 (쿼리 1회)
+
+    interval: 60(1시간) 또는 30(30분) 단위
+    start_hour/end_hour: 업무 시간 (기본값은 BUSINESS_HOURS 설정)
+    반환: {'buckets': [{'hour', 'hour_display', 'count', 'percentage'}, ...],
+           'total': 전체 통화 수, 'outside_hours': 업무 시간 외 통화 수}
+    """
+    if interval not in DISTRIBUTION_INTERVALS:
+        raise ValueError(f'지원하지 않는 간격: {interval}')
+    default_start, default_end = business_hours()
+    start_hour = default_start if start_hour is None else start_hour
+    end_hour = default_end if end_hour is None else end_hour
+
+    calls = CallRecord.objects.between_local_days(date_from, date_to).filter(is_deleted=False)
+    if caller_ids is not None:
+        calls = calls.filter(caller_id__in=caller_ids)
+
+    group = {'hour': ExtractHour('call_date')}
+    if interval == 30:
+        group['half'] = Case(
+            When(call_date__minute__gte=30, then=Value(30)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    counts = {
+        (row['hour'], row.get('half', 0)): row['count']
+        for row in calls.values(**group).annotate(count=Count('id')).order_by()
+    }
+
+    buckets = []
+    for hour in range(start_hour, end_hour):
+        for minute in range(0, 60, interval):
+            buckets.append({
+                'hour': f"{hour:02d}:{minute:02d}",
+                'hour_display': f"{hour:02d}시" if minute == 0 else f"{hour:02d}시 {minute}분",
+                'count': counts.get((hour, minute), 0),
+            })
+
+    max_count = max((bucket['count'] for bucket in buckets), default=0)
+    for bucket in buckets:
+        bucket['percentage'] = round((bucket['count'] / max_count) * 100, 1) if max_count > 0 else 0
+
+    total = sum(counts.values())
+    return {
+        'buckets': buckets,
+        'total': total,
+        'outside_hours': total - sum(bucket['count'] for bucket in buckets),
+    }
+
+
+# 추이 집계 단위 (일 단위는 집계 테이블의 날짜 그대로 사용)
+SERIES_PERIODS = {
+    'day': None,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def period_start(day, period):
+    """날짜가 속한 집계 구간의 시작일 (주: 월요일, 월: 1일)"""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def period_starts(date_from, date_to, period):
+    """기간 내 집계 구간 시작일 목록"""
+    starts = []
+    current = period_start(date_from, period)
+    while current <= date_to:
+        starts.append(current)
+        if period == 'month':
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current += timedelta(days=7 if period == 'week' else 1)
+    return starts
+
+
+def call_time_series(date_from, date_to, caller_ids=None, period='day'):
+    """일/주/월별 통화 추이 (상담원 일별 집계 쿼리 1회)
+
+    반환: [{'date': 구간 시작일, 'total', 'connected', 'interested'}, ...]
+    통화가 없는 구간도 0으로 채운다. 주/월 첫 구간은 date_from 이후 통화만 센다.
+    """
+    if period not in SERIES_PERIODS:
+        raise ValueError(f'지원하지 않는 집계 단위: {period}')
+
+    stats = AgentDailyStats.objects.filter(stat_date__gte=date_from, stat_date__lte=date_to)
+    if caller_ids is not None:
+        stats = stats.filter(caller_id__in=caller_ids)
+
+    trunc = SERIES_PERIODS[period]
+    bucket = trunc('stat_date', output_field=DateField()) if trunc else F('stat_date')
+    rows = stats.annotate(bucket=bucket).values('bucket').annotate(
+        total=_sum('total_calls'),
+        connected=_sum('connected_calls'),
+        interested=_sum(interested_calls_expression()),
+    ).order_by()
+    counts = _by_key(rows, 'bucket')
+
+    series = []
+    for bucket in period_starts(date_from, date_to, period):
+        row = counts.get(bucket, {})
+        series.append({
+            'date': bucket,
+            'total': row.get('total', 0),
+            'connected': row.get('connected', 0),
+            'interested': row.get('interested', 0),
+        })
+    return series
@@ -0,0 +1,51 @@
+# crm/presence.py
+"""상담원 접속 상태 (presence)
+
+상담원 화면의 주기적 하트비트와 통화 기록 저장 시점을 워커 간 공유 캐시에
+사용자별 마지막 활동 시각으로 기록한다. 보드는 통화 기록을 조회하지 않고
+팀 전체 상태를 캐시 한 번(get_many)으로 읽는다.
+
+상태
+- online: ONLINE_WINDOW 이내 활동
+- idle: PRESENCE_TTL 이내 활동
+- offline: 기록 없음 (만료)
+"""
+from django.core.cache import caches
+from django.utils import timezone
+
+
+PRESENCE_CACHE = 'shared'
+PRESENCE_KEY = 'presence:{user_id}'
+HEARTBEAT_INTERVAL = 60       # 화면 하트비트 주기 (초)
+ONLINE_WINDOW = 5 * 60        # 이 시간 이내 활동이면 online (초)
+PRESENCE_TTL = 60 * 60        # 기록 보관 시간, 이후 offline (초)
+
+
+def touch(user_id, when=None):
+    """마지막 활동 시각 기록"""
+    caches[PRESENCE_CACHE].set(PRESENCE_KEY.format(user_id=user_id), when or timezone.now(), PRESENCE_TTL)
+
+
+def presence_status(last_seen, now=None):
+    """마지막 활동 시각 → online / idle / offline"""
+    if last_seen is None:
+        return 'offline'
+    elapsed = ((now or timezone.now()) - last_seen).total_seconds()
+    if elapsed < ONLINE_WINDOW:
+        return 'online'
+    if elapsed < PRESENCE_TTL:
+        return 'idle'
+    return 'offline'
+
+
+def get_presence(user_ids, now=None):
+    """사용자별 접속 상태 {user_id: {'status', 'last_seen'}} (캐시 조회 1회)"""
+    now = now or timezone.now()
+    keys = {PRESENCE_KEY.format(user_id=user_id): user_id for user_id in user_ids}
+    seen = caches[PRESENCE_CACHE].get_many(list(keys))
+
+    presence = {}
+    for key, user_id in keys.items():
+        last_seen = seen.get(key)
+        presence[user_id] = {'status': presence_status(last_seen, now), 'last_seen': last_seen}
+    return presence
@@ -0,0 +1,138 @@
+# crm/rollups.py
+"""상담원 일별 집계 (AgentDailyStats) 관리
+
+통화 기록이 저장/삭제되면 해당 (상담원, 현지 날짜) 한 행만 원본에서 다시 계산한다.
+(상담원, 통화일시) 인덱스로 그날 그 상담원의 통화만 읽으므로 갱신 비용은 작다.
+재계산은 저장 요청 안에서 바로 하지 않고 트랜잭션 커밋 후 (상담원, 날짜)마다 한 번만 한다
+(통화 저장 + 후속조치 완료처럼 한 트랜잭션에서 같은 행이 여러 번 바뀌어도 1회).
+전체 재계산은 rebuild_agent_daily_stats 명령으로 한다.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from .models import AgentDailyStats, CallRecord, HAPPY_CALL_DAYS
+from .cohorts import BOARD_WINDOW, happy_call_q
+
+
+RESULT_FIELDS = {result: f'{result}_calls' for result, _ in CallRecord.RESULT_CHOICES}
+INTEREST_FIELDS = {interest: f'interest_{interest}_calls' for interest, _ in CallRecord.INTEREST_CHOICES}
+HAPPY_CALL_FIELDS = {key: f'happy_call_{key}_calls' for key in HAPPY_CALL_DAYS}
+
+
+def stats_aggregates(stat_date):
+    """AgentDailyStats 필드별 집계식"""
+    aggregates = {'total_calls': Count('id')}
+    for result, field in RESULT_FIELDS.items():
+        aggregates[field] = Count('id', filter=Q(call_result=result))
+    for interest, field in INTEREST_FIELDS.items():
+        aggregates[field] = Count('id', filter=Q(interest_type=interest))
+    aggregates['followup_required'] = Count('id', filter=Q(requires_follow_up=True))
+    aggregates['followup_completed'] = Count('id', filter=Q(requires_follow_up=True, follow_up_completed=True))
+    for key, field in HAPPY_CALL_FIELDS.items():
+        aggregates[field] = Count('id', filter=happy_call_q(key, stat_date, BOARD_WINDOW, prefix='customer__'))
+    aggregates['last_call_at'] = Max('call_date')
+    return aggregates
+
+
+def daily_calls(stat_date):
+    """현지 날짜 하루의 (삭제되지 않은) 통화 기록"""
+    return CallRecord.objects.on_local_day(stat_date).filter(is_deleted=False)
+
+
+def refresh_agent_daily_stats(caller_id, stat_date):
+    """(상담원, 날짜) 집계 한 행 재계산"""
+    values = daily_calls(stat_date).filter(caller_id=caller_id).aggregate(**stats_aggregates(stat_date))
+    if not values['total_calls']:
+        AgentDailyStats.objects.filter(caller_id=caller_id, stat_date=stat_date).delete()
+        return None
+    
+    stats, _ = AgentDailyStats.objects.update_or_create(
+        caller_id=caller_id,
+        stat_date=stat_date,
+        defaults=values
+    )
+    return stats
+
+
+class _PendingStats:
+    """트랜잭션 하나에서 재계산할 (상담원, 날짜) 모음 (커밋 후 한 번 실행)"""
+
+    def __init__(self):
+        self.keys = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        for caller_id, stat_date in self.keys:
+            refresh_agent_daily_stats(caller_id, stat_date)
+
+
+def schedule_agent_daily_stats(keys):
+    """(상담원, 날짜) 집계를 커밋 후 재계산하도록 예약 (트랜잭션 밖이면 바로 실행)"""
+    keys = set(keys)
+    if not keys:
+        return
+    connection = transaction.get_connection()
+    pending = getattr(connection, 'pending_agent_daily_stats', None)
+    # 같은 트랜잭션에 이미 예약된 재계산이 있으면 키만 추가 (롤백으로 버려졌거나 이미 실행됐으면 새로 예약)
+    if pending is not None and not pending.done and connection.in_atomic_block and any(
+        callback is pending for _, callback, *_ in connection.run_on_commit
+    ):
+        pending.keys |= keys
+        return
+    pending = _PendingStats()
+    pending.keys |= keys
+    connection.pending_agent_daily_stats = pending
+    transaction.on_commit(pending)
+
+
+def _stat_keys(calls):
+    return {
+        (caller_id, timezone.localdate(call_date))
+        for caller_id, call_date in calls.values_list('caller_id', 'call_date')
+    }
+
+
+def refresh_stats_for_calls(calls):
+    """통화 기록들이 속한 (상담원, 날짜) 집계 재계산 예약 (update() 등 시그널 없는 변경 후 호출)"""
+    schedule_agent_daily_stats(_stat_keys(calls))
+
+
+def refresh_stats_for_customers(customer_ids, batch_size=1000):
+    """고객들과의 통화가 속한 (상담원, 날짜) 집계 재계산 예약
+
+    해피콜 집계는 고객의 해피콜 예정일로 세므로 업로드 등으로 예정일이 바뀐 뒤 호출한다.
+    """
+    customer_ids = list(customer_ids)
+    keys = set()
+    for start in range(0, len(customer_ids), batch_size):
+        keys |= _stat_keys(CallRecord.objects.filter(
+            customer_id__in=customer_ids[start:start + batch_size], is_deleted=False
+        ))
+    schedule_agent_daily_stats(keys)
+
+
+def rebuild_agent_daily_stats(date_from=None, date_to=None):
+    """기간 전체 재계산 (날짜별 상담원 묶음 쿼리 1회), 생성된 행 수 반환"""
+    if date_from is None or date_to is None:
+        bounds = CallRecord.objects.filter(is_deleted=False).aggregate(first=Min('call_date'), last=Max('call_date'))
+        if bounds['first'] is None:
+            AgentDailyStats.objects.all().delete()
+            return 0
+        date_from = date_from or timezone.localdate(bounds['first'])
+        date_to = date_to or timezone.localdate(bounds['last'])
+
+    created = 0
+    stat_date = date_from
+    while stat_date <= date_to:
+        rows = daily_calls(stat_date).values('caller_id').annotate(**stats_aggregates(stat_date)).order_by()
+        with transaction.atomic():
+            AgentDailyStats.objects.filter(stat_date=stat_date).delete()
+            created += len(AgentDailyStats.objects.bulk_create([
+                AgentDailyStats(stat_date=stat_date, **row) for row in rows
+            ]))
+        stat_date += timedelta(days=1)
+    return created
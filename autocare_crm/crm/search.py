@@ -0,0 +1,165 @@
+# crm/search.py
+"""고객 검색 (이름/휴대전화/차량번호 부분 일치, 전화번호 숫자 검색)
+
+SQLite에서는 FTS5 trigram 색인(crm_customer_search)으로 부분 일치를 찾는다.
+색인은 crm_customer 테이블 트리거로 저장/수정/삭제와 bulk_create/update() 가
+모두 자동 반영된다. 테이블을 다시 만드는 마이그레이션은 트리거를 지우므로
+post_migrate 시점에 트리거를 다시 설치한다.
+
+숫자(와 '-', 공백)만 입력하면 전화번호 검색도 함께 한다.
+- 앞자리/완전 일치: phone_digits 인덱스 범위 탐색
+- 끝자리 (뒤 4자리 등): phone_digits_reversed 인덱스 범위 탐색
+- 중간 일치: 색인의 숫자 컬럼 (phone_digits, landline_digits)
+
+trigram 색인은 3글자 이상만 찾을 수 있으므로, 짧은 검색어나 SQLite 외 DB에서는
+기존 icontains 조건을 사용한다.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import PHONE_FIELDS, phone_digits
+
+
+SEARCH_TABLE = 'crm_customer_search'
+TEXT_COLUMNS = ('name', 'phone', 'vehicle_number')
+DIGIT_COLUMNS = tuple(f'{field}_digits' for field in PHONE_FIELDS)
+SEARCH_COLUMNS = TEXT_COLUMNS + DIGIT_COLUMNS
+MIN_INDEXED_LENGTH = 3
+
+PHONE_QUERY_PATTERN = re.compile(r'[\d\s\-.]+')
+
+
+def _install_sql(columns):
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        f"{names}, content='crm_customer', content_rowid='id', tokenize='trigram')",
+        f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON crm_customer BEGIN
+            INSERT INTO {SEARCH_TABLE}(rowid, {names}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON crm_customer BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {names}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF {names} ON crm_customer BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {names}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {SEARCH_TABLE}(rowid, {names}) VALUES (new.id, {new_values});
+        END""",
+    ]
+
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_au",
+    f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+]
+
+
+def installed_columns(conn):
+    """설치된 색인의 컬럼 (없으면 None)"""
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT name FROM pragma_table_info('{SEARCH_TABLE}')")
+        columns = tuple(row[0] for row in cursor.fetchall())
+    return columns or None
+
+
+def install_search_index(conn=None, rebuild=False):
+    """검색 색인 테이블/트리거 설치 (이미 있으면 건너뜀), rebuild=True 면 전체 재색인
+
+    트리거는 설치된 색인의 컬럼(없으면 SEARCH_COLUMNS)으로 만든다.
+    """
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return False
+    columns = installed_columns(conn) or SEARCH_COLUMNS
+    with conn.cursor() as cursor:
+        for sql in _install_sql(columns):
+            cursor.execute(sql)
+        if rebuild:
+            cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def drop_search_index(conn=None):
+    """검색 색인 제거"""
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        for sql in DROP_SQL:
+            cursor.execute(sql)
+
+
+def uses_index(query):
+    """검색어가 색인 검색 대상인지"""
+    return connection.vendor == 'sqlite' and len(query) >= MIN_INDEXED_LENGTH
+
+
+def query_digits(query):
+    """전화번호 형태 검색어의 숫자 (전화번호 형태가 아니면 '')"""
+    if not PHONE_QUERY_PATTERN.fullmatch(query):
+        return ''
+    return phone_digits(query)
+
+
+def _phrase(value):
+    return '"{}"'.format(value.replace('"', '""'))
+
+
+def matching_customer_ids(query, digits=''):
+    """검색어와 부분 일치하는 고객 id 서브쿼리 (색인 검색)"""
+    expression = _phrase(query)
+    if digits and digits != query and len(digits) >= MIN_INDEXED_LENGTH:
+        expression += ' OR {%s} : %s' % (' '.join(DIGIT_COLUMNS), _phrase(digits))
+    return RawSQL(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s", [expression])
+
+
+def prefix_range_q(field, value):
+    """value 로 시작하는 값 (LIKE 대신 인덱스 범위 조건)"""
+    upper = value[:-1] + chr(ord(value[-1]) + 1)
+    return Q(**{f'{field}__gte': value, f'{field}__lt': upper})
+
+
+def phone_digits_q(digits, prefix=''):
+    """전화번호 앞자리/끝자리 일치 (완전 일치 포함)"""
+    condition = Q()
+    for field in PHONE_FIELDS:
+        condition |= prefix_range_q(f'{prefix}{field}_digits', digits)
+        condition |= prefix_range_q(f'{prefix}{field}_digits_reversed', digits[::-1])
+    return condition
+
+
+def customer_search_q(query, prefix=''):
+    """고객 검색 조건
+
+    prefix: 고객을 참조하는 경로 (예: 통화 기록에서는 'customer__')
+    """
+    query = query.strip()
+    digits = query_digits(query)
+
+    if uses_index(query):
+        id_field = f'{prefix}id' if prefix else 'id'
+        condition = Q(**{f'{id_field}__in': matching_customer_ids(query, digits)})
+    else:
+        condition = Q()
+        for column in TEXT_COLUMNS:
+            condition |= Q(**{f'{prefix}{column}__icontains': query})
+        if digits and connection.vendor != 'sqlite':
+            for column in DIGIT_COLUMNS:
+                condition |= Q(**{f'{prefix}{column}__contains': digits})
+
+    if digits:
+        condition |= phone_digits_q(digits, prefix=prefix)
+    return condition
+
+
+def search_customers(queryset, query, prefix=''):
+    """검색어로 쿼리셋 필터링 (빈 검색어는 그대로 반환)"""
+    if not query or not query.strip():
+        return queryset
+    return queryset.filter(customer_search_q(query, prefix=prefix))
@@ -0,0 +1,61 @@
+# crm/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .contacts import record_call_contact, sync_daily_contact, contact_date_of
+from .events import publish_event
+from .models import CallAssignment, CallRecord, Customer
+from .pagination import invalidate_list_counts
+from .presence import touch
+from .rollups import schedule_agent_daily_stats
+from .stats import invalidate_sidebar_stats
+from .visibility import record_call_visibility, sync_customer_visibility
+
+
+@receiver(post_save, sender=CallRecord)
+def call_record_saved(sender, instance, created=False, raw=False, **kwargs):
+    """통화 기록 생성/소프트 삭제/후속조치 변경 시 일별 통화 고객·상담원 일별 집계(커밋 후) 반영 및 사이드바 통계 무효화"""
+    if raw:
+        return
+    record_call_contact(instance, created=created)
+    schedule_agent_daily_stats([(instance.caller_id, contact_date_of(instance))])
+    invalidate_sidebar_stats()
+    invalidate_list_counts()
+    
+    if created:
+        record_call_visibility(instance)
+    
+    if created and not instance.is_deleted:
+        # 통화 기록 저장도 상담원 활동으로 기록 (커밋 여부와 무관)
+        touch(instance.caller_id)
+        publish_event('call_counted')
+        publish_event('agent_status')
+
+
+@receiver(post_delete, sender=CallRecord)
+def call_record_deleted(sender, instance, **kwargs):
+    """통화 기록 삭제 시 일별 통화 고객·상담원 일별 집계(커밋 후)·조회 가능 고객 반영 및 사이드바 통계 무효화"""
+    sync_daily_contact(instance.customer_id, contact_date_of(instance))
+    schedule_agent_daily_stats([(instance.caller_id, contact_date_of(instance))])
+    sync_customer_visibility(instance.caller_id, instance.customer_id)
+    invalidate_sidebar_stats()
+    invalidate_list_counts()
+
+
+@receiver(post_save, sender=CallAssignment)
+@receiver(post_delete, sender=CallAssignment)
+def call_assignment_changed(sender, instance, raw=False, **kwargs):
+    """배정 생성/상태 변경/삭제 시 상담원 조회 가능 고객 반영 및 목록 건수 캐시 무효화"""
+    if raw:
+        return
+    sync_customer_visibility(instance.assigned_to_id, instance.customer_id)
+    invalidate_list_counts()
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def customer_changed(sender, instance, raw=False, **kwargs):
+    """고객 생성/수정/삭제 시 목록 건수 캐시 무효화 (업로드 upsert 는 import_customers 에서 처리)"""
+    if raw:
+        return
+    invalidate_list_counts()
@@ -0,0 +1,160 @@
+# crm/snapshots.py
+"""보드 스냅샷 (single-flight)
+
+팀장/관리자 대시보드처럼 여러 명이 같은 화면을 보는 경우,
+같은 조건(팀, 기간)의 보드는 첫 요청 한 번만 계산하고 나머지 요청은
+계산이 끝날 때까지 기다렸다가 같은 결과를 공유한다.
+
+- 프로세스 내: 키별 스레드 락으로 대기 (쓰는 요청이 없어지면 약한 참조라 사라짐)
+- 워커 간: SnapshotLock 행 INSERT (키 고유 제약) 로 한 워커만 계산한다.
+  락은 한 번만 시도하고, 못 잡은 워커는 DB 에 쓰지 않고 캐시만 점점 긴 간격으로 확인한다
+- 결과는 BOARD_SNAPSHOT_FRESHNESS 초 동안 재사용하고, 그 뒤에도 SNAPSHOT_STALE_KEEP 초 동안
+  보관해 계산 중인 워커가 끝내지 못하면 기다리던 요청에 이전 결과를 돌려준다
+"""
+import hashlib
+import threading
+import time
+import uuid
+import weakref
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import SnapshotLock
+
+
+SNAPSHOT_CACHE = 'shared'
+SNAPSHOT_KEY = 'board_snapshot:{name}:{digest}'
+SNAPSHOT_LOCK_KEY = 'board_snapshot_lock:{name}:{digest}'
+SNAPSHOT_LOCK_TIMEOUT = 60      # 계산 중인 워커가 죽었을 때 락이 풀리는 시간 = 최대 대기 시간 (초)
+SNAPSHOT_WAIT_INTERVAL = 0.1    # 다른 워커의 계산 결과 확인 주기 (초, 두 배씩 늘림)
+SNAPSHOT_WAIT_MAX_INTERVAL = 2  # 확인 주기 상한 (초)
+SNAPSHOT_STALE_KEEP = 600       # 유지 시간이 지난 스냅샷을 대기 중 대체용으로 보관하는 시간 (초)
+
+DEFAULT_FRESHNESS = 30
+
+_local_locks = weakref.WeakValueDictionary()
+_local_locks_guard = threading.Lock()
+
+
+class _KeyLock:
+    """키별 프로세스 내 락 (threading.Lock 은 약한 참조가 안 되므로 감싼다)"""
+    __slots__ = ('_lock', '__weakref__')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+
+def snapshot_freshness():
+    """스냅샷 유지 시간 (초, 0이면 사용 안 함)"""
+    return getattr(settings, 'BOARD_SNAPSHOT_FRESHNESS', DEFAULT_FRESHNESS)
+
+
+def _digest(params):
+    raw = '|'.join(str(param) for param in params)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def _local_lock(key):
+    with _local_locks_guard:
+        lock = _local_locks.get(key)
+        if lock is None:
+            lock = _local_locks[key] = _KeyLock()
+        return lock
+
+
+def _acquire(lock_key, token):
+    """워커 간 락 획득 (락 행 INSERT 성공 여부)
+
+    계산 중인 워커가 죽어 SNAPSHOT_LOCK_TIMEOUT 보다 오래된 락은 지우고 다시 시도한다.
+    """
+    stale_before = timezone.now() - timedelta(seconds=SNAPSHOT_LOCK_TIMEOUT)
+    stale = SnapshotLock.objects.filter(key=lock_key, locked_at__lt=stale_before)
+    if stale.exists():
+        stale.delete()
+    try:
+        with transaction.atomic():
+            SnapshotLock.objects.create(key=lock_key, token=token, locked_at=timezone.now())
+    except IntegrityError:
+        return False
+    return True
+
+
+def _release(lock_key, token):
+    # 오래되어 다른 워커가 가져간 락은 지우지 않는다
+    SnapshotLock.objects.filter(key=lock_key, token=token).delete()
+
+
+def _is_fresh(snapshot, freshness):
+    return snapshot is not None and timezone.now() - snapshot['computed_at'] < timedelta(seconds=freshness)
+
+
+def _wait_for_fresh(cache, key, freshness):
+    """다른 워커의 계산 결과를 기다림 (캐시만 확인), 시간 안에 안 나오면 None"""
+    deadline = time.monotonic() + SNAPSHOT_LOCK_TIMEOUT
+    interval = SNAPSHOT_WAIT_INTERVAL
+    while time.monotonic() < deadline:
+        time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+        interval = min(interval * 2, SNAPSHOT_WAIT_MAX_INTERVAL)
+        snapshot = cache.get(key)
+        if _is_fresh(snapshot, freshness):
+            return snapshot
+    return None
+
+
+def get_snapshot(name, params, compute, freshness=None):
+    """스냅샷 조회, 없으면 한 요청만 compute()로 계산하고 나머지는 결과를 기다림
+
+    name: 보드 이름, params: 보드 결과를 결정하는 값 목록 (팀, 기간 등)
+    compute: 결과를 계산하는 함수 (결과는 pickle 가능해야 함)
+    """
+    freshness = snapshot_freshness() if freshness is None else freshness
+    if freshness <= 0:
+        return compute()
+
+    cache = caches[SNAPSHOT_CACHE]
+    digest = _digest(params)
+    key = SNAPSHOT_KEY.format(name=name, digest=digest)
+    lock_key = SNAPSHOT_LOCK_KEY.format(name=name, digest=digest)
+
+    snapshot = cache.get(key)
+    if _is_fresh(snapshot, freshness):
+        return snapshot['data']
+
+    # 같은 프로세스의 동시 요청은 여기서 대기
+    with _local_lock(key):
+        snapshot = cache.get(key)
+        if _is_fresh(snapshot, freshness):
+            return snapshot['data']
+
+        token = uuid.uuid4().hex
+        acquired = _acquire(lock_key, token)
+        if not acquired:
+            # 다른 워커가 계산 중이면 결과가 저장될 때까지 대기
+            fresh = _wait_for_fresh(cache, key, freshness)
+            if fresh is not None:
+                return fresh['data']
+            # 계산하던 워커가 끝내지 못함: 이전 결과가 있으면 그대로 보여주고 다시 계산하지 않는다
+            snapshot = cache.get(key) or snapshot
+            if snapshot is not None:
+                return snapshot['data']
+            # 보여줄 결과가 없으면 오래된 락을 넘겨받아 계산
+            acquired = _acquire(lock_key, token)
+
+        try:
+            data = compute()
+            cache.set(key, {'data': data, 'computed_at': timezone.now()}, freshness + SNAPSHOT_STALE_KEEP)
+        finally:
+            if acquired:
+                _release(lock_key, token)
+        return data
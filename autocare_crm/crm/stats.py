@@ -0,0 +1,204 @@
+# crm/stats.py
+"""대시보드/사이드바 통계 집계
+
+조건부 집계(Count + filter)로 대시보드 수치를 한 번에 계산한다.
+- 고객 테이블 1회 스캔
+- 오늘 통화 기록 1회 스캔
+- 오늘 통화 고객 집합(DailyContact) 1회 조회
+- 후속조치 통화 기록 1회 스캔
+
+사이드바 통계는 워커 간 공유 캐시에 저장하고 데이터 변경 시에만 재계산한다.
+"""
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Customer, CallRecord, HAPPY_CALL_DAYS
+from .cohorts import BOARD_WINDOW, happy_call_q
+from .contacts import contacted_counts
+
+
+INTERESTED_TYPES = ['insurance', 'maintenance', 'financing', 'multiple']
+
+# 사이드바 통계 캐시 (워커 간 공유, 날짜별 키)
+SIDEBAR_STATS_CACHE = 'shared'
+SIDEBAR_STATS_KEY = 'sidebar_stats:{date}'
+
+
+def customer_segments(today, prefix=''):
+    """대시보드 고객 구분별 조건
+
+    prefix에 'customer__'를 넘기면 CallRecord 기준 조건으로 사용할 수 있다.
+    """
+    segments = {}
+    for key in HAPPY_CALL_DAYS:
+        segments[f'happy_call_{key}'] = happy_call_q(key, today, BOARD_WINDOW, prefix)
+
+    segments['overdue_customers'] = Q(**{
+        f'{prefix}inspection_expiry_date__isnull': False,
+        f'{prefix}inspection_expiry_date__lt': today,
+    })
+    segments['returning_customers'] = Q(**{f'{prefix}visit_count__gte': 2})
+    segments['vip_customers'] = Q(**{f'{prefix}customer_grade': 'vip'})
+    return segments
+
+
+def progress_rate(completed, total):
+    """진행률 (%)"""
+    return round((completed / total * 100) if total > 0 else 0)
+
+
+def get_dashboard_stats(today=None):
+    """대시보드 통계 계산 (집계 쿼리 4회)"""
+    today = today or timezone.localdate()
+    three_months_later = today + timedelta(days=90)
+    segments = customer_segments(today)
+    call_segments = customer_segments(today, prefix='customer__')
+
+    due_soon_q = Q(
+        inspection_expiry_date__isnull=False,
+        inspection_expiry_date__gte=today,
+        inspection_expiry_date__lte=three_months_later,
+    )
+
+    # 1. 고객 테이블 1회 스캔
+    customer_aggregates = {
+        'total_customers': Count('id'),
+        'pending_customers': Count('id', filter=Q(status='pending')),
+        'interested_customers': Count('id', filter=Q(status='interested')),
+        'converted_customers': Count('id', filter=Q(status='converted')),
+        'due_soon_customers': Count('id', filter=due_soon_q),
+        'first_time_lost': Count('id', filter=Q(is_first_time_no_return=True)),
+        'long_term_lost': Count('id', filter=Q(is_long_term_absent=True) | Q(customer_status='possibly_scrapped')),
+        'frequent_visitors': Count('id', filter=Q(visit_count__gte=3)),
+    }
+    for name, condition in segments.items():
+        customer_aggregates[f'{name}_total'] = Count('id', filter=condition)
+    customer_counts = Customer.objects.aggregate(**customer_aggregates)
+
+    # 2. 오늘 통화 기록 1회 스캔
+    call_aggregates = {
+        'today_total_calls': Count('id'),
+        'today_connected_calls': Count('id', filter=Q(call_result='connected')),
+        'followup_calls_today': Count('id', filter=Q(parent_call__isnull=False)),
+        'today_overdue_calls': Count('id', filter=call_segments['overdue_customers']),
+        'today_due_soon_calls': Count('id', filter=Q(
+            customer__inspection_expiry_date__isnull=False,
+            customer__inspection_expiry_date__gte=today,
+            customer__inspection_expiry_date__lte=three_months_later,
+        )),
+        'today_vip_calls': Count('id', filter=call_segments['vip_customers']),
+    }
+    call_counts = CallRecord.objects.on_local_day(today).filter(
+        is_deleted=False
+    ).aggregate(**call_aggregates)
+    
+    # 3. 오늘 통화한 고객 집합 (DailyContact) 1회 조회 - 고객 구분별 통화 완료 고객 수
+    contacted = contacted_counts(today, call_segments)
+
+    # 4. 후속조치 통계 1회 스캔
+    followup_counts = CallRecord.objects.filter(is_deleted=False).aggregate(
+        followup_required_total=Count('id', filter=Q(requires_follow_up=True)),
+        followup_completed_total=Count('id', filter=Q(requires_follow_up=True, follow_up_completed=True)),
+        followup_due_today=Count('id', filter=Q(follow_up_date=today, follow_up_completed=False)),
+        followup_overdue=Count('id', filter=Q(
+            follow_up_date__lt=today,
+            follow_up_completed=False,
+            requires_follow_up=True,
+        )),
+    )
+
+    stats = {}
+    stats.update(customer_counts)
+    stats.update(call_counts)
+    stats.update(followup_counts)
+
+    # 고객 구분별 전체/남은/완료 현황
+    for name in segments:
+        total = customer_counts[f'{name}_total']
+        completed = contacted[name]
+        stats[name] = {
+            'total': total,
+            'remaining': total - completed,
+            'completed': completed,
+            'progress': progress_rate(completed, total),
+        }
+
+    # 오늘의 통화 대상자 통계
+    happy_call_targets = sum(stats[f'happy_call_{key}']['remaining'] for key in HAPPY_CALL_DAYS)
+    priority_targets = stats['overdue_customers']['remaining'] + stats['returning_customers']['remaining']
+    today_total_targets = happy_call_targets + priority_targets
+    today_completed_targets = contacted['_total']
+
+    stats['today_targets'] = {
+        'total': today_total_targets,
+        'remaining': today_total_targets - today_completed_targets,
+        'completed': today_completed_targets,
+        'completion_rate': progress_rate(today_completed_targets, today_total_targets),
+        'actual_calls': call_counts['today_total_calls'],
+    }
+
+    stats['followup_pending'] = followup_counts['followup_required_total'] - followup_counts['followup_completed_total']
+    stats['followup_completion_rate'] = 0
+    if followup_counts['followup_required_total'] > 0:
+        stats['followup_completion_rate'] = round(
+            (followup_counts['followup_completed_total'] / followup_counts['followup_required_total']) * 100, 1
+        )
+
+    return stats
+
+
+def compute_sidebar_stats(today):
+    """사이드바 통계 계산"""
+    # 오늘 통화 수
+    sidebar_today_calls = CallRecord.objects.on_local_day(today).filter(
+        is_deleted=False
+    ).count()
+    
+    # 미완료 후속조치
+    sidebar_pending_followups = CallRecord.objects.filter(
+        requires_follow_up=True,
+        follow_up_completed=False,
+        is_deleted=False
+    ).count()
+    
+    # 검사만료 고객
+    sidebar_overdue_customers = Customer.objects.filter(
+        inspection_expiry_date__isnull=False,
+        inspection_expiry_date__lt=today
+    ).count()
+    
+    return {
+        'sidebar_today_calls': sidebar_today_calls,
+        'sidebar_pending_followups': sidebar_pending_followups,
+        'sidebar_overdue_customers': sidebar_overdue_customers,
+    }
+
+
+def get_sidebar_stats():
+    """사이드바에 표시할 통계 정보 (캐시 우선)
+
+    통화 기록 생성/삭제/후속조치 변경, 검사일 변경 업로드 시에만 무효화된다.
+    날짜가 바뀌면 새 키를 사용하므로 자정 이후 자동으로 재계산된다.
+    """
+    today = timezone.localdate()
+    cache = caches[SIDEBAR_STATS_CACHE]
+    key = SIDEBAR_STATS_KEY.format(date=today.isoformat())
+    
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_sidebar_stats(today)
+        cache.set(key, stats, None)
+    return stats
+
+
+def invalidate_sidebar_stats():
+    """사이드바 통계 캐시 무효화 (트랜잭션 커밋 후)"""
+    def _delete():
+        today = timezone.localdate()
+        caches[SIDEBAR_STATS_CACHE].delete(SIDEBAR_STATS_KEY.format(date=today.isoformat()))
+    
+    transaction.on_commit(_delete)
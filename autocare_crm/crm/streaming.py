@@ -0,0 +1,187 @@
+# crm/streaming.py
+"""고객 업로드 파일 스트리밍 처리
+
+파일 전체를 DataFrame 으로 읽지 않고 청크(IMPORT_CHUNK_SIZE 행)씩 읽어
+정제(crm.cleaning) → 저장(crm.importing)을 반복하므로 메모리 사용량은
+파일 크기가 아니라 청크 크기에 비례한다.
+
+- CSV: read_csv(chunksize=...), 모든 열을 문자열로 읽음
+- xlsx: openpyxl 읽기 전용 모드의 행 반복
+- xls: 행 단위로 읽을 수 없어 시트 전체를 읽은 뒤 청크로 나눈다
+
+청크를 읽은 뒤/저장한 뒤마다 프로세스 메모리(RSS)를 재서 최대치를 결과 요약에 담는다.
+(tracemalloc 은 정확하지만 처리 시간이 2배 이상 늘어 쓰지 않는다)
+"""
+import os
+import resource
+import sys
+
+import pandas as pd
+from django.conf import settings
+from openpyxl import load_workbook
+
+from .cleaning import UPLOAD_FIELDS, clean_customer_frame, customer_records
+from .importing import import_customers
+
+
+SHEET_NAME = '고객'
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def current_memory():
+    """현재 프로세스 메모리 사용량 (바이트)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # /proc 이 없으면 프로세스 전체 최대치로 대신한다 (macOS 는 바이트, 그 외 KB)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def chunk_size_setting():
+    """청크 크기 (행)"""
+    return getattr(settings, 'IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def _xlsx_chunks(source, chunk_size, start_row):
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook[SHEET_NAME].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(value).strip() if value is not None else '' for value in header]
+        position = 0
+        start = start_row
+        chunk = []
+        for row in rows:
+            # 서식만 남은 빈 행은 건너뛴다 (행 번호에도 포함하지 않음)
+            if all(value is None for value in row):
+                continue
+            position += 1
+            if position <= start_row:
+                continue
+            chunk.append(row[:len(columns)])
+            if len(chunk) == chunk_size:
+                yield pd.DataFrame(chunk, columns=columns, index=range(start, start + len(chunk)))
+                start += len(chunk)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns, index=range(start, start + len(chunk)))
+    finally:
+        workbook.close()
+
+
+def _csv_chunks(source, chunk_size, start_row):
+    # 열 타입을 청크마다 추론하면 숫자만 있는 청크의 전화번호가 정수로 읽혀 앞자리 0이 빠지므로
+    # 모든 열을 문자열로 읽는다 (숫자/날짜는 정제 단계에서 변환)
+    skiprows = range(1, start_row + 1) if start_row else None
+    for chunk in pd.read_csv(source, encoding='utf-8', dtype=str, skiprows=skiprows, chunksize=chunk_size):
+        if start_row:
+            chunk.index += start_row
+        yield chunk
+
+
+def read_upload_chunks(source, file_name, chunk_size=None, start_row=0):
+    """업로드 파일 → 원본 DataFrame 청크 (열 이름은 파일 그대로, 인덱스는 파일 내 행 번호)
+
+    start_row: 앞에서부터 건너뛸 데이터 행 수 (중단된 작업 재시작용)
+    """
+    chunk_size = chunk_size or chunk_size_setting()
+    name = file_name.lower()
+    if name.endswith(('.xlsx', '.xlsm')):
+        yield from _xlsx_chunks(source, chunk_size, start_row)
+    elif name.endswith('.xls'):
+        df = pd.read_excel(source, sheet_name=SHEET_NAME)
+        for start in range(start_row, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    else:
+        yield from _csv_chunks(source, chunk_size, start_row)
+
+
+def estimate_upload_rows(path, file_name):
+    """진행률 표시용 데이터 행 수 추정 (파일 전체를 파싱하지 않음, 알 수 없으면 None)"""
+    name = file_name.lower()
+    if name.endswith(('.xlsx', '.xlsm')):
+        workbook = load_workbook(path, read_only=True)
+        try:
+            max_row = workbook[SHEET_NAME].max_row
+        finally:
+            workbook.close()
+        return max(max_row - 1, 0) if max_row else None
+    if name.endswith('.xls'):
+        return None
+    # CSV: 줄 수 - 헤더 (값 안의 줄바꿈은 고려하지 않은 근사값)
+    with open(path, 'rb') as csv_file:
+        lines = sum(block.count(b'\n') for block in iter(lambda: csv_file.read(1 << 20), b''))
+    return max(lines - 1, 0)
+
+
+class ImportSummary:
+    """스트리밍 업로드 결과"""
+
+    def __init__(self):
+        self.total_rows = 0
+        self.new_count = 0
+        self.updated_count = 0
+        self.error_count = 0
+        self.chunks = 0
+        self.start_memory = current_memory()    # 바이트
+        self.peak_memory = self.start_memory
+
+    def sample_memory(self):
+        self.peak_memory = max(self.peak_memory, current_memory())
+
+    @property
+    def saved_count(self):
+        return self.new_count + self.updated_count
+
+    @property
+    def peak_memory_mb(self):
+        return self.peak_memory / (1024 * 1024)
+
+    @property
+    def memory_growth_mb(self):
+        """시작 대비 최대 증가량"""
+        return (self.peak_memory - self.start_memory) / (1024 * 1024)
+
+
+def import_chunk(chunk, data_extract_date=None, fields=UPLOAD_FIELDS, prepare=None, batch_size=1000, dry_run=False):
+    """원본 청크 하나 정제 후 저장, (신규, 업데이트, 오류) 건수 반환
+
+    prepare: 정제된 청크를 저장 전에 보정하는 함수 (선택)
+    dry_run: 저장하지 않고 유효 행을 신규로 집계
+    """
+    cleaned, error_count = clean_customer_frame(chunk)
+    if prepare:
+        cleaned = prepare(cleaned)
+    records = customer_records(cleaned, fields)
+    if dry_run:
+        return len(records), 0, error_count
+    new_count, updated_count, write_errors = import_customers(records, data_extract_date, batch_size=batch_size)
+    return new_count, updated_count, error_count + write_errors
+
+
+def stream_customer_import(chunks, data_extract_date=None, fields=UPLOAD_FIELDS, prepare=None,
+                           batch_size=1000, progress=None, dry_run=False):
+    """원본 청크마다 정제 후 저장, ImportSummary 반환
+
+    progress: 청크마다 ImportSummary 로 호출 (선택)
+    """
+    summary = ImportSummary()
+    for chunk in chunks:
+        summary.sample_memory()
+        new_count, updated_count, error_count = import_chunk(
+            chunk, data_extract_date, fields, prepare, batch_size, dry_run
+        )
+        summary.sample_memory()
+
+        summary.total_rows += len(chunk)
+        summary.new_count += new_count
+        summary.updated_count += updated_count
+        summary.error_count += error_count
+        summary.chunks += 1
+        if progress:
+            progress(summary)
+    return summary
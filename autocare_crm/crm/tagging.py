@@ -0,0 +1,128 @@
+# crm/tagging.py
+"""고객 우선순위·태그 규칙 (열 단위)
+
+Customer.calculate_inspection_date / update_priority_tags (classify_customer_status,
+update_happy_call_needs 포함)와 같은 규칙을 DataFrame 전체에 NumPy 연산으로 적용한다.
+업로드처럼 많은 행을 한 번에 저장할 때 사용하고, 한 건씩 저장하는 화면은 모델 메서드를 그대로 쓴다.
+규칙을 바꾸면 두 곳을 함께 고쳐야 한다 (TaggingParityTest 가 행 단위로 비교).
+
+입력/출력 DataFrame 은 모델 필드명을 열로 갖고, 날짜 열은 date 또는 None 값이다.
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from django.utils import timezone
+
+from .models import HAPPY_CALL_DAYS
+
+
+INSPECTION_CYCLE = timedelta(days=730)    # 검사 주기 (실제 검사일 = 만료일 - 2년)
+DUE_SOON_DAYS = 90                        # 검사 만료 임박 기준
+LONG_TERM_ABSENT_DAYS = 1460              # 폐차 추정 (만료 후 4년)
+ABSENT_DAYS = 730                         # 이탈 (만료 후 2년)
+
+# (필드, 검사 완료 후 경과일 구간) — update_happy_call_needs 와 동일
+HAPPY_CALL_NEEDS = [
+    ('needs_3month_call', 90, 180),
+    ('needs_6month_call', 180, 365),
+    ('needs_12month_call', 365, 540),
+    ('needs_18month_call', 540, 730),
+]
+
+
+def _days_since(values, today):
+    """today - 날짜 (일수, 빈 값은 NaN)"""
+    dates = pd.to_datetime(pd.Series(values), errors='coerce')
+    return (pd.Timestamp(today) - dates).dt.days.to_numpy(dtype=float)
+
+
+def _dates(values):
+    return pd.to_datetime(pd.Series(values), errors='coerce')
+
+
+def _to_date_objects(series):
+    return np.where(series.notna(), series.dt.date, None)
+
+
+def apply_inspection_dates(frame, extract_date):
+    """calculate_inspection_date 의 열 단위 버전 (검사만료일이 있는 행만 갱신)"""
+    expiry = _dates(frame['inspection_expiry_date'].to_numpy())
+    has_expiry = expiry.notna().to_numpy()
+    actual = expiry - INSPECTION_CYCLE
+
+    frame['actual_inspection_date'] = np.where(has_expiry, _to_date_objects(actual), frame['actual_inspection_date'])
+    frame['data_extracted_date'] = np.where(has_expiry, extract_date, frame['data_extracted_date'])
+    for key, days in HAPPY_CALL_DAYS.items():
+        field = f'happy_call_{key}_date'
+        frame[field] = np.where(has_expiry, _to_date_objects(actual + timedelta(days=days)), frame[field])
+    return frame
+
+
+def apply_priority_tags(frame, today=None):
+    """update_priority_tags 의 열 단위 버전
+
+    기존 값이 있어야 하는 열: inspection_expiry_date, last_inspection_completed, visit_count,
+    customer_grade, priority, is_inspection_overdue, is_first_time_no_return, is_long_term_absent,
+    is_active_customer, customer_status, needs_*_call
+    """
+    # 모델 메서드와 같은 기준일 (UTC 날짜)
+    today = today or timezone.now().date()
+    priority = frame['priority'].to_numpy(dtype=object).copy()
+    visit_count = frame['visit_count'].to_numpy()
+
+    # 검사 만료 태그 (만료 후 경과일, 빈 값은 NaN 이라 모든 비교가 거짓)
+    days_overdue = _days_since(frame['inspection_expiry_date'].to_numpy(), today)
+    overdue = days_overdue > 0
+    due_soon = ~overdue & (days_overdue >= -DUE_SOON_DAYS)
+    is_inspection_overdue = frame['is_inspection_overdue'].to_numpy(dtype=bool) | overdue
+    priority[overdue] = 'high'
+    priority[due_soon & (priority == 'low')] = 'high'
+
+    is_frequent_visitor = visit_count >= 3
+    has_premium_vehicle = frame['customer_grade'].to_numpy(dtype=object) == 'vip'
+
+    # 이탈 고객 분류 (검사만료일이 없으면 기존 값 유지)
+    is_first_time_no_return = frame['is_first_time_no_return'].to_numpy(dtype=bool).copy()
+    is_long_term_absent = frame['is_long_term_absent'].to_numpy(dtype=bool).copy()
+    is_active_customer = frame['is_active_customer'].to_numpy(dtype=bool).copy()
+    customer_status = frame['customer_status'].to_numpy(dtype=object).copy()
+
+    has_expiry = ~np.isnan(days_overdue)
+    scrapped = days_overdue > LONG_TERM_ABSENT_DAYS
+    absent = ~scrapped & (days_overdue > ABSENT_DAYS)
+    first_time_lost = absent & (visit_count == 1)
+    long_term_lost = absent & ~first_time_lost
+    active = has_expiry & ~scrapped & ~absent
+
+    is_long_term_absent |= scrapped | long_term_lost
+    is_first_time_no_return |= first_time_lost
+    is_active_customer[has_expiry] = active[has_expiry]
+    customer_status[scrapped] = 'possibly_scrapped'
+    customer_status[first_time_lost] = 'first_time_lost'
+    customer_status[long_term_lost] = 'long_term_lost'
+    customer_status[active] = 'active'
+
+    # 해피콜 필요 체크 (활성 고객만, 기존 True 는 유지)
+    days_since_inspection = _days_since(frame['last_inspection_completed'].to_numpy(), today)
+    for field, start, end in HAPPY_CALL_NEEDS:
+        in_window = is_active_customer & (days_since_inspection >= start) & (days_since_inspection < end)
+        frame[field] = frame[field].to_numpy(dtype=bool) | in_window
+
+    # 우선순위 조정
+    high = is_inspection_overdue & is_active_customer
+    medium = ~high & is_frequent_visitor & (priority == 'low')
+    low = ~high & ~medium & ~is_active_customer
+    priority[high] = 'high'
+    priority[medium] = 'medium'
+    priority[low] = 'low'
+
+    frame['priority'] = priority
+    frame['is_inspection_overdue'] = is_inspection_overdue
+    frame['is_frequent_visitor'] = is_frequent_visitor
+    frame['has_premium_vehicle'] = has_premium_vehicle
+    frame['is_first_time_no_return'] = is_first_time_no_return
+    frame['is_long_term_absent'] = is_long_term_absent
+    frame['is_active_customer'] = is_active_customer
+    frame['customer_status'] = customer_status
+    return frame
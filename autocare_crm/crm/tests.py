@@ -1,3 +1,1491 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from io import StringIO
 
-# Create your tests here.
+import pandas as pd
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import AgentDailyStats, CallAssignment, Customer, CustomerVisibility, CallRecord, DailyContact, ImportJob, SnapshotLock, UploadHistory, UserProfile, inspection_sort_annotations
+from .cohorts import BOARD_WINDOW, LIST_WINDOW, filter_happy_call
+from .stats import get_dashboard_stats, get_sidebar_stats
+from .events import format_sse, latest_event_id, publish_event, read_events
+from .snapshots import get_snapshot
+from .metrics import request_metrics
+from .performance import call_distribution, call_time_series, team_metrics
+from .rollups import rebuild_agent_daily_stats, refresh_stats_for_calls
+from .search import search_customers, uses_index
+from .presence import ONLINE_WINDOW, PRESENCE_TTL, get_presence, presence_status, touch
+from .pagination import CURSOR_PARAM, keyset_paginate, list_count
+from .visibility import rebuild_customer_visibility, visible_customers
+from .cleaning import clean_customer_frame, customer_records
+from .importing import ATTNAMES, import_customers, new_customer_values
+from .tagging import apply_inspection_dates, apply_priority_tags
+from .streaming import read_upload_chunks, stream_customer_import
+from .jobs import ImportJobLost, claim_next_job, retry_job, run_import_job
+
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-shared'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class DashboardStatsTest(TestCase):
+    """대시보드 통계 집계 테스트"""
+
+    # 대시보드 1회 로드 시 허용되는 최대 쿼리 수
+    DASHBOARD_QUERY_BUDGET = 12
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        cls.manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=cls.manager, role='manager', team='영업1팀')
+
+        def make_customer(i, **kwargs):
+            customer = Customer(
+                name=f'고객{i}',
+                phone=f'010-0000-{i:04d}',
+                vehicle_number=f'12가{i:04d}',
+                **kwargs
+            )
+            customer.update_happy_call_dates()
+            customer.save()
+            return customer
+
+        cls.happy_3month = make_customer(1, actual_inspection_date=cls.today - timedelta(days=90))
+        cls.happy_6month = make_customer(2, actual_inspection_date=cls.today - timedelta(days=183))
+        cls.overdue = make_customer(3, inspection_expiry_date=cls.today - timedelta(days=10), visit_count=3)
+        cls.vip = make_customer(4, customer_grade='vip', status='interested')
+        make_customer(5, inspection_expiry_date=cls.today + timedelta(days=30))
+
+        for customer in [cls.happy_3month, cls.overdue, cls.overdue]:
+            CallRecord.objects.create(
+                customer=customer,
+                caller=cls.manager,
+                call_result='connected',
+                requires_follow_up=True,
+                follow_up_date=cls.today - timedelta(days=1),
+            )
+        CallRecord.objects.create(customer=cls.vip, caller=cls.manager, call_result='no_answer', is_deleted=True)
+
+    def test_dashboard_stats_values(self):
+        stats = get_dashboard_stats(self.today)
+
+        self.assertEqual(stats['total_customers'], 5)
+        self.assertEqual(stats['interested_customers'], 1)
+        self.assertEqual(stats['due_soon_customers'], 1)
+        self.assertEqual(stats['frequent_visitors'], 1)
+        self.assertEqual(stats['happy_call_3month'], {'total': 1, 'remaining': 0, 'completed': 1, 'progress': 100})
+        self.assertEqual(stats['happy_call_6month'], {'total': 1, 'remaining': 1, 'completed': 0, 'progress': 0})
+        self.assertEqual(stats['overdue_customers']['completed'], 1)
+        self.assertEqual(stats['returning_customers']['total'], 1)
+        self.assertEqual(stats['vip_customers']['remaining'], 1)
+        self.assertEqual(stats['today_total_calls'], 3)
+        self.assertEqual(stats['today_overdue_calls'], 2)
+        self.assertEqual(stats['today_targets']['completed'], 2)
+        self.assertEqual(stats['today_targets']['total'], 1)
+        self.assertEqual(stats['followup_overdue'], 3)
+        self.assertEqual(stats['followup_pending'], 3)
+
+    def test_dashboard_query_budget(self):
+        self.client.force_login(self.manager)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(queries), self.DASHBOARD_QUERY_BUDGET)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class SidebarStatsCacheTest(TestCase):
+    """사이드바 통계 캐시 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = User.objects.create_user(username='agent1', password='pw1234')
+        UserProfile.objects.create(user=cls.agent, role='agent', team='영업1팀')
+        cls.customer = Customer.objects.create(name='고객', phone='010-1111-2222', vehicle_number='12가3456')
+
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+
+    def test_cached_until_call_record_written(self):
+        with self.assertNumQueries(3):
+            get_sidebar_stats()
+        with self.assertNumQueries(0):
+            stats = get_sidebar_stats()
+        self.assertEqual(stats['sidebar_pending_followups'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call = CallRecord.objects.create(
+                customer=self.customer,
+                caller=self.agent,
+                call_result='connected',
+                requires_follow_up=True,
+            )
+        self.assertEqual(get_sidebar_stats()['sidebar_pending_followups'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call.soft_delete(self.agent)
+        self.assertEqual(get_sidebar_stats()['sidebar_pending_followups'], 0)
+
+    def test_invalidated_after_customer_import(self):
+        get_sidebar_stats()
+        record = {
+            'name': '김철수', 'phone': '010-3333-4444', 'vehicle_number': '34나5678',
+            'vehicle_name': '', 'vehicle_model': '', 'address': '',
+            'inspection_expiry_date': timezone.localdate(),
+            'insurance_expiry_date': None, 'vehicle_registration_date': None,
+            'customer_grade': '', 'visit_count': 0,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            import_customers([record], timezone.localdate())
+        # 업로드(검사일 변경) 후에는 다시 계산한다
+        with self.assertNumQueries(3):
+            get_sidebar_stats()
+
+    def test_api_reads_cache(self):
+        self.client.force_login(self.agent)
+        get_sidebar_stats()
+        response = self.client.get(reverse('sidebar_stats_api'))
+        self.assertEqual(response.json()['pending_followups'], 0)
+
+
+class HappyCallCohortTest(TestCase):
+    """해피콜 예정일/대상 조회 테스트"""
+
+    def test_calculate_inspection_date_sets_due_dates(self):
+        today = timezone.localdate()
+        customer = Customer(
+            name='고객',
+            phone='010-2222-3333',
+            vehicle_number='34나5678',
+            inspection_expiry_date=today + timedelta(days=730 - 90),
+        )
+        customer.calculate_inspection_date(today)
+        customer.save()
+
+        self.assertEqual(customer.happy_call_3month_date, today)
+        self.assertEqual(customer.happy_call_18month_date, today + timedelta(days=548 - 90))
+        self.assertTrue(filter_happy_call(Customer.objects.all(), '3month', today, LIST_WINDOW).exists())
+        self.assertFalse(filter_happy_call(Customer.objects.all(), '6month', today, BOARD_WINDOW).exists())
+
+
+class DailyContactTest(TestCase):
+    """일별 통화 고객 집합 테스트"""
+
+    def test_maintained_on_call_write_and_soft_delete(self):
+        agent = User.objects.create_user(username='agent1', password='pw1234')
+        customer = Customer.objects.create(name='고객', phone='010-3333-4444', vehicle_number='56다7890')
+        today = timezone.localdate()
+
+        first = CallRecord.objects.create(customer=customer, caller=agent, call_result='no_answer')
+        second = CallRecord.objects.create(customer=customer, caller=agent, call_result='connected')
+        self.assertEqual(DailyContact.objects.filter(contact_date=today, customer=customer).count(), 1)
+
+        first.soft_delete(agent)
+        self.assertTrue(DailyContact.objects.filter(contact_date=today, customer=customer).exists())
+
+        second.soft_delete(agent)
+        self.assertFalse(DailyContact.objects.filter(contact_date=today, customer=customer).exists())
+
+
+@override_settings(CACHES=TEST_CACHES)
+class LiveEventTest(TestCase):
+    """실시간 이벤트 발행 테스트"""
+
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+
+    def test_call_record_publishes_events_after_commit(self):
+        agent = User.objects.create_user(username='agent1', password='pw1234')
+        customer = Customer.objects.create(name='고객', phone='010-4444-5555', vehicle_number='78라1234')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CallRecord.objects.create(
+                customer=customer,
+                caller=agent,
+                call_result='connected',
+                requires_follow_up=True,
+            )
+        # 한 트랜잭션의 발행은 커밋 후 이벤트 1건으로 합쳐진다
+        self.assertEqual(latest_event_id(), 1)
+
+        events, latest = read_events(0)
+        self.assertEqual([event['type'] for event in events], ['stats_changed'])
+        # 모든 사용자에게 전달되므로 갱신 종류와 전체 사이드바 통계만 담는다
+        self.assertEqual(set(events[0]['data']), {'types', 'sidebar', 'timestamp'})
+        self.assertEqual(events[0]['data']['types'], ['agent_status', 'call_counted'])
+        self.assertEqual(events[0]['data']['sidebar']['sidebar_pending_followups'], 1)
+        # 새 이벤트가 없으면 공유 캐시의 마지막 번호만 확인한다
+        with self.assertNumQueries(0):
+            self.assertEqual(read_events(latest), ([], 1))
+
+        message = format_sse(events[0]['type'], events[0]['data'], events[0]['id'])
+        self.assertTrue(message.startswith('id: 1\nevent: stats_changed\ndata: '))
+        self.assertTrue(message.endswith('\n\n'))
+
+    def test_rolled_back_savepoint_is_not_published(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    publish_event('followup_completed')
+                    raise ValueError
+            except ValueError:
+                pass
+            publish_event('agent_status')
+        events, _ = read_events(0)
+        self.assertEqual([event['data']['types'] for event in events], [['agent_status']])
+
+    def test_stream_requires_login(self):
+        response = self.client.get(reverse('live_stream'))
+        self.assertEqual(response.status_code, 401)
+
+    def test_wsgi_stream_is_not_served(self):
+        agent = User.objects.create_user(username='agent1', password='pw1234')
+        self.client.force_login(agent)
+
+        # WSGI 에서는 스트림을 열지 않는다 (204 이면 브라우저가 재연결하지 않음)
+        response = self.client.get(reverse('live_stream'))
+        self.assertEqual(response.status_code, 204)
+
+    def test_poll_api(self):
+        agent = User.objects.create_user(username='agent1', password='pw1234')
+        self.client.force_login(agent)
+
+        data = self.client.get(reverse('live_events_api')).json()
+        self.assertEqual(data['last_event_id'], 0)
+        self.assertIn('sidebar_pending_followups', data['sidebar'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_event('followup_completed')
+        data = self.client.get(reverse('live_events_api'), {'after': 0}).json()
+        self.assertEqual(data['last_event_id'], 1)
+        self.assertEqual([event['data']['types'] for event in data['events']], [['followup_completed']])
+        self.assertNotIn('sidebar', data)
+
+
+@override_settings(CACHES=TEST_CACHES, BOARD_SNAPSHOT_FRESHNESS=30)
+class BoardSnapshotTest(TransactionTestCase):
+    """보드 스냅샷 (single-flight) 테스트"""
+
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+
+    def test_concurrent_requests_share_one_computation(self):
+        computed = []
+
+        def compute():
+            computed.append(1)
+            time.sleep(0.2)
+            return {'total': 42}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_snapshot('test_board', ['팀A'], compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(computed), 1)
+        self.assertEqual(results, [{'total': 42}] * 5)
+
+        # 다른 조건은 별도 스냅샷
+        get_snapshot('test_board', ['팀B'], compute)
+        self.assertEqual(len(computed), 2)
+
+    def test_db_lock_released_and_stale_lock_taken_over(self):
+        from .snapshots import SNAPSHOT_LOCK_KEY, SNAPSHOT_LOCK_TIMEOUT, _digest, _local_locks
+
+        get_snapshot('test_board', ['팀A'], lambda: {'total': 1})
+        self.assertFalse(SnapshotLock.objects.exists())
+        # 프로세스 내 락은 쓰는 요청이 끝나면 사라진다
+        self.assertEqual(len(_local_locks), 0)
+
+        # 죽은 워커가 남긴 오래된 락은 기다리지 않고 가져간다
+        lock_key = SNAPSHOT_LOCK_KEY.format(name='test_board', digest=_digest(['팀B']))
+        SnapshotLock.objects.create(
+            key=lock_key, token='dead', locked_at=timezone.now() - timedelta(seconds=SNAPSHOT_LOCK_TIMEOUT + 1)
+        )
+        started = time.monotonic()
+        self.assertEqual(get_snapshot('test_board', ['팀B'], lambda: {'total': 2}), {'total': 2})
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(SnapshotLock.objects.exists())
+
+    def test_waiter_polls_cache_and_falls_back_to_stale_snapshot(self):
+        from unittest import mock
+        from django.core.cache import caches
+        from .snapshots import SNAPSHOT_KEY, SNAPSHOT_LOCK_KEY, _digest
+
+        # 다른 워커가 계산 중 (살아 있는 락) 이고 유지 시간이 지난 이전 결과가 있음
+        digest = _digest(['팀A'])
+        SnapshotLock.objects.create(
+            key=SNAPSHOT_LOCK_KEY.format(name='test_board', digest=digest), token='busy', locked_at=timezone.now()
+        )
+        caches['shared'].set(
+            SNAPSHOT_KEY.format(name='test_board', digest=digest),
+            {'data': {'total': 1}, 'computed_at': timezone.now() - timedelta(minutes=5)},
+        )
+
+        computed = []
+        with mock.patch('crm.snapshots.SNAPSHOT_LOCK_TIMEOUT', 0.5), \
+                CaptureQueriesContext(connection) as queries:
+            data = get_snapshot('test_board', ['팀A'], lambda: computed.append(1) or {'total': 2})
+
+        # 락은 한 번만 시도하고, 기다린 뒤에도 새 결과가 없으면 다시 계산하지 않고 이전 결과를 돌려준다
+        self.assertEqual(data, {'total': 1})
+        self.assertEqual(computed, [])
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+    @override_settings(BOARD_SNAPSHOT_FRESHNESS=0)
+    def test_disabled_when_freshness_is_zero(self):
+        computed = []
+        get_snapshot('test_board', ['팀A'], lambda: computed.append(1))
+        get_snapshot('test_board', ['팀A'], lambda: computed.append(1))
+        self.assertEqual(len(computed), 2)
+
+    def test_admin_dashboard_reuses_snapshot(self):
+        admin = User.objects.create_user(username='admin1', password='pw1234')
+        UserProfile.objects.create(user=admin, role='admin', team='운영팀')
+        self.client.force_login(admin)
+
+        with CaptureQueriesContext(connection) as first:
+            self.assertEqual(self.client.get(reverse('admin_dashboard')).status_code, 200)
+        with CaptureQueriesContext(connection) as second:
+            self.assertEqual(self.client.get(reverse('admin_dashboard')).status_code, 200)
+        self.assertLess(len(second), len(first))
+        self.assertEqual(self.client.get(reverse('team_dashboard')).status_code, 200)
+
+
+@override_settings(CACHES=TEST_CACHES, REQUEST_METRICS_ENABLED=True)
+class RequestMetricsTest(TestCase):
+    """요청별 성능 측정 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin1', password='pw1234')
+        UserProfile.objects.create(user=cls.admin, role='admin', team='운영팀')
+        cls.agent = User.objects.create_user(username='agent1', password='pw1234')
+        UserProfile.objects.create(user=cls.agent, role='agent', team='영업1팀')
+
+    def setUp(self):
+        request_metrics.clear()
+
+    def test_metrics_recorded_per_url_name(self):
+        self.client.force_login(self.admin)
+        self.client.get(reverse('dashboard'))
+        self.client.get(reverse('dashboard'))
+
+        response = self.client.get(reverse('request_metrics_api'), {'view': 'dashboard'})
+        views = response.json()['views']
+        self.assertEqual(len(views), 1)
+        self.assertEqual(views[0]['view'], 'dashboard')
+        self.assertEqual(views[0]['count'], 2)
+        self.assertGreater(views[0]['queries']['max'], 0)
+        self.assertGreater(views[0]['template_ms']['max'], 0)
+        self.assertTrue(views[0]['slowest_queries'])
+
+    @override_settings(REQUEST_METRICS_HEADER=True)
+    def test_server_timing_header(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(reverse('dashboard'))
+        self.assertIn('queries', response['Server-Timing'])
+
+    def test_api_is_admin_only(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(reverse('request_metrics_api'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_async_views_not_recorded(self):
+        self.client.force_login(self.agent)
+        self.client.get(reverse('live_stream'))
+        self.assertEqual(request_metrics.summary('live_stream'), [])
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_disabled(self):
+        self.client.force_login(self.admin)
+        self.client.get(reverse('dashboard'))
+        self.assertEqual(request_metrics.summary('dashboard'), [])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class LoadDataBenchmarkTest(TestCase):
+    """가상 데이터 생성/벤치마크 명령 테스트"""
+
+    def generate(self):
+        call_command(
+            'generate_load_data', customers=40, calls=300, teams=2, agents_per_team=3,
+            batch_size=64, seed=7, flush=True, stdout=StringIO()
+        )
+        customers = list(Customer.objects.order_by('id').values_list('name', 'vehicle_name', 'inspection_expiry_date'))
+        calls = list(CallRecord.objects.order_by('id').values_list('call_result', 'requires_follow_up', 'is_deleted'))
+        return customers, calls
+
+    def test_generator_is_deterministic(self):
+        first = self.generate()
+        second = self.generate()
+
+        self.assertEqual(len(first[0]), 40)
+        self.assertEqual(len(first[1]), 300)
+        self.assertEqual(first, second)
+        self.assertTrue(DailyContact.objects.exists())
+        self.assertTrue(CallRecord.objects.filter(parent_call__isnull=False).exists())
+
+    def test_benchmark_report(self):
+        self.generate()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            call_command(
+                'benchmark_views', only=['dashboard', 'sidebar_stats_api'], repeat=1, warmup=0,
+                output=path, stdout=StringIO(), stderr=StringIO()
+            )
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+
+        self.assertEqual(report['dataset']['customers'], 40)
+        self.assertEqual([item['name'] for item in report['results']], ['dashboard', 'sidebar_stats_api'])
+        self.assertTrue(all(item['status'] == 200 for item in report['results']))
+
+
+@override_settings(CACHES=TEST_CACHES, BOARD_SNAPSHOT_FRESHNESS=0)
+class TeamDashboardTest(TestCase):
+    """팀장 대시보드 상담원별 집계 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=cls.manager, role='manager', team='영업1팀')
+        cls.customer = Customer.objects.create(name='고객', phone='010-5555-6666', vehicle_number='90마1234')
+
+    def add_agents(self, count):
+        agents = []
+        for i in range(count):
+            agent = User.objects.create_user(username=f'agent{User.objects.count()}', password='pw1234')
+            UserProfile.objects.create(user=agent, role='agent', team='영업1팀', daily_call_target=10)
+            with self.captureOnCommitCallbacks(execute=True):
+                for result in ['connected', 'no_answer']:
+                    CallRecord.objects.create(
+                        customer=self.customer,
+                        caller=agent,
+                        call_result=result,
+                        interest_type='insurance' if result == 'connected' else None,
+                        requires_follow_up=result == 'connected',
+                    )
+            agents.append(agent)
+        return agents
+
+    def get_board(self):
+        self.client.force_login(self.manager)
+        with CaptureQueriesContext(connection) as queries:
+            # 기간은 현지 날짜로 지정
+            local_today = timezone.localdate().isoformat()
+            response = self.client.get(reverse('team_dashboard'), {'date_from': local_today, 'date_to': local_today})
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_agent_metrics(self):
+        agent = self.add_agents(1)[0]
+        response, _ = self.get_board()
+
+        performance = next(p for p in response.context['agent_performances'] if p['agent'] == agent)
+        self.assertEqual(performance['total_calls'], 2)
+        self.assertEqual(performance['connected_calls'], 1)
+        self.assertEqual(performance['interested_calls'], 1)
+        self.assertEqual(performance['followup_required'], 1)
+        self.assertEqual(performance['success_rate'], 50.0)
+
+    def test_query_count_independent_of_team_size(self):
+        self.add_agents(2)
+        _, small_team = self.get_board()
+        self.add_agents(8)
+        _, large_team = self.get_board()
+        self.assertEqual(small_team, large_team)
+
+
+@override_settings(CACHES=TEST_CACHES, BOARD_SNAPSHOT_FRESHNESS=0)
+class TeamPerformanceTest(TestCase):
+    """팀별 성과 집계 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin1', password='pw1234')
+        UserProfile.objects.create(user=cls.admin, role='admin')
+        cls.customers = [
+            Customer.objects.create(name=f'고객{i}', phone=f'010-4444-000{i}', vehicle_number=f'12가000{i}')
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+
+    def add_team(self, name, agent_count=2):
+        for i in range(agent_count):
+            agent = User.objects.create_user(username=f'{name}-{i}', password='pw1234')
+            UserProfile.objects.create(
+                user=agent, role='manager' if i == 0 else 'agent', team=name, daily_call_target=10
+            )
+            for customer in self.customers:
+                CallRecord.objects.create(
+                    customer=customer,
+                    caller=agent,
+                    call_result='connected',
+                    interest_type='insurance',
+                    requires_follow_up=True,
+                )
+
+    def get_admin_board(self):
+        self.client.force_login(self.admin)
+        local_today = timezone.localdate().isoformat()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin_dashboard'), {'date_from': local_today, 'date_to': local_today})
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_team_metrics(self):
+        self.add_team('영업1팀', agent_count=3)
+        today = timezone.localdate()
+        with self.assertNumQueries(2):
+            metrics = team_metrics(['영업1팀', '빈팀'], today, today)
+
+        team = metrics['영업1팀']
+        self.assertEqual(team['agent_count'], 3)
+        self.assertEqual(team['daily_target'], 30)
+        self.assertEqual(team['manager'].username, '영업1팀-0')
+        self.assertEqual(team['total_calls'], 6)
+        self.assertEqual(team['followup_required'], 6)
+        # 같은 고객에게 여러 상담원이 통화해도 관심 고객은 한 번만 센다
+        self.assertEqual(team['interested_customers'], 2)
+        self.assertEqual(metrics['빈팀']['total_calls'], 0)
+
+    def test_admin_board_query_count_independent_of_team_count(self):
+        for i in range(2):
+            self.add_team(f'영업{i}팀')
+        self.get_admin_board()  # 사이드바 통계 캐시 예열
+        response, few_teams = self.get_admin_board()
+        self.assertEqual(len(response.context['team_performances']), 2)
+
+        for i in range(2, 8):
+            self.add_team(f'영업{i}팀')
+        response, many_teams = self.get_admin_board()
+        self.assertEqual(len(response.context['team_performances']), 8)
+        self.assertEqual(few_teams, many_teams)
+
+        team = response.context['team_performances'][0]
+        self.assertEqual(team['total_calls'], 4)
+        self.assertEqual(team['achievement_rate'], 20.0)
+
+    def test_team_performance_api_batched_and_conditional(self):
+        self.add_team('영업1팀', agent_count=2)
+        self.client.force_login(self.admin)
+        url = reverse('team_performance_api')
+        params = {'team': '영업1팀', 'date': timezone.localdate().isoformat()}
+
+        with CaptureQueriesContext(connection) as small_team:
+            response = self.client.get(url, params)
+        for i in range(2, 6):
+            agent = User.objects.create_user(username=f'extra-{i}', password='pw1234')
+            UserProfile.objects.create(user=agent, role='agent', team='영업1팀')
+        with CaptureQueriesContext(connection) as large_team:
+            response = self.client.get(url, params)
+        self.assertEqual(len(small_team), len(large_team))
+
+        data = {row['name']: row for row in response.json()['data']}
+        self.assertEqual(len(data), 6)
+        self.assertEqual(data['영업1팀-0']['total_calls'], 2)
+        self.assertEqual(data['영업1팀-0']['connected'], 2)
+        self.assertEqual(data['영업1팀-0']['status'], 'online')
+        self.assertIsNotNone(data['영업1팀-0']['last_call'])
+        self.assertEqual(data['extra-2']['status'], 'offline')
+        self.assertIsNone(data['extra-2']['last_call'])
+
+        # 변경이 없으면 본문 없이 304
+        unchanged = self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.content, b'')
+
+        CallRecord.objects.create(customer=self.customers[0], caller=User.objects.get(username='extra-2'))
+        changed = self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+
+
+@override_settings(CACHES=TEST_CACHES, BUSINESS_HOURS=(9, 19))
+class CallDistributionTest(TestCase):
+    """시간대별 통화 분포 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.day = timezone.localdate() - timedelta(days=1)
+        cls.manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=cls.manager, role='manager', team='영업1팀')
+        cls.other = User.objects.create_user(username='agent1', password='pw1234')
+        customer = Customer.objects.create(name='고객', phone='010-6666-7777', vehicle_number='12바3456')
+
+        def at(hour, minute, caller):
+            call_date = timezone.make_aware(datetime.combine(cls.day, datetime.min.time()).replace(hour=hour, minute=minute))
+            CallRecord.objects.create(customer=customer, caller=caller, call_result='connected', call_date=call_date)
+
+        at(10, 15, cls.manager)
+        at(10, 45, cls.manager)
+        at(20, 0, cls.manager)
+        at(11, 0, cls.other)
+
+    def test_hourly_distribution_in_one_query(self):
+        with self.assertNumQueries(1):
+            distribution = call_distribution(self.day, self.day, caller_ids=[self.manager.id])
+
+        buckets = {bucket['hour']: bucket for bucket in distribution['buckets']}
+        self.assertEqual(len(buckets), 10)
+        self.assertEqual(buckets['10:00']['count'], 2)
+        self.assertEqual(buckets['10:00']['percentage'], 100.0)
+        self.assertEqual(buckets['11:00']['count'], 0)
+        self.assertEqual(distribution['total'], 3)
+        self.assertEqual(distribution['outside_hours'], 1)
+
+    def test_half_hour_api(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('call_distribution_api'), {
+            'date_from': self.day.isoformat(), 'interval': 30, 'start_hour': 10, 'end_hour': 12,
+        })
+        data = response.json()
+        self.assertEqual([bucket['count'] for bucket in data['data']], [1, 1, 1, 0])
+        self.assertEqual(data['outside_hours'], 1)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CallTimeSeriesTest(TestCase):
+    """일/주/월별 통화 추이 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = User.objects.create_user(username='agent1', password='pw1234')
+        UserProfile.objects.create(user=cls.agent, role='manager', team='영업1팀')
+        customer = Customer.objects.create(name='고객', phone='010-7777-8888', vehicle_number='34사5678')
+        cls.days = [timezone.localdate() - timedelta(days=n) for n in (1, 2, 2, 40)]
+        # 상담원 일별 집계는 커밋 후 갱신
+        with cls.captureOnCommitCallbacks(execute=True):
+            for i, day in enumerate(cls.days):
+                CallRecord.objects.create(
+                    customer=customer,
+                    caller=cls.agent,
+                    call_result='connected' if i % 2 == 0 else 'no_answer',
+                    interest_type='maintenance' if i == 0 else None,
+                    call_date=timezone.make_aware(datetime.combine(day, datetime.min.time()).replace(hour=10)),
+                )
+
+    def test_daily_series_fills_gaps(self):
+        date_from = timezone.localdate() - timedelta(days=3)
+        date_to = timezone.localdate() - timedelta(days=1)
+        with self.assertNumQueries(1):
+            series = call_time_series(date_from, date_to, caller_ids=[self.agent.id])
+
+        self.assertEqual([row['date'] for row in series], [date_from + timedelta(days=n) for n in range(3)])
+        self.assertEqual([row['total'] for row in series], [0, 2, 1])
+        self.assertEqual(series[2]['interested'], 1)
+        self.assertEqual(series[1]['connected'], 1)
+
+    def test_weekly_and_monthly_totals(self):
+        date_from = timezone.localdate() - timedelta(days=60)
+        date_to = timezone.localdate()
+        for period in ['week', 'month']:
+            series = call_time_series(date_from, date_to, period=period)
+            self.assertEqual(sum(row['total'] for row in series), 4)
+
+    def test_agent_api_query_count_constant(self):
+        self.client.force_login(self.agent)
+        url = reverse('agent_performance_api', args=[self.agent.id])
+        with CaptureQueriesContext(connection) as week:
+            self.client.get(url, {'days': 7})
+        with CaptureQueriesContext(connection) as year:
+            response = self.client.get(url, {'days': 365})
+        self.assertEqual(len(week), len(year))
+        self.assertEqual(len(response.json()['daily_data']), 365)
+        # API 기간: 오늘 제외 최근 365일
+        self.assertEqual(sum(row['total'] for row in response.json()['daily_data']), 4)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class AgentDailyStatsTest(TestCase):
+    """상담원 일별 집계 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = User.objects.create_user(username='agent1', password='pw1234')
+        UserProfile.objects.create(user=cls.agent, role='agent', team='영업1팀')
+        cls.customer = Customer.objects.create(name='고객', phone='010-1212-3434', vehicle_number='56아7890')
+        cls.day = timezone.localdate() - timedelta(days=1)
+        cls.call_date = timezone.make_aware(datetime.combine(cls.day, datetime.min.time()).replace(hour=11))
+
+    def make_call(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CallRecord.objects.create(
+                customer=self.customer, caller=self.agent, call_date=self.call_date, **kwargs
+            )
+
+    def stats(self):
+        return AgentDailyStats.objects.get(caller=self.agent, stat_date=self.day)
+
+    def test_maintained_on_save_and_soft_delete(self):
+        first = self.make_call(call_result='connected', interest_type='insurance', requires_follow_up=True)
+        self.make_call(call_result='no_answer')
+
+        stats = self.stats()
+        self.assertEqual(stats.total_calls, 2)
+        self.assertEqual(stats.connected_calls, 1)
+        self.assertEqual(stats.no_answer_calls, 1)
+        self.assertEqual(stats.interest_insurance_calls, 1)
+        self.assertEqual(stats.followup_required, 1)
+        self.assertEqual(stats.followup_completed, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CallRecord.objects.filter(id=first.id).update(follow_up_completed=True)
+            refresh_stats_for_calls(CallRecord.objects.filter(id=first.id))
+        self.assertEqual(self.stats().followup_completed, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.soft_delete(self.agent)
+        self.assertEqual(self.stats().total_calls, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            CallRecord.objects.get(call_result='no_answer').delete()
+        self.assertFalse(AgentDailyStats.objects.filter(caller=self.agent).exists())
+
+    def test_refreshed_once_per_transaction(self):
+        from unittest import mock
+        from . import rollups
+
+        with mock.patch.object(rollups, 'refresh_agent_daily_stats', wraps=rollups.refresh_agent_daily_stats) as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                for result in ['connected', 'busy', 'connected']:
+                    CallRecord.objects.create(
+                        customer=self.customer, caller=self.agent, call_date=self.call_date, call_result=result
+                    )
+                # 커밋 전에는 재계산하지 않는다
+                self.assertEqual(refresh.call_count, 0)
+        refresh.assert_called_once_with(self.agent.id, self.day)
+        self.assertEqual(self.stats().total_calls, 3)
+
+    def test_happy_calls_refreshed_after_import(self):
+        self.make_call(call_result='connected')
+        self.assertEqual(self.stats().happy_call_3month_calls, 0)
+
+        # 업로드로 검사만료일이 바뀌어 통화한 날이 3개월콜 예정일이 됨
+        expiry = self.day + timedelta(days=730 - 90)
+        record = {'name': '고객', 'phone': '010-1212-3434', 'vehicle_number': '56아7890', 'inspection_expiry_date': expiry}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(import_customers([record], timezone.localdate()), (0, 1, 0))
+        self.assertEqual(Customer.objects.get().happy_call_3month_date, self.day)
+        self.assertEqual(self.stats().happy_call_3month_calls, 1)
+
+    def test_rebuild_matches_incremental(self):
+        for result in ['connected', 'busy', 'connected']:
+            self.make_call(call_result=result, interest_type='maintenance')
+        incremental = AgentDailyStats.objects.values().get(caller=self.agent)
+
+        AgentDailyStats.objects.all().delete()
+        self.assertEqual(rebuild_agent_daily_stats(), 1)
+        rebuilt = AgentDailyStats.objects.values().get(caller=self.agent)
+        for field in ['id', 'updated_at']:
+            incremental.pop(field)
+            rebuilt.pop(field)
+        self.assertEqual(incremental, rebuilt)
+
+    def test_reports_read_rollup(self):
+        self.make_call(call_result='connected', interest_type='financing')
+        # 집계 테이블만 읽는지 확인: 원본을 건드리지 않고 집계 값만 바꾼다
+        AgentDailyStats.objects.filter(caller=self.agent).update(total_calls=10)
+        series = call_time_series(self.day, self.day, caller_ids=[self.agent.id])
+        self.assertEqual(series[0]['total'], 10)
+        self.assertEqual(series[0]['interested'], 1)
+
+
+@override_settings(CACHES=TEST_CACHES, BOARD_SNAPSHOT_FRESHNESS=0)
+class PresenceTest(TestCase):
+    """상담원 접속 상태 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=cls.manager, role='manager', team='영업1팀')
+        cls.agent = User.objects.create_user(username='agent1', password='pw1234')
+        UserProfile.objects.create(user=cls.agent, role='agent', team='영업1팀')
+
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+
+    def test_status_uses_total_elapsed_time(self):
+        now = timezone.now()
+        self.assertEqual(presence_status(now - timedelta(seconds=ONLINE_WINDOW - 1), now), 'online')
+        self.assertEqual(presence_status(now - timedelta(seconds=ONLINE_WINDOW + 1), now), 'idle')
+        # 하루 이상 지난 활동은 timedelta.seconds 로는 몇 초로 보이지만 offline 이어야 한다
+        self.assertEqual(presence_status(now - timedelta(days=1, seconds=10), now), 'offline')
+        self.assertEqual(presence_status(None, now), 'offline')
+        self.assertLess(ONLINE_WINDOW, PRESENCE_TTL)
+
+    def test_heartbeat_and_call_write_mark_online(self):
+        self.assertEqual(get_presence([self.agent.id])[self.agent.id]['status'], 'offline')
+
+        self.client.force_login(self.agent)
+        self.assertEqual(self.client.get(reverse('presence_heartbeat')).status_code, 405)
+        self.assertEqual(self.client.post(reverse('presence_heartbeat')).status_code, 200)
+        self.assertEqual(get_presence([self.agent.id])[self.agent.id]['status'], 'online')
+
+        # 통화 기록 저장도 활동으로 기록
+        self.assertEqual(get_presence([self.manager.id])[self.manager.id]['status'], 'offline')
+        customer = Customer.objects.create(name='고객', phone='010-3030-4040', vehicle_number='78자9012')
+        CallRecord.objects.create(customer=customer, caller=self.manager)
+        self.assertEqual(get_presence([self.manager.id])[self.manager.id]['status'], 'online')
+
+    def test_team_dashboard_reads_presence(self):
+        # 오래 전 통화 기록이 있어도 활동 기록이 없으면 offline
+        touch(self.manager.id, timezone.now() - timedelta(seconds=ONLINE_WINDOW + 60))
+        self.client.force_login(self.manager)
+        local_today = timezone.localdate().isoformat()
+        response = self.client.get(reverse('team_dashboard'), {'date_from': local_today, 'date_to': local_today})
+
+        statuses = {p['agent'].username: p['status'] for p in response.context['agent_performances']}
+        self.assertEqual(statuses, {'manager1': 'idle', 'agent1': 'offline'})
+        self.assertEqual(response.context['team_stats']['active_agents'], 1)
+
+
+class LocalDayQuerySetTest(TestCase):
+    """현지 날짜 기간 조건 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = User.objects.create_user(username='agent1', password='pw1234')
+        customer = Customer.objects.create(name='고객', phone='010-6060-7070', vehicle_number='12하3456')
+        cls.day = timezone.localdate() - timedelta(days=3)
+        midnight = timezone.make_aware(datetime.combine(cls.day, datetime.min.time()))
+        # 현지 자정 직전/직후 (UTC 기준으로는 같은 날)
+        for call_date in [midnight - timedelta(seconds=1), midnight, midnight + timedelta(hours=23, minutes=59)]:
+            CallRecord.objects.create(customer=customer, caller=cls.agent, call_date=call_date)
+
+    def test_matches_local_date(self):
+        self.assertEqual(CallRecord.objects.on_local_day(self.day).count(), 2)
+        self.assertEqual(CallRecord.objects.on_local_day(self.day - timedelta(days=1)).count(), 1)
+        self.assertEqual(CallRecord.objects.between_local_days(self.day - timedelta(days=1), self.day).count(), 3)
+        self.assertEqual(CallRecord.objects.between_local_days(date_from=self.day).count(), 2)
+        self.assertEqual(CallRecord.objects.between_local_days(date_to=self.day - timedelta(days=1)).count(), 1)
+        for day in [self.day, self.day - timedelta(days=1)]:
+            self.assertEqual(
+                CallRecord.objects.on_local_day(day).count(),
+                CallRecord.objects.filter(call_date__date=day).count()
+            )
+
+    def test_uses_index_range(self):
+        sql = str(CallRecord.objects.on_local_day(self.day).query)
+        self.assertNotIn('django_datetime_cast_date', sql)
+        self.assertIn('"call_date" >=', sql)
+
+
+class CustomerSearchTest(TestCase):
+    """고객 검색 색인 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=cls.manager, role='manager', team='영업1팀')
+        cls.kim = Customer.objects.create(name='김철수', phone='010-1234-5678', vehicle_number='12가3456')
+        cls.lee = Customer.objects.create(name='이영희', phone='010-9876-5432', vehicle_number='78나9012')
+
+    def search(self, query, queryset=None):
+        return set(search_customers(queryset or Customer.objects.all(), query).values_list('name', flat=True))
+
+    def test_matches_like_icontains(self):
+        for query in ['김', '철수', '김철수', '1234-5', '3456', '78나', 'ABC', '']:
+            expected = set(
+                Customer.objects.filter(
+                    Q(name__icontains=query) | Q(phone__icontains=query) | Q(vehicle_number__icontains=query)
+                ).values_list('name', flat=True)
+            )
+            self.assertEqual(self.search(query), expected, query)
+        self.assertTrue(uses_index('1234-5'))
+
+    def test_index_follows_saves_and_bulk_writes(self):
+        self.lee.phone = '010-5555-0000'
+        self.lee.save()
+        self.assertEqual(self.search('9876'), set())
+        self.assertEqual(self.search('5555-0'), {'이영희'})
+
+        Customer.objects.bulk_create([Customer(name='박민수', phone='010-2222-3333', vehicle_number='34다5678')])
+        self.assertEqual(self.search('2222-3'), {'박민수'})
+        Customer.objects.filter(name='박민수').update(vehicle_number='99라0000')
+        self.assertEqual(self.search('99라0'), {'박민수'})
+        Customer.objects.filter(name='박민수').delete()
+        self.assertEqual(self.search('99라0'), set())
+
+    def test_views_use_search(self):
+        CallRecord.objects.create(customer=self.kim, caller=self.manager, call_result='connected')
+        CallRecord.objects.create(customer=self.lee, caller=self.manager, call_result='connected')
+        self.client.force_login(self.manager)
+
+        response = self.client.get(reverse('customer_list'), {'search': '12가34'})
+        self.assertEqual([c.name for c in response.context['customers']], ['김철수'])
+        response = self.client.get(reverse('call_records'), {'search': '9876-5'})
+        self.assertEqual([r.customer.name for r in response.context['records']], ['이영희'])
+
+    def test_phone_digit_search(self):
+        Customer.objects.create(name='최유선', phone='010-3333-4444', landline='02-555-7777', vehicle_number='56마7890')
+        # 끝자리 / 하이픈 없는 번호 / 공백 구분 / 중간 일치 / 유선 전화
+        self.assertEqual(self.search('5678'), {'김철수'})
+        self.assertEqual(self.search('01012345678'), {'김철수'})
+        self.assertEqual(self.search('1234 5678'), {'김철수'})
+        self.assertEqual(self.search('10123'), {'김철수'})
+        self.assertEqual(self.search('5557777'), {'최유선'})
+        self.assertEqual(self.search('77'), {'최유선'})
+        # 짧은 끝자리 검색도 차량번호 부분 일치는 유지
+        self.assertEqual(self.search('56'), {'최유선', '김철수'})
+
+    def test_phone_digits_maintained(self):
+        self.assertEqual(self.kim.phone_digits, '01012345678')
+        self.assertEqual(self.kim.phone_digits_reversed, '87654321010')
+        self.kim.phone = '010-4321-0000'
+        self.kim.save(update_fields=['phone'])
+        self.kim.refresh_from_db()
+        self.assertEqual(self.kim.phone_digits, '01043210000')
+        self.assertEqual(self.search('0000'), {'김철수'})
+
+        sql = str(search_customers(Customer.objects.all(), '5678').query)
+        self.assertIn('"phone_digits_reversed" >= 8765', sql)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class KeysetPaginationTest(TestCase):
+    """키셋 페이지네이션 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=cls.manager, role='manager', team='영업1팀')
+        base = timezone.localdate()
+        # 같은 정렬 값과 NULL 이 섞인 고객
+        for i in range(11):
+            expiry = None if i % 4 == 0 else base + timedelta(days=i % 3)
+            Customer.objects.create(
+                name=f'고객{i}', phone=f'010-0000-{i:04d}', vehicle_number=f'{i:02d}가0000',
+                inspection_expiry_date=expiry, visit_count=i % 2,
+            )
+
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+        self.factory = RequestFactory()
+
+    def paginate(self, ordering, cursor=None, queryset=None, **kwargs):
+        params = {CURSOR_PARAM: cursor} if cursor else {}
+        queryset = Customer.objects.all() if queryset is None else queryset
+        return keyset_paginate(self.factory.get('/', params), queryset, ordering, per_page=3, **kwargs)
+
+    def test_walks_forward_and_backward(self):
+        for ordering, nulls_last in [
+            (['actual_inspection_date', 'inspection_expiry_date'], True),
+            (['actual_inspection_date', 'inspection_expiry_date'], False),
+            (['-visit_count'], True),
+        ]:
+            page = self.paginate(ordering, nulls_last=nulls_last)
+            pages = [[c.id for c in page]]
+            while page.has_next:
+                page = self.paginate(ordering, page.next_cursor, nulls_last=nulls_last)
+                pages.append([c.id for c in page])
+            seen = [customer_id for ids in pages for customer_id in ids]
+            self.assertEqual(len(seen), 11)
+            self.assertEqual(len(set(seen)), 11)
+
+            # 뒤로 이동하면 같은 페이지가 역순으로 나온다
+            for expected in reversed(pages[:-1]):
+                page = self.paginate(ordering, page.previous_cursor, nulls_last=nulls_last)
+                self.assertEqual([c.id for c in page], expected)
+            self.assertFalse(page.has_previous)
+
+    def test_inspection_sort_uses_index(self):
+        expressions = inspection_sort_annotations()
+        queryset = Customer.objects.annotate(**expressions)
+        ordering = list(expressions)
+
+        # NULLS LAST 정렬과 같은 순서
+        expected = list(Customer.objects.order_by(
+            F('actual_inspection_date').asc(nulls_last=True),
+            F('inspection_expiry_date').asc(nulls_last=True), 'id',
+        ).values_list('id', flat=True))
+        page = self.paginate(ordering, queryset=queryset)
+        seen = [c.id for c in page]
+        while page.has_next:
+            page = self.paginate(ordering, page.next_cursor, queryset=queryset)
+            seen += [c.id for c in page]
+        self.assertEqual(seen, expected)
+
+        # 다음/이전 페이지 쿼리 모두 정렬 인덱스 범위 탐색 (임시 정렬 없음)
+        for cursor in (page.previous_cursor, self.paginate(ordering, queryset=queryset).next_cursor):
+            with CaptureQueriesContext(connection) as queries:
+                self.paginate(ordering, cursor, queryset=queryset, with_total=False)
+            with connection.cursor() as cursor_:
+                cursor_.execute(f'EXPLAIN QUERY PLAN {queries.captured_queries[-1]["sql"]}')
+                plan = ' '.join(row[-1] for row in cursor_.fetchall())
+            self.assertIn('customer_inspection_sort_idx', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_invalid_cursor_is_first_page(self):
+        first = self.paginate(['name'])
+        page = self.paginate(['name'], 'tampered')
+        self.assertEqual([c.id for c in page], [c.id for c in first])
+        self.assertFalse(page.has_previous)
+
+    def test_deep_page_query_count(self):
+        page = self.paginate(['name'], with_total=False)
+        with self.assertNumQueries(1):
+            self.paginate(['name'], with_total=False)
+        while page.has_next:
+            page = self.paginate(['name'], page.next_cursor, with_total=False)
+        with self.assertNumQueries(1):
+            self.paginate(['name'], page.previous_cursor, with_total=False)
+
+    def test_count_modes(self):
+        queryset = Customer.objects.all()
+        with self.settings(LIST_COUNT_MODE='capped', LIST_COUNT_CAP=5):
+            self.assertEqual(list_count(queryset), (5, True))
+            page = self.paginate(['name'])
+            self.assertEqual(page.total_display, '5+')
+        with self.settings(LIST_COUNT_MODE='cached'):
+            self.assertEqual(list_count(queryset), (11, False))
+            with self.assertNumQueries(0):
+                self.assertEqual(list_count(queryset), (11, False))
+
+            # 고객이 바뀌면 캐시된 건수를 버리고 다시 센다
+            with self.captureOnCommitCallbacks(execute=True):
+                Customer.objects.create(name='추가 고객', phone='010-9999-0000', vehicle_number='99가9999')
+            self.assertEqual(list_count(queryset), (12, False))
+
+    def test_views_paginate(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('customer_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['customers'].total, 11)
+
+        for i in range(3):
+            CallRecord.objects.create(customer=Customer.objects.get(name=f'고객{i}'), caller=self.manager, call_result='connected')
+        response = self.client.get(reverse('call_records'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['records'].total, 3)
+
+        for sort in ['oldest', 'visit', 'name', 'priority']:
+            response = self.client.get(reverse('call_assignment'), {'sort': sort})
+            self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CustomerVisibilityTest(TestCase):
+    """상담원 조회 가능 고객 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=cls.manager, role='manager', team='영업1팀')
+        cls.agent = User.objects.create_user(username='agent1', password='pw1234')
+        UserProfile.objects.create(user=cls.agent, role='agent', team='영업1팀')
+        cls.kim = Customer.objects.create(name='김철수', phone='010-1234-5678', vehicle_number='12가3456')
+        cls.lee = Customer.objects.create(name='이영희', phone='010-9876-5432', vehicle_number='78나9012')
+        Customer.objects.create(name='박민수', phone='010-2222-3333', vehicle_number='34다5678')
+
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+
+    def visible(self):
+        return set(visible_customers(self.agent).values_list('name', flat=True))
+
+    def expected(self):
+        return set(Customer.objects.filter(
+            Q(id__in=CallAssignment.objects.filter(
+                assigned_to=self.agent, status__in=['pending', 'in_progress']
+            ).values('customer_id')) |
+            Q(call_records__caller=self.agent)
+        ).distinct().values_list('name', flat=True))
+
+    def test_follows_assignments_and_calls(self):
+        assignment = CallAssignment.objects.create(customer=self.kim, assigned_to=self.agent, assigned_by=self.manager)
+        self.assertEqual(self.visible(), {'김철수'})
+
+        call = CallRecord.objects.create(customer=self.lee, caller=self.agent, call_result='connected')
+        CallRecord.objects.create(customer=self.lee, caller=self.agent, call_result='no_answer')
+        self.assertEqual(self.visible(), {'김철수', '이영희'})
+        self.assertEqual(CustomerVisibility.objects.filter(agent=self.agent).count(), 2)
+
+        assignment.status = 'cancelled'
+        assignment.save()
+        self.assertEqual(self.visible(), {'이영희'})
+
+        call.delete()
+        self.assertEqual(self.visible(), {'이영희'})
+        CallRecord.objects.filter(customer=self.lee).delete()
+        self.assertEqual(self.visible(), self.expected())
+        self.assertEqual(self.visible(), set())
+
+    def test_rebuild_matches_signals(self):
+        CallAssignment.objects.create(customer=self.kim, assigned_to=self.agent, assigned_by=self.manager)
+        CallRecord.objects.create(customer=self.kim, caller=self.agent, call_result='connected')
+        CallRecord.objects.create(customer=self.lee, caller=self.agent, call_result='busy')
+        rows = set(CustomerVisibility.objects.values_list('agent_id', 'customer_id', 'is_assigned', 'has_called'))
+
+        self.assertEqual(rebuild_customer_visibility(), 2)
+        self.assertEqual(
+            set(CustomerVisibility.objects.values_list('agent_id', 'customer_id', 'is_assigned', 'has_called')), rows
+        )
+        self.assertEqual(self.visible(), self.expected())
+
+    def test_agent_customer_list(self):
+        CallAssignment.objects.create(customer=self.kim, assigned_to=self.agent, assigned_by=self.manager)
+        for _ in range(3):
+            CallRecord.objects.create(customer=self.lee, caller=self.agent, call_result='connected')
+        self.client.force_login(self.agent)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('customer_list'))
+        self.assertEqual({c.name for c in response.context['customers']}, {'김철수', '이영희'})
+        customer_queries = [q['sql'] for q in queries if 'crm_customervisibility' in q['sql']]
+        self.assertTrue(customer_queries)
+        for sql in customer_queries:
+            self.assertNotIn('DISTINCT', sql)
+            self.assertNotIn('crm_callrecord', sql)
+
+
+class UploadCleaningTest(TestCase):
+    """업로드 파일 열 단위 정제 테스트"""
+
+    def frame(self):
+        return pd.DataFrame({
+            '고객명': [' 김철수 ', '이영희', '박민수', None, '최유선', '정하나'],
+            '휴대전화': ['01012345678', '010-9876-5432', '0111234567', '010-1111-2222', '', '02 555 1234'],
+            '차량번호': ['12가3456', '78나9012', '34다5678', '56라7890', '90마1234', '11바2222'],
+            '검사만료일': ['2025-03-01', ' 2025/3/2 ', '20250303', '2025.03.04', None, datetime(2025, 3, 5, 14, 30)],
+            '보험만기일': ['05-03-2025', '06/03/2025', 'bad', None, None, None],
+            '고객등급': ['VIP', ' 정회원 ', '신규', '준회원', 'x', None],
+            '방문수': [3, None, '2', 1, 1, 'x'],
+        })
+
+    def test_clean_customer_frame(self):
+        cleaned, error_count = clean_customer_frame(self.frame())
+        self.assertEqual(error_count, 2)
+        records = customer_records(cleaned)
+        self.assertEqual([r['name'] for r in records], ['김철수', '이영희', '박민수', '정하나'])
+        self.assertEqual(
+            [r['phone'] for r in records],
+            ['010-1234-5678', '010-9876-5432', '001-1123-4567', '025551234']
+        )
+        self.assertEqual(
+            [r['inspection_expiry_date'] for r in records],
+            [date(2025, 3, 1), date(2025, 3, 2), date(2025, 3, 3), date(2025, 3, 5)]
+        )
+        self.assertEqual(
+            [r['insurance_expiry_date'] for r in records],
+            [date(2025, 3, 5), date(2025, 3, 6), None, None]
+        )
+        self.assertEqual([r['customer_grade'] for r in records], ['vip', 'regular', 'new', ''])
+        self.assertEqual([r['visit_count'] for r in records], [3, 0, 2, 0])
+        self.assertEqual(records[0]['vehicle_name'], '')
+
+    def test_float_text_columns(self):
+        frame = self.frame()
+        frame['모델명'] = [2.0, 3.5, None, 4.0, 1.0, 2.25]
+        frame['차량명'] = [2.0, None, 3.0, 4.0, 1.0, 5.0]
+        cleaned, _ = clean_customer_frame(frame)
+        records = customer_records(cleaned)
+        # 소수가 섞인 열은 값 그대로, 정수만 있는 열은 '.0' 없이
+        self.assertEqual([r['vehicle_model'] for r in records], ['2.0', '3.5', '', '2.25'])
+        self.assertEqual([r['vehicle_name'] for r in records], ['2', '', '3', '5'])
+
+    def test_upload_data_view(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=manager, role='manager', team='영업1팀')
+        self.client.force_login(manager)
+
+        content = self.frame().to_csv(index=False).encode('utf-8')
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            response = self.client.post(reverse('upload_data'), {
+                'file': SimpleUploadedFile('customers.csv', content, content_type='text/csv'),
+                'data_extract_date': '2025-01-01',
+            })
+            self.assertEqual(response.status_code, 302)
+            # 업로드는 작업 등록만 하고 워커가 처리
+            self.assertEqual(Customer.objects.count(), 0)
+            call_command('run_import_jobs', '--once', stdout=StringIO())
+        kim = Customer.objects.get(phone='010-1234-5678', vehicle_number='12가3456')
+        self.assertEqual(kim.name, '김철수')
+        self.assertEqual(kim.inspection_expiry_date, date(2025, 3, 1))
+        self.assertEqual(kim.customer_grade, 'vip')
+        self.assertEqual(Customer.objects.count(), 4)
+        history = UploadHistory.objects.get()
+        self.assertEqual((history.new_records, history.error_count), (4, 2))
+
+
+class CustomerImportTest(TestCase):
+    """고객 배치 upsert 테스트"""
+
+    def record(self, phone, vehicle_number, **values):
+        record = {
+            'name': '김철수', 'phone': phone, 'vehicle_number': vehicle_number,
+            'vehicle_name': '', 'vehicle_model': '', 'address': '',
+            'inspection_expiry_date': timezone.localdate() - timedelta(days=30),
+            'insurance_expiry_date': None, 'vehicle_registration_date': None,
+            'customer_grade': 'vip', 'visit_count': 4,
+        }
+        record.update(values)
+        return record
+
+    def test_matches_update_or_create(self):
+        extract_date = timezone.localdate()
+        for phone in ['010-1111-0000', '010-2222-0000']:
+            Customer.objects.create(
+                name='이전', phone=phone, vehicle_number='12가3456', priority='low',
+                needs_6month_call=True, status='contacted', last_inspection_completed=date(2020, 1, 1),
+            )
+
+        # 기존 방식: 행마다 update_or_create + save
+        record = self.record('010-1111-0000', '12가3456', name='김철수')
+        expected, _ = Customer.objects.update_or_create(phone=record['phone'], vehicle_number='12가3456', defaults=record)
+        expected.calculate_inspection_date(extract_date)
+        expected.update_priority_tags()
+        expected.save()
+
+        # 조회 1회 + upsert 1회 (배치 세이브포인트 2회) + 해피콜 예정일이 바뀐 고객의 통화 조회 1회
+        with self.assertNumQueries(5):
+            counts = import_customers([self.record('010-2222-0000', '12가3456', name='김철수')], extract_date)
+        self.assertEqual(counts, (0, 1, 0))
+
+        ignored = {'id', 'phone', 'phone_digits', 'phone_digits_reversed', 'created_at', 'updated_at'}
+        expected = Customer.objects.filter(pk=expected.pk).values().get()
+        actual = Customer.objects.filter(phone='010-2222-0000').values().get()
+        for field, value in expected.items():
+            if field not in ignored:
+                self.assertEqual(actual[field], value, field)
+        self.assertEqual(actual['phone_digits'], '01022220000')
+
+    def test_counts_and_search_index(self):
+        records = [
+            self.record('010-1234-5678', '12가3456'),
+            self.record('010-1234-5678', '78나9012', name='이영희'),
+            self.record('010-1234-5678', '12가3456', visit_count=1),
+        ]
+        self.assertEqual(import_customers(records, batch_size=2), (2, 1, 0))
+        self.assertEqual(Customer.objects.count(), 2)
+        self.assertEqual(Customer.objects.get(vehicle_number='12가3456').visit_count, 1)
+        self.assertEqual(import_customers(records[:2]), (0, 2, 0))
+
+        created = Customer.objects.get(vehicle_number='78나9012')
+        self.assertIsNotNone(created.created_at)
+        self.assertEqual(set(search_customers(Customer.objects.all(), '이영희')), {created})
+
+
+class TaggingParityTest(TestCase):
+    """열 단위 태그 계산이 모델 메서드와 같은지 행 단위 비교"""
+
+    def customers(self):
+        today = timezone.now().date()
+        expiry_offsets = [None, -2000, -1461, -1460, -800, -731, -730, -100, -1, 0, 1, 30, 90, 91, 400]
+        completed_offsets = [None, 10, 90, 179, 180, 364, 365, 539, 540, 729, 730, 1000]
+        customers = []
+        for index, expiry in enumerate(expiry_offsets):
+            for completed in completed_offsets:
+                for visit_count in [0, 1, 3]:
+                    customer = Customer(**new_customer_values())
+                    customer.inspection_expiry_date = today + timedelta(days=expiry) if expiry is not None else None
+                    customer.last_inspection_completed = today - timedelta(days=completed) if completed is not None else None
+                    customer.visit_count = visit_count
+                    customer.customer_grade = ['vip', 'regular', ''][index % 3]
+                    customer.priority = ['low', 'medium', 'high'][(index + visit_count) % 3]
+                    customer.is_active_customer = visit_count != 1
+                    customer.is_inspection_overdue = completed == 1000
+                    customer.needs_6month_call = completed == 10
+                    customers.append(customer)
+        return customers
+
+    def test_matches_model_methods(self):
+        extract_date = date(2024, 3, 1)
+        customers = self.customers()
+        frame = pd.DataFrame(
+            [{attname: getattr(customer, attname) for attname in ATTNAMES} for customer in customers],
+            columns=ATTNAMES, dtype=object,
+        )
+        apply_inspection_dates(frame, extract_date)
+        apply_priority_tags(frame)
+
+        for customer, row in zip(customers, frame.to_dict('records')):
+            customer.calculate_inspection_date(extract_date)
+            customer.update_priority_tags()
+            for attname in ATTNAMES:
+                expected = getattr(customer, attname)
+                self.assertEqual(row[attname], expected, (attname, customer.inspection_expiry_date, customer.last_inspection_completed))
+
+
+class StreamingImportTest(TestCase):
+    """청크 단위 업로드 테스트"""
+
+    def frame(self):
+        return pd.DataFrame({
+            '고객명': ['김철수', '이영희', None, '박민수', '최유선'],
+            '휴대전화': ['01012345678', '010-9876-5432', '010-1111-2222', '01055556666', '01012345678'],
+            '차량번호': ['12가3456', '78나9012', '56라7890', '34다5678', '12가3456'],
+            '검사만료일': ['2025-03-01', '2025/3/2', '2025-03-03', None, '2025-04-01'],
+            '고객등급': ['VIP', '정회원', '신규', '준회원', 'VIP'],
+            '방문수': [3, 1, 2, 1, 4],
+        })
+
+    def test_csv_chunks(self):
+        source = StringIO(self.frame().to_csv(index=False))
+        chunks = list(read_upload_chunks(source, 'customers.csv', chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+
+        progress = []
+        summary = stream_customer_import(chunks, date(2025, 1, 1), progress=lambda s: progress.append(s.total_rows))
+        self.assertEqual(progress, [2, 4, 5])
+        # 다른 청크의 같은 고객은 업데이트로 집계되고 마지막 값이 남는다
+        self.assertEqual(
+            (summary.total_rows, summary.new_count, summary.updated_count, summary.error_count),
+            (5, 3, 1, 1)
+        )
+        self.assertEqual(Customer.objects.count(), 3)
+        self.assertEqual(Customer.objects.get(vehicle_number='12가3456').inspection_expiry_date, date(2025, 4, 1))
+        self.assertGreater(summary.peak_memory, 0)
+        self.assertGreaterEqual(summary.peak_memory, summary.start_memory)
+
+    def test_xlsx_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'customers.xlsx')
+            frame = self.frame()
+            # 중간의 빈 행은 건너뛴다
+            frame = pd.concat([frame.iloc[:2], pd.DataFrame([{}]), frame.iloc[2:]], ignore_index=True)
+            frame.to_excel(path, sheet_name='고객', index=False)
+
+            chunks = list(read_upload_chunks(path, path, chunk_size=3))
+            self.assertEqual([len(chunk) for chunk in chunks], [3, 2])
+            summary = stream_customer_import(chunks, date(2025, 1, 1))
+
+        self.assertEqual((summary.new_count, summary.updated_count, summary.error_count), (3, 1, 1))
+        customer = Customer.objects.get(vehicle_number='78나9012')
+        self.assertEqual(customer.phone, '010-9876-5432')
+        self.assertEqual(customer.inspection_expiry_date, date(2025, 3, 2))
+        self.assertEqual(customer.customer_grade, 'regular')
+
+
+class ImportJobTest(TestCase):
+    """업로드 백그라운드 작업 테스트"""
+
+    def setUp(self):
+        from django.core.files.base import ContentFile
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        settings_override = self.settings(MEDIA_ROOT=self.media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.manager = User.objects.create_user(username='manager1', password='pw1234')
+        UserProfile.objects.create(user=self.manager, role='manager', team='영업1팀')
+        frame = pd.DataFrame({
+            '고객명': [f'고객{i}' for i in range(5)],
+            '휴대전화': [f'0101234000{i}' for i in range(5)],
+            '차량번호': [f'12가345{i}' for i in range(5)],
+            '검사만료일': ['2025-03-01'] * 5,
+        })
+        self.job = ImportJob(uploaded_by=self.manager, file_name='customers.csv', data_extract_date=date(2025, 1, 1))
+        self.job.file.save('customers.csv', ContentFile(frame.to_csv(index=False).encode('utf-8')))
+
+    def test_claim_is_exclusive(self):
+        job = claim_next_job()
+        self.assertEqual((job.pk, job.status, job.attempts), (self.job.pk, 'running', 1))
+        self.assertIsNone(claim_next_job())
+
+        # 하트비트가 끊긴 작업은 다시 가져갈 수 있다
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(claim_next_job().attempts, 2)
+
+    def test_run_and_status_api(self):
+        progress = []
+        run_import_job(claim_next_job(), chunk_size=2, progress=lambda job: progress.append(job.rows_parsed))
+        self.assertEqual(progress, [2, 4, 5])
+
+        job = ImportJob.objects.get()
+        self.assertEqual((job.status, job.total_rows, job.rows_parsed, job.new_records), ('completed', 5, 5, 5))
+        self.assertEqual(job.upload_history.new_records, 5)
+        self.assertFalse(job.file)
+        self.assertEqual(Customer.objects.count(), 5)
+
+        self.client.force_login(self.manager)
+        data = self.client.get(reverse('import_job_status_api', args=[job.pk])).json()
+        self.assertEqual((data['status'], data['progress'], data['rows_written']), ('completed', 100, 5))
+
+    def test_resumes_after_last_committed_chunk(self):
+        from unittest import mock
+        from .streaming import import_chunk
+
+        calls = []
+        fail_on = {2}
+
+        def recording_import_chunk(chunk, *args, **kwargs):
+            calls.append(list(chunk.index))
+            if len(calls) in fail_on:
+                raise RuntimeError('worker crashed')
+            return import_chunk(chunk, *args, **kwargs)
+
+        with mock.patch('crm.jobs.import_chunk', recording_import_chunk):
+            with self.assertRaises(RuntimeError):
+                run_import_job(claim_next_job(), chunk_size=2)
+
+            job = ImportJob.objects.get()
+            self.assertEqual((job.status, job.rows_parsed, job.new_records), ('failed', 2, 2))
+            self.assertEqual(Customer.objects.count(), 2)
+
+            retry_job(job)
+            calls.clear()
+            fail_on.clear()
+            run_import_job(claim_next_job(), chunk_size=2)
+
+        # 커밋된 앞의 두 행은 다시 처리하지 않는다
+        self.assertEqual(calls, [[2, 3], [4]])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows_parsed, job.new_records, job.attempts), ('completed', 5, 5, 2))
+        self.assertEqual(Customer.objects.count(), 5)
+
+    def test_stale_worker_stops_when_job_is_reclaimed(self):
+        stale = claim_next_job()
+
+        def reclaim(job):
+            # 첫 청크를 커밋한 뒤 하트비트가 끊겨 다른 워커가 작업을 가져감
+            if job.rows_parsed == 2:
+                ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+                self.assertIsNotNone(claim_next_job())
+
+        with self.assertRaises(ImportJobLost):
+            run_import_job(stale, chunk_size=2, progress=reclaim)
+
+        # 늦은 워커의 다음 청크 저장/진행 상황은 롤백되고 작업은 새 워커 소유 그대로
+        job = ImportJob.objects.get()
+        self.assertEqual((job.status, job.rows_parsed, job.attempts), ('running', 2, 2))
+        self.assertNotEqual(job.claim_token, stale.claim_token)
+        self.assertEqual(Customer.objects.count(), 2)
+        self.assertFalse(UploadHistory.objects.exists())
+
+        run_import_job(job, chunk_size=2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.new_records, UploadHistory.objects.count()), ('completed', 5, 1))
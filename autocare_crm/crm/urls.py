@@ -9,8 +9,13 @@ urlpatterns = [
     path('call-records/', views.call_records, name='call_records'),
     path('call-records/<int:call_id>/delete/', views.delete_call_record, name='delete_call_record'),
     path('upload/', views.upload_data, name='upload_data'),
+    path('api/import-jobs/<int:job_id>/', views.import_job_status_api, name='import_job_status_api'),
     path('call-records/follow-up/', views.add_follow_up, name='add_follow_up'),
     path('api/sidebar-stats/', views.sidebar_stats_api, name='sidebar_stats_api'),  # 추가
+    path('api/live-events/', views.live_events_api, name='live_events_api'),
+    path('api/live-stream/', views.live_stream, name='live_stream'),
+    path('api/presence/heartbeat/', views.presence_heartbeat, name='presence_heartbeat'),
+    path('api/request-metrics/', views.request_metrics_api, name='request_metrics_api'),
     path('customers/<int:pk>/approve-do-not-call/', views.approve_do_not_call, name='approve_do_not_call'),
     path('do-not-call-requests/', views.do_not_call_requests, name='do_not_call_requests'),
     
@@ -24,4 +29,5 @@ urlpatterns = [
     path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
     path('api/team-performance/', views.team_performance_api, name='team_performance_api'),
     path('api/agent-performance/<int:agent_id>/', views.agent_performance_api, name='agent_performance_api'),
+    path('api/call-distribution/', views.call_distribution_api, name='call_distribution_api'),
 ]
\ No newline at end of file
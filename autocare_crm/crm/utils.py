@@ -48,8 +48,9 @@ def map_customer_grade(grade_str):
 # crm/management/commands/import_excel_data.py
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from crm.models import Customer, UploadHistory
-from crm.utils import clean_phone_number, parse_excel_date, map_customer_grade
+from crm.models import UploadHistory
+from crm.cleaning import COLUMN_MAPPING, clean_customer_frame, customer_records
+from crm.importing import import_customers
 import pandas as pd
 import numpy as np
 
@@ -71,94 +72,23 @@ class Command(BaseCommand):
             df = pd.read_excel(file_path, sheet_name='고객')
             self.stdout.write(f'총 {len(df)}개 행 발견')
             
-            # 컬럼명 매핑
-            column_mapping = {
-                '고객명': 'name',
-                '휴대전화': 'phone',
-                '전화번호': 'landline',
-                '생년월일': 'birth_date',
-                '주소': 'address',
-                '우편번호': 'postal_code',
-                '고객등급': 'customer_grade',
-                '이메일': 'email',
-                '방문수': 'visit_count',
-                '차량번호': 'vehicle_number',
-                '차량명': 'vehicle_name',
-                '모델명': 'vehicle_model',
-                '차량등록일': 'vehicle_registration_date',
-                '검사만료일': 'inspection_expiry_date',
-                '보험만기일': 'insurance_expiry_date',
-                '오일교환일': 'oil_change_date',
-                '차대번호': 'chassis_number',
-                '소속회사': 'company'
-            }
-            
-            # 필요한 컬럼만 선택하고 이름 변경
-            df = df.rename(columns=column_mapping)
-            
-            new_count = 0
-            updated_count = 0
-            error_count = 0
             errors = []
             
+            # 열 단위 정제 (컬럼명 매핑/전화번호/날짜/등급)
+            cleaned, error_count = clean_customer_frame(df)
+            for index in df.index.difference(cleaned.index):
+                errors.append(f"행 {index+2}: 필수 정보 누락 (이름/휴대전화/차량번호)")
+            records = customer_records(cleaned, list(COLUMN_MAPPING.values()))
+            
             with transaction.atomic():
-                for index, row in df.iterrows():
-                    try:
-                        # 필수 필드 검증
-                        phone = clean_phone_number(row.get('phone', ''))
-                        vehicle_number = str(row.get('vehicle_number', '')).strip()
-                        name = str(row.get('name', '')).strip()
-                        
-                        if not phone or not vehicle_number or not name:
-                            error_count += 1
-                            errors.append(f"행 {index+2}: 필수 정보 누락 (이름: {name}, 폰: {phone}, 차량번호: {vehicle_number})")
-                            continue
-                        
-                        # 고객 데이터 준비
-                        customer_data = {
-                            'name': name,
-                            'phone': phone,
-                            'landline': clean_phone_number(row.get('landline', '')),
-                            'birth_date': parse_excel_date(row.get('birth_date')),
-                            'address': str(row.get('address', '')).strip(),
-                            'postal_code': str(row.get('postal_code', '')).strip(),
-                            'email': str(row.get('email', '')).strip(),
-                            'vehicle_number': vehicle_number,
-                            'vehicle_name': str(row.get('vehicle_name', '')).strip(),
-                            'vehicle_model': str(row.get('vehicle_model', '')).strip(),
-                            'vehicle_registration_date': parse_excel_date(row.get('vehicle_registration_date')),
-                            'inspection_expiry_date': parse_excel_date(row.get('inspection_expiry_date')),
-                            'insurance_expiry_date': parse_excel_date(row.get('insurance_expiry_date')),
-                            'oil_change_date': parse_excel_date(row.get('oil_change_date')),
-                            'chassis_number': str(row.get('chassis_number', '')).strip(),
-                            'company': str(row.get('company', '')).strip(),
-                            'customer_grade': map_customer_grade(row.get('customer_grade', '')),
-                            'visit_count': int(row.get('visit_count', 0)) if pd.notna(row.get('visit_count')) else 0,
-                        }
-                        
-                        # 고객 생성 또는 업데이트
-                        customer, created = Customer.objects.update_or_create(
-                            phone=phone,
-                            vehicle_number=vehicle_number,
-                            defaults=customer_data
-                        )
-                        
-                        # 우선순위와 태그 업데이트
-                        customer.update_priority_tags()
-                        customer.save()
-                        
-                        if created:
-                            new_count += 1
-                        else:
-                            updated_count += 1
-                            
-                        if (new_count + updated_count) % 1000 == 0:
-                            self.stdout.write(f'처리 중... {new_count + updated_count}건 완료')
-                            
-                    except Exception as e:
-                        error_count += 1
-                        errors.append(f"행 {index+2}: {str(e)}")
-                        continue
+                # 배치마다 기존 고객 조회 1회 + upsert 1회
+                new_count, updated_count, write_errors = import_customers(
+                    records,
+                    progress=lambda processed: self.stdout.write(f'처리 중... {processed}건 완료'),
+                )
+                error_count += write_errors
+                if write_errors:
+                    errors.append(f"저장 실패 {write_errors}건")
                 
                 if dry_run:
                     self.stdout.write(self.style.WARNING('DRY RUN 모드 - 실제로 저장되지 않음'))
@@ -2,235 +2,58 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.utils import timezone
 from django.db import transaction
 from datetime import datetime, timedelta, date
 import csv
+import hashlib
 import io
-import re
-import pandas as pd
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from asgiref.sync import sync_to_async
 import json
+import logging
 from django.contrib.auth.models import User
 
-from .models import Customer, CallRecord, UploadHistory, UserProfile, CallFollowUp, CallAssignment
+from .models import Customer, CallRecord, UploadHistory, ImportJob, UserProfile, CallFollowUp, CallAssignment, AgentDailyStats, inspection_sort_annotations
 from .forms import CallRecordForm, CustomerUploadForm
-from .decorators import manager_required, admin_required, ajax_manager_required
-from django.db.models import Q, Count, Prefetch
-from django.db import transaction
+from .decorators import manager_required, admin_required, ajax_manager_required, ajax_admin_required
+from .stats import get_dashboard_stats, get_sidebar_stats
+from .events import event_stream, latest_event_id, live_events_config, publish_event, read_events
+from .snapshots import get_snapshot
+from .pagination import cached_aggregate, keyset_paginate, list_count
+from .visibility import visible_customers
+from .search import search_customers
+from .jobs import enqueue_import
+from .presence import HEARTBEAT_INTERVAL, get_presence, touch
+from .rollups import refresh_stats_for_calls
+from .metrics import request_metrics
+from .performance import (
+    agent_metrics, call_distribution, call_time_series, member_activity, team_metrics,
+    DISTRIBUTION_INTERVALS, SERIES_PERIODS,
+)
+from .cohorts import (
+    LIST_WINDOW, HAPPY_CALL_KEYS,
+    filter_happy_call, happy_call_inspection_date,
+)
+from django.db.models import Q, Count, Prefetch, Sum
+from django.db.models.functions import Coalesce
+
+logger = logging.getLogger(__name__)
 
-def get_sidebar_stats():
-    """사이드바에 표시할 통계 정보 계산"""
-    today = timezone.now().date()
-    
-    # 오늘 통화 수
-    sidebar_today_calls = CallRecord.objects.filter(
-        call_date__date=today,
-        is_deleted=False
-    ).count()
-    
-    # 미완료 후속조치
-    sidebar_pending_followups = CallRecord.objects.filter(
-        requires_follow_up=True,
-        follow_up_completed=False,
-        is_deleted=False
-    ).count()
-    
-    # 검사만료 고객
-    sidebar_overdue_customers = Customer.objects.filter(
-        inspection_expiry_date__isnull=False,
-        inspection_expiry_date__lt=today
-    ).count()
-    
-    return {
-        'sidebar_today_calls': sidebar_today_calls,
-        'sidebar_pending_followups': sidebar_pending_followups,
-        'sidebar_overdue_customers': sidebar_overdue_customers,
-    }
 
 @login_required
 def dashboard(request):
     """대시보드 - 실시간 통계"""
-    today = timezone.now().date()
+    today = timezone.localdate()
     
     # 사이드바 통계를 먼저 가져오기
     sidebar_stats = get_sidebar_stats()
     
-    # 오늘 통계
-    today_calls = CallRecord.objects.filter(call_date__date=today, is_deleted=False)
-    today_connected = today_calls.filter(call_result='connected')
-    
-    # 전체 통계
-    total_customers = Customer.objects.count()
-    pending_customers = Customer.objects.filter(status='pending').count()
-    interested_customers = Customer.objects.filter(status='interested').count()
-    converted_customers = Customer.objects.filter(status='converted').count()
-    
-    # 검사 관련 통계
-    three_months_later = today + timedelta(days=90)
-    
-    due_soon_customers = Customer.objects.filter(
-        inspection_expiry_date__isnull=False,
-        inspection_expiry_date__gte=today,
-        inspection_expiry_date__lte=three_months_later
-    ).count()
-    
-    # 실제 검사일 기준 해피콜 대상 계산
-    # 3개월콜 대상 (실제 검사일 기준)
-    three_months_ago = today - timedelta(days=90)
-    happy_call_3month_total = Customer.objects.filter(
-        actual_inspection_date__gte=three_months_ago - timedelta(days=7),
-        actual_inspection_date__lte=three_months_ago + timedelta(days=7)
-    ).count()
-
-    # 6개월콜 대상 (실제 검사일 기준)
-    six_months_ago = today - timedelta(days=180)
-    happy_call_6month_total = Customer.objects.filter(
-        actual_inspection_date__gte=six_months_ago - timedelta(days=7),
-        actual_inspection_date__lte=six_months_ago + timedelta(days=7)
-    ).count()
-
-    # 12개월콜 대상 (실제 검사일 기준)
-    twelve_months_ago = today - timedelta(days=365)
-    happy_call_12month_total = Customer.objects.filter(
-        actual_inspection_date__gte=twelve_months_ago - timedelta(days=7),
-        actual_inspection_date__lte=twelve_months_ago + timedelta(days=7)
-    ).count()
-
-    # 18개월콜 대상 (실제 검사일 기준) - 선택사항
-    eighteen_months_ago = today - timedelta(days=548)
-    happy_call_18month_total = Customer.objects.filter(
-        actual_inspection_date__gte=eighteen_months_ago - timedelta(days=7),
-        actual_inspection_date__lte=eighteen_months_ago + timedelta(days=7)
-    ).count()
-
-    # 오늘 통화한 고객 ID 목록
-    today_called_customer_ids = today_calls.values_list('customer_id', flat=True).distinct()
-
-    # 각 해피콜의 남은 대상자 계산 (실제 검사일 기준)
-    happy_call_3month_remaining = Customer.objects.filter(
-        actual_inspection_date__gte=three_months_ago - timedelta(days=7),
-        actual_inspection_date__lte=three_months_ago + timedelta(days=7)
-    ).exclude(id__in=today_called_customer_ids).count()
-
-    happy_call_6month_remaining = Customer.objects.filter(
-        actual_inspection_date__gte=six_months_ago - timedelta(days=7),
-        actual_inspection_date__lte=six_months_ago + timedelta(days=7)
-    ).exclude(id__in=today_called_customer_ids).count()
-
-    happy_call_12month_remaining = Customer.objects.filter(
-        actual_inspection_date__gte=twelve_months_ago - timedelta(days=7),
-        actual_inspection_date__lte=twelve_months_ago + timedelta(days=7)
-    ).exclude(id__in=today_called_customer_ids).count()
-
-    happy_call_18month_remaining = Customer.objects.filter(
-        actual_inspection_date__gte=eighteen_months_ago - timedelta(days=7),
-        actual_inspection_date__lte=eighteen_months_ago + timedelta(days=7)
-    ).exclude(id__in=today_called_customer_ids).count()
-
-    # 완료된 수 계산
-    happy_call_3month_completed = happy_call_3month_total - happy_call_3month_remaining
-    happy_call_6month_completed = happy_call_6month_total - happy_call_6month_remaining
-    happy_call_12month_completed = happy_call_12month_total - happy_call_12month_remaining
-    happy_call_18month_completed = happy_call_18month_total - happy_call_18month_remaining
-
-    # 검사만료 고객 (오늘 통화 현황)
-    overdue_customers_total = Customer.objects.filter(
-        inspection_expiry_date__isnull=False,
-        inspection_expiry_date__lt=today
-    ).count()
-    overdue_customers_remaining = Customer.objects.filter(
-        inspection_expiry_date__isnull=False,
-        inspection_expiry_date__lt=today
-    ).exclude(id__in=today_called_customer_ids).count()
-    overdue_customers_completed = overdue_customers_total - overdue_customers_remaining
-    
-    # 재방문 고객 (2회 이상 방문, 오늘 통화 현황)
-    returning_customers_total = Customer.objects.filter(visit_count__gte=2).count()
-    returning_customers_remaining = Customer.objects.filter(
-        visit_count__gte=2
-    ).exclude(id__in=today_called_customer_ids).count()
-    returning_customers_completed = returning_customers_total - returning_customers_remaining
-    
-    # VIP 고객
-    vip_customers_total = Customer.objects.filter(customer_grade='vip').count()
-    vip_customers_remaining = Customer.objects.filter(
-        customer_grade='vip'
-    ).exclude(id__in=today_called_customer_ids).count()
-    vip_customers_completed = vip_customers_total - vip_customers_remaining
-    
-    # 오늘의 통화 대상자 통계
-    happy_call_targets = (
-        happy_call_3month_remaining + 
-        happy_call_6month_remaining + 
-        happy_call_12month_remaining + 
-        happy_call_18month_remaining
-    )
-    
-    # 검사만료 + 재방문 고객 (오늘 통화하지 않은)
-    priority_targets = overdue_customers_remaining + returning_customers_remaining
-    
-    # 전체 오늘 통화 대상 (단순 합계)
-    today_total_targets = happy_call_targets + priority_targets
-    
-    # 오늘 실제 통화한 건수
-    today_total_calls_count = today_calls.count()
-    
-    # 통화 완료된 대상자 수 (중복 제거)
-    today_completed_targets = len(today_called_customer_ids)
-    
-    # 달성률 계산 (실제 통화 건수 / 목표)
-    today_target_completion_rate = round((today_completed_targets / today_total_targets * 100) if today_total_targets > 0 else 0)
-    
-    # 이탈 고객 통계
-    first_time_lost = Customer.objects.filter(is_first_time_no_return=True).count()
-    long_term_lost = Customer.objects.filter(
-        Q(is_long_term_absent=True) | 
-        Q(customer_status='possibly_scrapped')
-    ).count()
-    
-    # 단골 고객 수
-    frequent_visitors = Customer.objects.filter(visit_count__gte=3).count()
-    
-    # 후속조치 관련 통계
-    followup_required_total = CallRecord.objects.filter(
-        requires_follow_up=True,
-        is_deleted=False
-    ).count()
-    
-    followup_completed_total = CallRecord.objects.filter(
-        requires_follow_up=True,
-        follow_up_completed=True,
-        is_deleted=False
-    ).count()
-    
-    followup_pending = followup_required_total - followup_completed_total
-    
-    followup_due_today = CallRecord.objects.filter(
-        follow_up_date=today,
-        follow_up_completed=False,
-        is_deleted=False
-    ).count()
-    
-    followup_overdue = CallRecord.objects.filter(
-        follow_up_date__lt=today,
-        follow_up_completed=False,
-        requires_follow_up=True,
-        is_deleted=False
-    ).count()
-    
-    followup_calls_today = CallRecord.objects.filter(
-        parent_call__isnull=False,
-        call_date__date=today,
-        is_deleted=False
-    ).count()
-    
-    followup_completion_rate = 0
-    if followup_required_total > 0:
-        followup_completion_rate = round(
-            (followup_completed_total / followup_required_total) * 100, 1
-        )
+    # 고객/통화/후속조치 통계 (조건부 집계)
+    stats = get_dashboard_stats(today)
     
     pending_followup_list = CallRecord.objects.filter(
         requires_follow_up=True,
@@ -247,8 +70,7 @@ def dashboard(request):
     agent_stats = None
     try:
         if hasattr(request.user, 'userprofile') and request.user.userprofile.role == 'manager':
-            agent_stats = CallRecord.objects.filter(
-                call_date__date=today,
+            agent_stats = CallRecord.objects.on_local_day(today).filter(
                 is_deleted=False
             ).values(
                 'caller__username'
@@ -259,104 +81,53 @@ def dashboard(request):
     except:
         pass
     
-    # 오늘의 목표별 통화 수
-    today_overdue_calls = today_calls.filter(
-        customer__inspection_expiry_date__isnull=False,
-        customer__inspection_expiry_date__lt=today
-    ).count()
-    
-    today_due_soon_calls = today_calls.filter(
-        customer__inspection_expiry_date__isnull=False,
-        customer__inspection_expiry_date__gte=today,
-        customer__inspection_expiry_date__lte=three_months_later
-    ).count()
-    
-    today_vip_calls = today_calls.filter(
-        customer__customer_grade='vip'
-    ).count()
-    
     # Context 생성
     context = {
-        'total_customers': total_customers,
-        'pending_customers': pending_customers,
-        'interested_customers': interested_customers,
-        'converted_customers': converted_customers,
+        'total_customers': stats['total_customers'],
+        'pending_customers': stats['pending_customers'],
+        'interested_customers': stats['interested_customers'],
+        'converted_customers': stats['converted_customers'],
         
         # 오늘의 통화 목표
-        'today_targets': {
-            'total': today_total_targets,
-            'remaining': today_total_targets - today_completed_targets,
-            'completed': today_completed_targets,
-            'completion_rate': today_target_completion_rate,
-            'actual_calls': today_total_calls_count
-        },
+        'today_targets': stats['today_targets'],
         
         # 해피콜 통계
-        'happy_call_3month': {
-            'total': happy_call_3month_total,
-            'remaining': happy_call_3month_remaining,
-            'completed': happy_call_3month_completed,
-            'progress': round((happy_call_3month_completed / happy_call_3month_total * 100) if happy_call_3month_total > 0 else 0)
-        },
-        'happy_call_6month': {
-            'total': happy_call_6month_total,
-            'remaining': happy_call_6month_remaining,
-            'completed': happy_call_6month_completed,
-            'progress': round((happy_call_6month_completed / happy_call_6month_total * 100) if happy_call_6month_total > 0 else 0)
-        },
-        'happy_call_12month': {
-            'total': happy_call_12month_total,
-            'remaining': happy_call_12month_remaining,
-            'completed': happy_call_12month_completed,
-            'progress': round((happy_call_12month_completed / happy_call_12month_total * 100) if happy_call_12month_total > 0 else 0)
-        },
-        'happy_call_18month': {
-            'total': happy_call_18month_total,
-            'remaining': happy_call_18month_remaining,
-            'completed': happy_call_18month_completed,
-            'progress': round((happy_call_18month_completed / happy_call_18month_total * 100) if happy_call_18month_total > 0 else 0)
-        },
-        'overdue_customers': {
-            'total': overdue_customers_total,
-            'remaining': overdue_customers_remaining,
-            'completed': overdue_customers_completed,
-            'progress': round((overdue_customers_completed / overdue_customers_total * 100) if overdue_customers_total > 0 else 0)
-        },
-        'returning_customers': {
-            'total': returning_customers_total,
-            'remaining': returning_customers_remaining,
-            'completed': returning_customers_completed,
-            'progress': round((returning_customers_completed / returning_customers_total * 100) if returning_customers_total > 0 else 0)
-        },
+        'happy_call_3month': stats['happy_call_3month'],
+        'happy_call_6month': stats['happy_call_6month'],
+        'happy_call_12month': stats['happy_call_12month'],
+        'happy_call_18month': stats['happy_call_18month'],
+        'overdue_customers': stats['overdue_customers'],
+        'returning_customers': stats['returning_customers'],
+        'vip_customers': stats['vip_customers'],
         
         # 기타 통계
-        'first_time_lost': first_time_lost,
-        'long_term_lost': long_term_lost,
-        'frequent_visitors': frequent_visitors,
-        'due_soon_customers': due_soon_customers,
-        'today_total_calls': today_calls.count(),
-        'today_connected_calls': today_connected.count(),
+        'first_time_lost': stats['first_time_lost'],
+        'long_term_lost': stats['long_term_lost'],
+        'frequent_visitors': stats['frequent_visitors'],
+        'due_soon_customers': stats['due_soon_customers'],
+        'today_total_calls': stats['today_total_calls'],
+        'today_connected_calls': stats['today_connected_calls'],
         
         'recent_calls': recent_calls,
         'agent_stats': agent_stats,
-        'today_overdue_calls': today_overdue_calls,
-        'today_due_soon_calls': today_due_soon_calls,
-        'today_vip_calls': today_vip_calls,
+        'today_overdue_calls': stats['today_overdue_calls'],
+        'today_due_soon_calls': stats['today_due_soon_calls'],
+        'today_vip_calls': stats['today_vip_calls'],
         
         # 후속조치 관련
-        'followup_pending': followup_pending,
-        'followup_completed_today': followup_calls_today,
-        'followup_due_today': followup_due_today,
-        'followup_overdue': followup_overdue,
-        'followup_completion_rate': followup_completion_rate,
+        'followup_pending': stats['followup_pending'],
+        'followup_completed_today': stats['followup_calls_today'],
+        'followup_due_today': stats['followup_due_today'],
+        'followup_overdue': stats['followup_overdue'],
+        'followup_completion_rate': stats['followup_completion_rate'],
         'pending_followup_list': pending_followup_list,
         
         # 호환성을 위한 추가 변수
-        'pending_follow_ups': followup_pending,
-        'completed_follow_ups': followup_calls_today,
-        'today_follow_ups': followup_due_today,
-        'overdue_follow_ups': followup_overdue,
-        'follow_up_completion_rate': followup_completion_rate,
+        'pending_follow_ups': stats['followup_pending'],
+        'completed_follow_ups': stats['followup_calls_today'],
+        'today_follow_ups': stats['followup_due_today'],
+        'overdue_follow_ups': stats['followup_overdue'],
+        'follow_up_completion_rate': stats['followup_completion_rate'],
         'pending_follow_up_records': pending_followup_list,
     }
     
@@ -371,16 +142,8 @@ def customer_list(request):
     """고객 목록 - 검색, 필터링, 페이징"""
     # 권한별 고객 필터링 추가
     if hasattr(request.user, 'userprofile') and request.user.userprofile.role == 'agent':
-        # 상담원은 본인에게 배정된 고객 + 본인이 통화한 고객
-        assigned_customer_ids = CallAssignment.objects.filter(
-            assigned_to=request.user,
-            status__in=['pending', 'in_progress']
-        ).values_list('customer_id', flat=True)
-        
-        customers = Customer.objects.filter(
-            Q(id__in=assigned_customer_ids) |
-            Q(call_records__caller=request.user)
-        ).distinct()
+        # 상담원은 본인에게 배정된 고객 + 본인이 통화한 고객 (CustomerVisibility 조인 1회)
+        customers = visible_customers(request.user)
     else:
         # 팀장, 관리자는 전체 고객
         customers = Customer.objects.all()
@@ -388,11 +151,7 @@ def customer_list(request):
     # 검색
     search_query = request.GET.get('search', '')
     if search_query:
-        customers = customers.filter(
-            Q(name__icontains=search_query) |
-            Q(phone__icontains=search_query) |
-            Q(vehicle_number__icontains=search_query)
-        )
+        customers = search_customers(customers, search_query)
     
     # 상태 필터
     status_filter = request.GET.get('status', '')
@@ -413,35 +172,11 @@ def customer_list(request):
     elif priority_filter == 'high':
         customers = customers.filter(priority='high')
     
-    # 해피콜 필터 (실제 검사일 기준으로 수정 - ±1일)
+    # 해피콜 필터 (해피콜 예정일 기준 - ±1일)
     happy_call_filter = request.GET.get('happy_call', '')
-    if happy_call_filter:
+    if happy_call_filter in HAPPY_CALL_KEYS:
         today = timezone.now().date()
-        
-        if happy_call_filter == '3month':
-            three_months_ago = today - timedelta(days=90)
-            customers = customers.filter(
-                actual_inspection_date__gte=three_months_ago - timedelta(days=1),
-                actual_inspection_date__lte=three_months_ago + timedelta(days=1)
-            )
-        elif happy_call_filter == '6month':
-            six_months_ago = today - timedelta(days=180)
-            customers = customers.filter(
-                actual_inspection_date__gte=six_months_ago - timedelta(days=1),
-                actual_inspection_date__lte=six_months_ago + timedelta(days=1)
-            )
-        elif happy_call_filter == '12month':
-            twelve_months_ago = today - timedelta(days=365)
-            customers = customers.filter(
-                actual_inspection_date__gte=twelve_months_ago - timedelta(days=1),
-                actual_inspection_date__lte=twelve_months_ago + timedelta(days=1)
-            )
-        elif happy_call_filter == '18month':
-            eighteen_months_ago = today - timedelta(days=548)
-            customers = customers.filter(
-                actual_inspection_date__gte=eighteen_months_ago - timedelta(days=1),
-                actual_inspection_date__lte=eighteen_months_ago + timedelta(days=1)
-            )
+        customers = filter_happy_call(customers, happy_call_filter, today, LIST_WINDOW)
     
     # 고객등급 필터
     grade_filter = request.GET.get('grade', '')
@@ -471,18 +206,11 @@ def customer_list(request):
             inspection_expiry_date__lte=three_months_later
         )
     
-    # 정렬 - 기본값은 실제 검사일 오래된 순
-    # actual_inspection_date로 정렬 (NULL 값은 뒤로)
-    from django.db.models import F
-    customers = customers.order_by(
-        F('actual_inspection_date').asc(nulls_last=True),
-        F('inspection_expiry_date').asc(nulls_last=True)
-    )
-    
-    # 페이징
-    paginator = Paginator(customers, 50)
-    page_number = request.GET.get('page')
-    customers = paginator.get_page(page_number)
+    # 정렬 - 기본값은 실제 검사일 오래된 순 (NULL 값은 뒤로)
+    # NULL 을 먼 미래 날짜로 바꾼 정렬 식으로 정렬해 customer_inspection_sort_idx 인덱스를 탄다
+    # 페이징 - 키셋 페이지네이션 (깊은 페이지도 첫 페이지와 같은 비용)
+    sort_expressions = inspection_sort_annotations()
+    customers = keyset_paginate(request, customers.annotate(**sort_expressions), list(sort_expressions))
     
     # 사이드바 통계 추가
     sidebar_stats = get_sidebar_stats()
@@ -543,8 +271,9 @@ def delete_call_record(request, call_id):
                 'error': '삭제 권한이 없습니다.'
             })
         
-        # 소프트 삭제 실행
-        call_record.soft_delete(request.user)
+        # 소프트 삭제 실행 (상담원 일별 집계와 함께 반영)
+        with transaction.atomic():
+            call_record.soft_delete(request.user)
         
         return JsonResponse({
             'success': True,
@@ -619,12 +348,11 @@ def add_call_record(request, pk):
                         )
                         parent.follow_up_completed = True
                         parent.save()
-                        
-                        # 디버그 로그
-                        print(f"✅ 후속조치 완료 처리: 원통화 ID {parent.id} (고객: {parent.customer.name})")
+                        publish_event('followup_completed')
+                        logger.debug('후속조치 완료 처리: 원통화 ID %s (고객 ID %s)', parent.id, parent.customer_id)
                         
                     except CallRecord.DoesNotExist:
-                        print(f"❌ 원통화를 찾을 수 없음: ID {call_record.parent_call_id}")
+                        logger.debug('원통화를 찾을 수 없음: ID %s', call_record.parent_call_id)
                 
                 # 2-2. 암시적 후속조치 (같은 고객의 예정된 후속조치 자동 완료)
                 elif call_record.call_result == 'connected':
@@ -640,9 +368,12 @@ def add_call_record(request, pk):
                     
                     # 찾은 후속조치들 완료 처리
                     if pending_followups.exists():
-                        count = pending_followups.count()
+                        completed_ids = list(pending_followups.values_list('id', flat=True))
                         updated = pending_followups.update(follow_up_completed=True)
-                        print(f"✅ 총 {updated}건의 후속조치 자동 완료 처리 (쿼리 결과: {count}건)")
+                        # update()는 시그널이 없으므로 상담원 일별 집계 직접 갱신
+                        refresh_stats_for_calls(CallRecord.objects.filter(id__in=completed_ids))
+                        publish_event('followup_completed')
+                        logger.debug('후속조치 %s건 자동 완료 처리', updated)
                 
                 # 3. 고객 상태 업데이트
                 if call_record.call_result == 'connected':
@@ -655,7 +386,7 @@ def add_call_record(request, pk):
                         customer.status = 'contacted'
                                         
                     customer.save()
-                    print(f"고객 상태 업데이트: {customer.name} → {customer.status}")
+                    logger.debug('고객 상태 업데이트: 고객 ID %s → %s', customer.id, customer.status)
                 
                 if request.POST.get('request_do_not_call') == 'on' and not customer.is_do_not_call:
                     if request.user.userprofile.role == 'agent':
@@ -705,9 +436,7 @@ def add_call_record(request, pk):
             
         except Exception as e:
             # 상세한 에러 로깅
-            import traceback
-            print(f"❌ 통화 기록 저장 오류: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception('통화 기록 저장 오류')
             
             return JsonResponse({
                 'success': False,
@@ -734,11 +463,7 @@ def call_records(request):
     # 검색 필터 추가
     search_query = request.GET.get('search', '')
     if search_query:
-        records = records.filter(
-            Q(customer__name__icontains=search_query) |
-            Q(customer__phone__icontains=search_query) |
-            Q(customer__vehicle_number__icontains=search_query)
-        )
+        records = search_customers(records, search_query, prefix='customer__')
     
     # 날짜 필터
     start_date = request.GET.get('start_date', '')
@@ -747,14 +472,14 @@ def call_records(request):
     if start_date:
         try:
             start = datetime.strptime(start_date, '%Y-%m-%d').date()
-            records = records.filter(call_date__date__gte=start)
+            records = records.between_local_days(date_from=start)
         except ValueError:
             pass
     
     if end_date:
         try:
             end = datetime.strptime(end_date, '%Y-%m-%d').date()
-            records = records.filter(call_date__date__lte=end)
+            records = records.between_local_days(date_to=end)
         except ValueError:
             pass
     
@@ -769,17 +494,17 @@ def call_records(request):
         records = records.filter(call_result=result_filter)
     
     # 후속조치 필터 추가
-    today = timezone.now().date()
+    today = timezone.localdate()
     filter_type = request.GET.get('filter', '')
     
     if filter_type == 'today':
-        records = records.filter(call_date__date=today)
+        records = records.on_local_day(today)
     elif filter_type == 'week':
         week_ago = today - timedelta(days=7)
-        records = records.filter(call_date__date__gte=week_ago)
+        records = records.between_local_days(date_from=week_ago)
     elif filter_type == 'month':
         month_ago = today - timedelta(days=30)
-        records = records.filter(call_date__date__gte=month_ago)
+        records = records.between_local_days(date_from=month_ago)
     elif filter_type == 'pending_follow_up':
         records = records.filter(requires_follow_up=True, follow_up_completed=False)
     elif filter_type == 'today_follow_up':
@@ -793,15 +518,20 @@ def call_records(request):
     elif filter_type == 'follow_up':
         records = records.filter(follow_up_date__isnull=False)
     
-    # 통계 계산
-    total_calls = records.count()
-    connected_calls = records.filter(call_result='connected').count()
-    follow_up_calls = records.filter(requires_follow_up=True).count()
+    # 통계 계산 (조건별 1회 집계, LIST_COUNT_MODE 에 따라 캐시)
+    record_stats = cached_aggregate(
+        records,
+        total_calls=Count('id'),
+        connected_calls=Count('id', filter=Q(call_result='connected')),
+        follow_up_calls=Count('id', filter=Q(requires_follow_up=True)),
+    )
+    total_calls = record_stats['total_calls']
+    connected_calls = record_stats['connected_calls']
+    follow_up_calls = record_stats['follow_up_calls']
     
-    # 페이징
-    paginator = Paginator(records, 50)
-    page_number = request.GET.get('page')
-    records = paginator.get_page(page_number)
+    # 페이징 - 키셋 페이지네이션 (전체 건수는 위 통계 사용)
+    records = keyset_paginate(request, records, ['-call_date'], with_total=False)
+    records.total = total_calls
     
     # 상담원 목록 (필터용)
     agents = User.objects.filter(
@@ -828,188 +558,33 @@ def call_records(request):
 @manager_required
 def upload_data(request):
     """CSV/Excel 데이터 업로드"""
-    
-    def process_batch(batch_data, data_extract_date):
-        """배치 데이터 처리"""
-        batch_new = 0
-        batch_updated = 0
-        
-        for phone, vehicle_number, customer_data in batch_data:
-            try:
-                customer, created = Customer.objects.update_or_create(
-                    phone=phone,
-                    vehicle_number=vehicle_number,
-                    defaults=customer_data
-                )
-
-                # 실제 검사일 계산 및 저장
-                customer.calculate_inspection_date(data_extract_date)
-                
-                # 우선순위와 태그 업데이트
-                customer.update_priority_tags()
-                customer.save()
-                
-                if created:
-                    batch_new += 1
-                else:
-                    batch_updated += 1
-                    
-            except Exception:
-                continue
-                
-        return batch_new, batch_updated
-    
     if request.method == 'POST':
         form = CustomerUploadForm(request.POST, request.FILES)
         if form.is_valid():
             uploaded_file = request.FILES['file']
             data_extract_date = form.cleaned_data['data_extract_date']  # 추출일 가져오기
 
-            try:
-                # 파일 확장자에 따라 처리
-                if uploaded_file.name.endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(uploaded_file, sheet_name='고객')
-                else:
-                    df = pd.read_csv(uploaded_file, encoding='utf-8')
-                
-                new_count = 0
-                updated_count = 0
-                error_count = 0
-                total_rows = len(df)
-                
-                def clean_phone_number(phone):
-                    """전화번호 정제"""
-                    if not phone or pd.isna(phone):
-                        return ''
-                    phone = re.sub(r'[^\d]', '', str(phone))
-                    if len(phone) == 11 and phone.startswith('010'):
-                        return f"{phone[:3]}-{phone[3:7]}-{phone[7:]}"
-                    elif len(phone) == 10 and phone.startswith('01'):
-                        return f"0{phone[:2]}-{phone[2:6]}-{phone[6:]}"
-                    return phone
-                
-                def parse_date(date_value):
-                    """날짜 파싱"""
-                    if pd.isna(date_value) or not date_value:
-                        return None
-                    
-                    # 문자열인 경우
-                    if isinstance(date_value, str):
-                        try:
-                            # 'YYYY-MM-DD' 형식 파싱
-                            return datetime.strptime(date_value.strip(), '%Y-%m-%d').date()
-                        except ValueError:
-                            # 다른 형식들 시도
-                            date_formats = [
-                                '%Y/%m/%d',
-                                '%Y.%m.%d',
-                                '%d-%m-%Y',
-                                '%d/%m/%Y',
-                                '%Y%m%d',
-                            ]
-                            for fmt in date_formats:
-                                try:
-                                    return datetime.strptime(date_value.strip(), fmt).date()
-                                except ValueError:
-                                    continue
-                    
-                    # datetime 객체인 경우
-                    if hasattr(date_value, 'date'):
-                        return date_value.date()
-                    
-                    return None
-                
-                def map_customer_grade(grade_str):
-                    """고객등급 매핑"""
-                    if not grade_str or pd.isna(grade_str):
-                        return ''
-                    grade_mapping = {
-                        'VIP': 'vip', 'vip': 'vip',
-                        '정회원': 'regular', '준회원': 'associate',
-                        '신규': 'new',
-                    }
-                    return grade_mapping.get(str(grade_str).strip(), '')
-                
-                with transaction.atomic():
-                    batch_size = 500
-                    batch_data = []
-                    
-                    for index, row in df.iterrows():
-                        try:
-                            # 필수 필드 검증
-                            name = str(row.get('고객명', '')).strip()
-                            phone = clean_phone_number(row.get('휴대전화', ''))
-                            vehicle_number = str(row.get('차량번호', '')).strip()
-                            
-                            if not name or not phone or not vehicle_number:
-                                error_count += 1
-                                continue
-                            
-                            # 고객 데이터 준비
-                            customer_data = {
-                                'name': name,
-                                'phone': phone,
-                                'vehicle_number': vehicle_number,
-                                'vehicle_name': str(row.get('차량명', '') or '').strip(),
-                                'vehicle_model': str(row.get('모델명', '') or '').strip(),
-                                'address': str(row.get('주소', '') or '').strip(),
-                                'inspection_expiry_date': parse_date(row.get('검사만료일')),
-                                'insurance_expiry_date': parse_date(row.get('보험만기일')),
-                                'vehicle_registration_date': parse_date(row.get('차량등록일')),
-                                'customer_grade': map_customer_grade(row.get('고객등급', '')),
-                                'visit_count': int(row.get('방문수', 0)) if pd.notna(row.get('방문수')) else 0,
-                            }
-                            
-                            batch_data.append((phone, vehicle_number, customer_data))
-                            
-                            # 배치 처리 - data_extract_date 전달
-                            if len(batch_data) >= batch_size:
-                                batch_new, batch_updated = process_batch(batch_data, data_extract_date)
-                                new_count += batch_new
-                                updated_count += batch_updated
-                                batch_data = []
-                                
-                        except Exception as e:
-                            error_count += 1
-                            continue
-                    
-                    # 남은 데이터 처리
-                    if batch_data:
-                        batch_new, batch_updated = process_batch(batch_data, data_extract_date)
-                        new_count += batch_new
-                        updated_count += batch_updated
-                
-                # 업로드 이력 저장
-                UploadHistory.objects.create(
-                    uploaded_by=request.user,
-                    file_name=uploaded_file.name,
-                    total_records=new_count + updated_count,
-                    new_records=new_count,
-                    updated_records=updated_count,
-                    error_count=error_count,
-                    notes=f"웹 업로드 완료. 총 {total_rows:,}행 처리. 데이터 추출일: {data_extract_date}"
-                )
-                
-                messages.success(
-                    request, 
-                    f'🎉 업로드 완료! '
-                    f'신규 {new_count:,}건, 업데이트 {updated_count:,}건, 오류 {error_count:,}건'
-                )
-                
-            except Exception as e:
-                messages.error(request, f'❌ 파일 처리 중 오류가 발생했습니다: {str(e)}')
+            # 파일만 저장하고 대기 작업 등록 (정제/저장은 run_import_jobs 워커가 처리)
+            job = enqueue_import(uploaded_file, request.user, data_extract_date)
+            messages.success(
+                request,
+                f'📥 업로드 접수! 작업 #{job.pk} ({job.file_name})을(를) 백그라운드에서 처리합니다. '
+                f'진행 상황은 이 화면에서 확인할 수 있습니다.'
+            )
             
             return redirect('upload_data')
     else:
         form = CustomerUploadForm()
     
-    # 최근 업로드 이력
+    # 최근 업로드 작업/이력
+    import_jobs = ImportJob.objects.select_related('uploaded_by').order_by('-created_at')[:10]
     upload_history = UploadHistory.objects.order_by('-upload_date')[:10]
     
     sidebar_stats = get_sidebar_stats()
 
     context = {
         'form': form,
+        'import_jobs': import_jobs,
         'upload_history': upload_history,
     }
     
@@ -1021,87 +596,163 @@ def upload_data(request):
 @login_required
 def add_follow_up(request):
     """후속조치 추가 (AJAX)"""
-    print("add_follow_up 뷰 호출됨")
-    print(f"Method: {request.method}")
-    print(f"POST data: {request.POST}")
     if request.method == 'POST':
         try:
             call_record_id = request.POST.get('call_record_id')
-            print(f"call_record_id: {call_record_id}")
 
             call_record = get_object_or_404(CallRecord, id=call_record_id)
             
-            # CallFollowUp 생성
-            follow_up = CallFollowUp.objects.create(
-                call_record=call_record,
-                created_by=request.user,
-                action_type=request.POST.get('follow_up_action', ''),
-                notes=request.POST.get('follow_up_notes', ''),
-                scheduled_date=request.POST.get('follow_up_date') or None
-            )
+            # 후속조치/통화 기록/상담원 일별 집계를 함께 반영
+            with transaction.atomic():
+                # CallFollowUp 생성
+                follow_up = CallFollowUp.objects.create(
+                    call_record=call_record,
+                    created_by=request.user,
+                    action_type=request.POST.get('follow_up_action', ''),
+                    notes=request.POST.get('follow_up_notes', ''),
+                    scheduled_date=request.POST.get('follow_up_date') or None
+                )
             
-            # 후속조치가 완료 타입이면 원 통화 기록도 완료 처리
-            if request.POST.get('follow_up_action') in ['converted', 'closed', 'data_sent']:
-                call_record.follow_up_completed = True
-                call_record.follow_up_completed_at = timezone.now()  # 완료 시간 기록 추가
-                call_record.save()
+                # 후속조치가 완료 타입이면 원 통화 기록도 완료 처리
+                if request.POST.get('follow_up_action') in ['converted', 'closed', 'data_sent']:
+                    call_record.follow_up_completed = True
+                    call_record.follow_up_completed_at = timezone.now()  # 완료 시간 기록 추가
+                    call_record.save()
             
-            # 새 통화 기록으로도 저장 (parent_call 관계 설정)
-            if request.POST.get('follow_up_action') != '':
-                new_call = CallRecord.objects.create(
-                    customer=call_record.customer,
-                    caller=request.user,
-                    call_result='connected',
-                    notes=f"[후속조치] {request.POST.get('follow_up_notes', '')}",
-                    parent_call=call_record,  # 원 통화를 parent로 설정
-                    is_deleted=False
-                )
+                # 새 통화 기록으로도 저장 (parent_call 관계 설정)
+                if request.POST.get('follow_up_action') != '':
+                    new_call = CallRecord.objects.create(
+                        customer=call_record.customer,
+                        caller=request.user,
+                        call_result='connected',
+                        notes=f"[후속조치] {request.POST.get('follow_up_notes', '')}",
+                        parent_call=call_record,  # 원 통화를 parent로 설정
+                        is_deleted=False
+                    )
                 
-                # 원 통화 기록의 후속조치 완료 처리
-                call_record.follow_up_completed = True
-                call_record.save()
+                    # 원 통화 기록의 후속조치 완료 처리
+                    call_record.follow_up_completed = True
+                    call_record.save()
+            
+            if call_record.follow_up_completed:
+                publish_event('followup_completed')
             
             return JsonResponse({'success': True})
         except Exception as e:
-            import traceback
-            print(f"후속조치 추가 오류: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception('후속조치 추가 오류')
             return JsonResponse({'success': False, 'error': str(e)})
     
     return JsonResponse({'success': False, 'error': 'POST 요청만 허용됩니다.'})
 
 
+@login_required
+@ajax_manager_required
+def import_job_status_api(request, job_id):
+    """업로드 작업 진행 상황 API (업로드 화면에서 주기적으로 호출)"""
+    job = get_object_or_404(ImportJob, pk=job_id)
+    return JsonResponse({
+        'success': True,
+        'id': job.pk,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'is_active': job.is_active,
+        'total_rows': job.total_rows,
+        'rows_parsed': job.rows_parsed,
+        'rows_written': job.rows_written,
+        'new_records': job.new_records,
+        'updated_records': job.updated_records,
+        'error_count': job.error_count,
+        'progress': job.progress_percent,
+        'peak_memory_mb': round(job.peak_memory_mb),
+        'message': job.message,
+    })
+
+
 @login_required
 def sidebar_stats_api(request):
     """사이드바 통계 API"""
-    today = timezone.now().date()
-    
-    # 오늘 통화 수
-    today_calls = CallRecord.objects.filter(
-        call_date__date=today,
-        is_deleted=False
-    ).count()
-    
-    # 미완료 후속조치
-    pending_followups = CallRecord.objects.filter(
-        requires_follow_up=True,
-        follow_up_completed=False,
-        is_deleted=False
-    ).count()
+    sidebar_stats = get_sidebar_stats()
     
-    # 검사만료 고객
-    overdue_customers = Customer.objects.filter(
-        inspection_expiry_date__isnull=False,
-        inspection_expiry_date__lt=today
-    ).count()
+    return JsonResponse({
+        'success': True,
+        'today_calls': sidebar_stats['sidebar_today_calls'],
+        'pending_followups': sidebar_stats['sidebar_pending_followups'],
+        'overdue_customers': sidebar_stats['sidebar_overdue_customers']
+    })
+
+@login_required
+def presence_heartbeat(request):
+    """접속 상태 하트비트 API (화면이 열려 있는 동안 주기적으로 호출)"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'POST 요청만 허용됩니다.'}, status=405)
     
+    touch(request.user.id)
+    return JsonResponse({'success': True, 'interval': HEARTBEAT_INTERVAL})
+
+@login_required
+@ajax_admin_required
+def request_metrics_api(request):
+    """화면별 성능 측정 요약 API (관리자 전용, 현재 프로세스 기준)"""
+    view_name = request.GET.get('view') or None
+    return JsonResponse({
+        'success': True,
+        'window': request_metrics.window,
+        'views': request_metrics.summary(view_name),
+    })
+
+@login_required
+def live_events_api(request):
+    """실시간 통계 이벤트 조회 API (LIVE_EVENTS_TRANSPORT = 'poll')
+
+    after 없이 호출하면 현재 사이드바 통계와 마지막 이벤트 번호만 돌려주고,
+    after=<마지막 이벤트 번호> 로 호출하면 그 이후 이벤트만 돌려준다 (새 이벤트가 없으면 DB 조회 없음).
+    """
+    try:
+        after = int(request.GET['after'])
+    except (KeyError, ValueError):
+        after = None
+
+    if after is None:
+        return JsonResponse({
+            'success': True,
+            'last_event_id': latest_event_id(),
+            'sidebar': get_sidebar_stats(),
+            'events': [],
+        })
+
+    events, last_event_id = read_events(after)
     return JsonResponse({
         'success': True,
-        'today_calls': today_calls,
-        'pending_followups': pending_followups,
-        'overdue_customers': overdue_customers
+        'last_event_id': last_event_id,
+        'events': events,
     })
 
+async def live_stream(request):
+    """실시간 통계 스트림 (Server-Sent Events, LIVE_EVENTS_TRANSPORT = 'sse')
+
+    ASGI 서버에서만 짧게(STREAM_MAX_DURATION) 스트림을 유지한다.
+    WSGI(gunicorn 동기 워커)에서는 워커를 붙잡지 않도록 204 를 돌려주며, 브라우저는 재연결하지 않는다
+    (WSGI 배포는 live_events_api 폴링을 사용).
+    """
+    is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+    if not is_authenticated:
+        return JsonResponse({'success': False, 'error': '로그인이 필요합니다.'}, status=401)
+    
+    # 재연결 시 브라우저가 마지막 이벤트 번호를 보냄
+    last_event_id = request.headers.get('Last-Event-ID')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    response = StreamingHttpResponse(event_stream(last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 버퍼링 비활성화
+    return response
+
 @login_required
 @ajax_manager_required
 def approve_do_not_call(request, pk):
@@ -1289,7 +940,7 @@ def call_assignment(request):
             return redirect('call_assignment')
     
     # GET 요청 처리
-    today = timezone.now().date()
+    today = timezone.localdate()
     
     # 탭 선택 (assigned: 배정된 고객, unassigned: 미배정 고객)
     tab = request.GET.get('tab', 'unassigned')
@@ -1298,7 +949,6 @@ def call_assignment(request):
     customer_type = request.GET.get('type', '')
     grade_filter = request.GET.get('grade', '')
     search_query = request.GET.get('search', '')
-    page_number = request.GET.get('page', 1)
     
     # 상담원 목록
     agents = User.objects.filter(
@@ -1315,10 +965,10 @@ def call_assignment(request):
     assigned_customer_ids = active_assignments.values_list('customer_id', flat=True)
     
     # 전체 미배정 고객 수 계산 (필터 적용 전)
-    total_unassigned_customers = Customer.objects.filter(
+    total_unassigned_customers, _ = list_count(Customer.objects.filter(
         is_active_customer=True,
         is_do_not_call=False
-    ).exclude(id__in=assigned_customer_ids).count()
+    ).exclude(id__in=assigned_customer_ids))
     
     # 기본 고객 쿼리
     customers_query = Customer.objects.filter(
@@ -1336,11 +986,7 @@ def call_assignment(request):
     
     # 검색 필터
     if search_query:
-        customers_query = customers_query.filter(
-            Q(name__icontains=search_query) |
-            Q(phone__icontains=search_query) |
-            Q(vehicle_number__icontains=search_query)
-        )
+        customers_query = search_customers(customers_query, search_query)
 
     # 필터 적용 및 날짜 정보 생성
     filter_date_info = None
@@ -1358,30 +1004,12 @@ def call_assignment(request):
                 inspection_expiry_date__lte=three_months_later
             )
             filter_date_info = f"검사만료일이 {today.strftime('%Y-%m-%d')} ~ {three_months_later.strftime('%Y-%m-%d')} 사이"
-        elif customer_type == 'happy_3month':
-            # 실제 검사일 기준 - ±1일로 변경
-            three_months_ago = today - timedelta(days=90)
-            customers_query = customers_query.filter(
-                actual_inspection_date__gte=three_months_ago - timedelta(days=1),
-                actual_inspection_date__lte=three_months_ago + timedelta(days=1)
-            )
-            filter_date_info = f"3개월 전 검사 고객 (검사일: {three_months_ago.strftime('%Y-%m-%d')} ±1일)"
-        elif customer_type == 'happy_6month':
-            # 실제 검사일 기준 - ±1일로 변경
-            six_months_ago = today - timedelta(days=180)
-            customers_query = customers_query.filter(
-                actual_inspection_date__gte=six_months_ago - timedelta(days=1),
-                actual_inspection_date__lte=six_months_ago + timedelta(days=1)
-            )
-            filter_date_info = f"6개월 전 검사 고객 (검사일: {six_months_ago.strftime('%Y-%m-%d')} ±1일)"
-        elif customer_type == 'happy_12month':
-            # 실제 검사일 기준 - ±1일로 변경
-            twelve_months_ago = today - timedelta(days=365)
-            customers_query = customers_query.filter(
-                actual_inspection_date__gte=twelve_months_ago - timedelta(days=1),
-                actual_inspection_date__lte=twelve_months_ago + timedelta(days=1)
-            )
-            filter_date_info = f"12개월 전 검사 고객 (검사일: {twelve_months_ago.strftime('%Y-%m-%d')} ±1일)"
+        elif customer_type in ('happy_3month', 'happy_6month', 'happy_12month'):
+            # 해피콜 예정일 기준 - ±1일
+            key = customer_type.replace('happy_', '')
+            base_date = happy_call_inspection_date(key, today)
+            customers_query = filter_happy_call(customers_query, key, today, LIST_WINDOW)
+            filter_date_info = f"{key.replace('month', '개월')} 전 검사 고객 (검사일: {base_date.strftime('%Y-%m-%d')} ±{LIST_WINDOW}일)"
         elif customer_type == 'vip':
             customers_query = customers_query.filter(customer_grade='vip')
             filter_date_info = "VIP 등급 고객"
@@ -1397,23 +1025,20 @@ def call_assignment(request):
     
     # 정렬 - 기본값을 오래된 날짜순으로 변경
     sort_by = request.GET.get('sort', 'oldest')
-    if sort_by == 'expiry' or sort_by == 'oldest':
-        customers_query = customers_query.order_by('actual_inspection_date', 'inspection_expiry_date')
-    elif sort_by == 'visit':
-        customers_query = customers_query.order_by('-visit_count')
+    if sort_by == 'visit':
+        ordering = ['-visit_count']
     elif sort_by == 'name':
-        customers_query = customers_query.order_by('name')
+        ordering = ['name']
     elif sort_by == 'priority':
-        customers_query = customers_query.order_by('-is_inspection_overdue', '-priority', 'updated_at')
+        ordering = ['-is_inspection_overdue', '-priority', 'updated_at']
     else:
-        customers_query = customers_query.order_by('actual_inspection_date', 'inspection_expiry_date')
+        ordering = ['actual_inspection_date', 'inspection_expiry_date']
     
-    # 필터링된 고객 수
-    filtered_customers_count = customers_query.count()
+    # 페이지네이션 - 키셋 페이지네이션 (NULL 위치는 기존 정렬과 동일하게 오름차순 앞)
+    page_obj = keyset_paginate(request, customers_query, ordering, nulls_last=False)
     
-    # 페이지네이션
-    paginator = Paginator(customers_query, 50)
-    page_obj = paginator.get_page(page_number)
+    # 필터링된 고객 수
+    filtered_customers_count = page_obj.total
     
     # 현재 페이지의 고객 ID 추출
     customer_ids = [customer.id for customer in page_obj]
@@ -1454,9 +1079,8 @@ def call_assignment(request):
                 status='completed',
                 completed_date__date=today
             ).count(),
-            'calls_today': CallRecord.objects.filter(
+            'calls_today': CallRecord.objects.on_local_day(today).filter(
                 caller=agent,
-                call_date__date=today,
                 is_deleted=False
             ).count()
         }
@@ -1561,210 +1185,30 @@ def update_assignment_status(request, assignment_id):
     return JsonResponse({'success': False, 'error': 'POST 요청만 허용됩니다.'})
 
 
-@login_required
-@manager_required
-def team_dashboard(request):
-    """팀장 대시보드 - 팀원 성과 모니터링"""
-    today = timezone.now().date()
-    # 🔴 디버그 코드 추가 - 사용자 정보 확인
-    print("="*50)
-    print(f"[DEBUG] 현재 사용자: {request.user.username}")
-    print(f"[DEBUG] is_staff: {request.user.is_staff}")
-    print(f"[DEBUG] is_superuser: {request.user.is_superuser}")
-    
-    # 사용자 프로필 및 권한 확인
-    user_profile = request.user.userprofile if hasattr(request.user, 'userprofile') else None
-
-    # 🔴 디버그 코드 추가 - 프로필 정보 확인
-    if user_profile:
-        print(f"[DEBUG] UserProfile 존재: role={user_profile.role}, team={user_profile.team}")
-        print(f"[DEBUG] is_admin: {user_profile.role == 'admin'}")
-        print(f"[DEBUG] is_manager_or_above: {user_profile.is_manager_or_above()}")
-    else:
-        print("[DEBUG] ⚠️ UserProfile이 없습니다!")
-        # UserProfile이 없는 경우 생성
-        from crm.models import UserProfile
-        user_profile, created = UserProfile.objects.get_or_create(
-            user=request.user,
-            defaults={
-                'role': 'admin' if request.user.is_superuser else 'agent',
-                'team': '운영팀' if request.user.is_superuser else '',
-                'daily_call_target': 0 if request.user.is_superuser else 100
-            }
-        )
-        if created:
-            print(f"[DEBUG] ✅ UserProfile 생성됨: role={user_profile.role}")
-    
-
-    is_admin = user_profile and user_profile.role == 'admin'
-    
-    print(f"[DEBUG] is_admin 최종값: {is_admin}")
-    print("="*50)
-
-    # 사용 가능한 팀 목록 생성
-    available_teams = []
-    selected_team = request.GET.get('team', '')
+def _build_team_board(team_agents, is_admin, selected_team, available_teams, date_from, date_to, today):
+    """팀장 대시보드 보드 계산 (스냅샷으로 공유됨)"""
+    # 상담원별 성과 데이터 수집
+    agent_performances = []
     
-    # 🔴 디버그 코드 추가 - 팀 목록 확인
-    print(f"[DEBUG] selected_team 파라미터: {selected_team}")
+    # 상담원별 지표는 상담원 수와 관계없이 묶음 집계 (caller_id / assigned_to_id 기준)
+    team_agents = list(team_agents)
+    metrics_by_agent = agent_metrics([agent.id for agent in team_agents], date_from, date_to, today)
+    presence = get_presence([agent.id for agent in team_agents])
     
-    if is_admin:
-        # 관리자는 모든 팀 목록 가져오기
-        available_teams = UserProfile.objects.exclude(
-            team__isnull=True
-        ).exclude(
-            team=''
-        ).values_list('team', flat=True).distinct().order_by('team')
-        
-        print(f"[DEBUG] 사용 가능한 팀 목록: {list(available_teams)}")
-
-        if selected_team and selected_team in available_teams:
-            # 특정 팀 선택됨 - 팀장과 팀원 모두 포함
-            print(f"[DEBUG] 특정 팀 선택: {selected_team}")
-
-            from django.db.models import Q
-            team_agents = User.objects.filter(
-                Q(userprofile__team=selected_team),
-                is_active=True
-            ).select_related('userprofile').order_by(
-                '-userprofile__role',  # 팀장(manager)이 먼저 오도록
-                'username'
-            )
-        else:
-            # 전체 팀 보기
-            print("[DEBUG] 전체 팀 보기 모드")
-
-            selected_team = ''
-            team_agents = User.objects.filter(
-                is_active=True,
-                userprofile__role__in=['agent', 'manager', 'admin']  # ⭐ 모든 역할 포함
-            ).select_related('userprofile').order_by(
-                '-userprofile__role',
-                'username'
-            )
-    else:
-        # 팀장은 자기 팀만
-        print("[DEBUG] 팀장 모드로 팀 조회")
-
-        team_name = user_profile.team if user_profile else None
-        print(f"[DEBUG] 팀장의 팀: {team_name}")
-
-        if team_name:
-            selected_team = team_name
-            # 팀장 본인과 팀원들 모두 포함
-            from django.db.models import Q
-            team_agents = User.objects.filter(
-                Q(userprofile__team=team_name),
-                is_active=True
-            ).select_related('userprofile').order_by(
-                '-userprofile__role',  # 팀장이 먼저 오도록
-                'username'
-            )
-        else:
-            print("[DEBUG] ⚠️ 팀이 없어서 본인만 표시")
-            # 팀이 없으면 본인만
-            team_agents = User.objects.filter(id=request.user.id)
-            
-    # 🔴 디버그: 최종 팀 구성원 목록
-    print(f"[DEBUG] 최종 팀 구성원 수: {team_agents.count()}")
-    for agent in team_agents:
-        if hasattr(agent, 'userprofile'):
-            print(f"  - {agent.username}: role={agent.userprofile.role}, team={agent.userprofile.team}")
-        else:
-            print(f"  - {agent.username}: UserProfile 없음")
-    print("="*50)
-
-    # 기간 설정 - 기본값 오늘
-    date_from_str = request.GET.get('date_from')
-    date_to_str = request.GET.get('date_to')
-    
-    if date_from_str:
-        try:
-            date_from = datetime.strptime(date_from_str, '%Y-%m-%d').date()
-        except:
-            date_from = today
-    else:
-        date_from = today
-    
-    if date_to_str:
-        try:
-            date_to = datetime.strptime(date_to_str, '%Y-%m-%d').date()
-        except:
-            date_to = today
-    else:
-        date_to = today
-    
-    # 상담원별 성과 데이터 수집
-    # 상담원별 성과 데이터 수집
-    agent_performances = []
-    
-    # 디버그: 팀 구성원 확인
-    print(f"팀 구성원 수: {team_agents.count()}")
-    for agent in team_agents:
-        print(f"- {agent.username} (역할: {agent.userprofile.role if hasattr(agent, 'userprofile') else 'N/A'})")
-
-        calls = CallRecord.objects.filter(
-            caller=agent,
-            call_date__date__gte=date_from,
-            call_date__date__lte=date_to,
-            is_deleted=False
-        )
-        
-        # 오늘 통화만 별도 조회
-        calls_today = calls.filter(call_date__date=today)
-        
-        total_calls = calls.count()
-        connected_calls = calls.filter(call_result='connected').count()
-        
-        # 오늘 통화
-        today_total = calls_today.count()
-        today_connected = calls_today.filter(call_result='connected').count()
-        
-        # 관심 고객 수
-        interested_calls = calls.filter(
-            interest_type__in=['insurance', 'maintenance', 'financing', 'multiple']
-        ).count()
-        
-        # 후속조치 관련
-        followup_required = calls.filter(requires_follow_up=True).count()
-        followup_completed = calls.filter(
-            requires_follow_up=True,
-            follow_up_completed=True
-        ).count()
-        
-        # 오늘 배정된 고객 수
-        assigned_today = CallAssignment.objects.filter(
-            assigned_to=agent,
-            assigned_at__date=today,
-            status__in=['pending', 'in_progress']
-        ).count()
-        
-        # 오늘 완료한 배정
-        completed_today = CallAssignment.objects.filter(
-            assigned_to=agent,
-            status='completed',
-            completed_at__date=today
-        ).count()
+    for agent in team_agents:
+        metrics = metrics_by_agent[agent.id]
+        total_calls = metrics['total_calls']
+        connected_calls = metrics['connected_calls']
+        today_total = metrics['today_total']
+        today_connected = metrics['today_connected']
+        interested_calls = metrics['interested_calls']
+        followup_required = metrics['followup_required']
+        followup_completed = metrics['followup_completed']
+        assigned_today = metrics['assigned_today']
+        completed_today = metrics['completed_today']
         
         # 해피콜 성과 (오늘 기준)
-        happy_calls = {
-            '3month': calls_today.filter(
-                customer__actual_inspection_date__gte=today - timedelta(days=97),
-                customer__actual_inspection_date__lte=today - timedelta(days=83)
-            ).count(),
-            '6month': calls_today.filter(
-                customer__actual_inspection_date__gte=today - timedelta(days=187),
-                customer__actual_inspection_date__lte=today - timedelta(days=173)
-            ).count(),
-            '12month': calls_today.filter(
-                customer__actual_inspection_date__gte=today - timedelta(days=372),
-                customer__actual_inspection_date__lte=today - timedelta(days=358)
-            ).count(),
-            '18month': calls_today.filter(
-                customer__actual_inspection_date__gte=today - timedelta(days=555),
-                customer__actual_inspection_date__lte=today - timedelta(days=541)
-            ).count(),
-        }
+        happy_calls = {key: metrics[f'happy_call_{key}'] for key in HAPPY_CALL_KEYS}
         
         # 통화 성공률
         success_rate = 0
@@ -1778,17 +1222,10 @@ def team_dashboard(request):
             achievement_rate = round((today_total / daily_target) * 100, 1)
         
         # 마지막 활동 시간
-        last_call = calls_today.order_by('-call_date').first()
-        last_activity = last_call.call_date if last_call else None
+        last_activity = metrics['last_activity']
         
-        # 상태 판단 (30분 이내 활동이면 online)
-        status = 'offline'
-        if last_activity:
-            time_diff = timezone.now() - last_activity
-            if time_diff.seconds < 1800:  # 30분
-                status = 'online'
-            elif time_diff.seconds < 3600:  # 1시간
-                status = 'idle'
+        # 접속 상태 (하트비트/통화 저장 기준)
+        status = presence[agent.id]['status']
         
         # 팀장 여부 확인
         is_manager = hasattr(agent, 'userprofile') and agent.userprofile.role in ['manager', 'admin']
@@ -1832,39 +1269,12 @@ def team_dashboard(request):
         ) if agent_performances else 0,
     }
     
-    # 시간대별 통화 분포 (오늘)
-    hourly_data = []
-    max_hourly_calls = 0
-    
-    for hour in range(9, 19):  # 9시부터 18시까지
-        hour_calls = CallRecord.objects.filter(
-            caller__in=team_agents,
-            call_date__date=today,
-            call_date__hour=hour,
-            is_deleted=False
-        ).count()
-        
-        if hour_calls > max_hourly_calls:
-            max_hourly_calls = hour_calls
-        
-        hourly_data.append({
-            'hour': f"{hour:02d}:00",
-            'hour_display': f"{hour:02d}시",
-            'count': hour_calls
-        })
-    
-    # 비율 계산
-    if max_hourly_calls > 0:
-        for item in hourly_data:
-            item['percentage'] = round((item['count'] / max_hourly_calls) * 100, 1)
-    else:
-        for item in hourly_data:
-            item['percentage'] = 0
+    # 시간대별 통화 분포 (오늘, 업무 시간 기준 1회 집계)
+    hourly_data = call_distribution(today, today, caller_ids=[agent.id for agent in team_agents])['buckets']
     
     # 최근 통화 기록 (팀 전체, 오늘)
-    recent_team_calls = CallRecord.objects.filter(
+    recent_team_calls = CallRecord.objects.on_local_day(today).filter(
         caller__in=team_agents,
-        call_date__date=today,
         is_deleted=False
     ).select_related('customer', 'caller').order_by('-call_date')[:20]
     
@@ -1879,78 +1289,113 @@ def team_dashboard(request):
     # 팀별 요약 (관리자가 전체 팀 볼 때만)
     team_summaries = []
     if is_admin and not selected_team and available_teams:
-        for team in available_teams:
-            team_members = User.objects.filter(
-                userprofile__team=team,
-                is_active=True
-            ).select_related('userprofile')
-            
-            team_manager = team_members.filter(userprofile__role__in=['manager', 'admin']).first()
-            team_agent_count = team_members.count()  
-            
-            # 오늘 통화 통계
-            team_calls_today = CallRecord.objects.filter(
-                caller__in=team_members,
-                call_date__date=today,
-                is_deleted=False
-            )
-            
-            total_today = team_calls_today.count()
-            connected_today = team_calls_today.filter(call_result='connected').count()
+        # 오늘 통화 통계 (팀 수와 관계없이 2회 집계)
+        for team, summary in team_metrics(available_teams, today, today).items():
+            total_today = summary['total_calls']
             
             # 목표 달성률 계산
-            team_daily_target = sum(
-                member.userprofile.daily_call_target 
-                for member in team_members 
-                if hasattr(member, 'userprofile')
-            )
-            
             achievement_rate = 0
-            if team_daily_target > 0:
-                achievement_rate = round((total_today / team_daily_target) * 100, 1)
+            if summary['daily_target'] > 0:
+                achievement_rate = round((total_today / summary['daily_target']) * 100, 1)
             
             success_rate = 0
             if total_today > 0:
-                success_rate = round((connected_today / total_today) * 100, 1)
+                success_rate = round((summary['connected_calls'] / total_today) * 100, 1)
             
             team_summaries.append({
                 'team_name': team,
-                'manager_name': team_manager.username if team_manager else None,
-                'agent_count': team_agent_count,
+                'manager_name': summary['manager'].username if summary['manager'] else None,
+                'agent_count': summary['agent_count'],
                 'today_calls': total_today,
                 'success_rate': success_rate,
                 'achievement_rate': achievement_rate,
             })
     
-    sidebar_stats = get_sidebar_stats()
-    
-    context = {
-        'selected_team': selected_team,
-        'available_teams': list(available_teams) if available_teams else [],
-        'is_admin': is_admin,
+    return {
         'team_summaries': team_summaries,
-        'team_agents': team_agents,
+        'team_agents': list(team_agents),
         'agent_performances': agent_performances,
         'team_stats': team_stats,
         'hourly_data': hourly_data,
-        'recent_team_calls': recent_team_calls,
-        'pending_followups': pending_followups,
-        'date_from': date_from,
-        'date_to': date_to,
-        'today': today,
+        'recent_team_calls': list(recent_team_calls),
+        'pending_followups': list(pending_followups),
     }
-    context.update(sidebar_stats)
-    
-    return render(request, 'team_dashboard.html', context)
 
 
 @login_required
-@admin_required
-def admin_dashboard(request):
-    """관리자 대시보드 - 전체 팀/팀장 성과 모니터링"""
-    today = timezone.now().date()
+@manager_required
+def team_dashboard(request):
+    """팀장 대시보드 - 팀원 성과 모니터링"""
+    today = timezone.localdate()
     
-    # 기간 설정
+    # 사용자 프로필 및 권한 확인
+    user_profile = request.user.userprofile if hasattr(request.user, 'userprofile') else None
+
+    if not user_profile:
+        # UserProfile이 없는 경우 생성
+        user_profile, created = UserProfile.objects.get_or_create(
+            user=request.user,
+            defaults={
+                'role': 'admin' if request.user.is_superuser else 'agent',
+                'team': '운영팀' if request.user.is_superuser else '',
+                'daily_call_target': 0 if request.user.is_superuser else 100
+            }
+        )
+
+    is_admin = user_profile and user_profile.role == 'admin'
+
+    # 사용 가능한 팀 목록 생성
+    available_teams = []
+    selected_team = request.GET.get('team', '')
+    
+    if is_admin:
+        # 관리자는 모든 팀 목록 가져오기
+        available_teams = UserProfile.objects.exclude(
+            team__isnull=True
+        ).exclude(
+            team=''
+        ).values_list('team', flat=True).distinct().order_by('team')
+
+        if selected_team and selected_team in available_teams:
+            # 특정 팀 선택됨 - 팀장과 팀원 모두 포함
+            from django.db.models import Q
+            team_agents = User.objects.filter(
+                Q(userprofile__team=selected_team),
+                is_active=True
+            ).select_related('userprofile').order_by(
+                '-userprofile__role',  # 팀장(manager)이 먼저 오도록
+                'username'
+            )
+        else:
+            # 전체 팀 보기
+            selected_team = ''
+            team_agents = User.objects.filter(
+                is_active=True,
+                userprofile__role__in=['agent', 'manager', 'admin']  # ⭐ 모든 역할 포함
+            ).select_related('userprofile').order_by(
+                '-userprofile__role',
+                'username'
+            )
+    else:
+        # 팀장은 자기 팀만
+        team_name = user_profile.team if user_profile else None
+
+        if team_name:
+            selected_team = team_name
+            # 팀장 본인과 팀원들 모두 포함
+            from django.db.models import Q
+            team_agents = User.objects.filter(
+                Q(userprofile__team=team_name),
+                is_active=True
+            ).select_related('userprofile').order_by(
+                '-userprofile__role',  # 팀장이 먼저 오도록
+                'username'
+            )
+        else:
+            # 팀이 없으면 본인만
+            team_agents = User.objects.filter(id=request.user.id)
+
+    # 기간 설정 - 기본값 오늘
     date_from_str = request.GET.get('date_from')
     date_to_str = request.GET.get('date_to')
     
@@ -1958,9 +1403,9 @@ def admin_dashboard(request):
         try:
             date_from = datetime.strptime(date_from_str, '%Y-%m-%d').date()
         except:
-            date_from = today - timedelta(days=7)
+            date_from = today
     else:
-        date_from = today - timedelta(days=7)  # 기본 7일
+        date_from = today
     
     if date_to_str:
         try:
@@ -1970,40 +1415,49 @@ def admin_dashboard(request):
     else:
         date_to = today
     
-    # 팀별 성과 수집
-    teams = UserProfile.objects.values_list('team', flat=True).distinct().exclude(team='').exclude(team__isnull=True)
+    # 같은 팀/기간 보드는 스냅샷 공유 (동시 요청은 첫 계산 결과를 기다림)
+    if is_admin and not selected_team:
+        board_scope = 'all'
+    elif selected_team:
+        board_scope = f'team:{selected_team}'
+    else:
+        board_scope = f'user:{request.user.id}'
+    
+    board = get_snapshot(
+        'team_board',
+        [board_scope, date_from, date_to, today],
+        lambda: _build_team_board(team_agents, is_admin, selected_team, available_teams, date_from, date_to, today),
+    )
+    
+    sidebar_stats = get_sidebar_stats()
+    
+    context = {
+        'selected_team': selected_team,
+        'available_teams': list(available_teams) if available_teams else [],
+        'is_admin': is_admin,
+        'date_from': date_from,
+        'date_to': date_to,
+        'today': today,
+        'live_events': live_events_config(),
+    }
+    context.update(board)
+    context.update(sidebar_stats)
+    
+    return render(request, 'team_dashboard.html', context)
+
+
+def _build_admin_board(date_from, date_to, today, trend_period='day'):
+    """관리자 대시보드 보드 계산 (스냅샷으로 공유됨)"""
+    # 팀별 성과 수집 (팀 수와 관계없이 2회 집계)
+    teams = list(UserProfile.objects.values_list('team', flat=True).distinct().exclude(team='').exclude(team__isnull=True))
+    days_count = (date_to - date_from).days + 1
     team_performances = []
     
-    for team_name in teams:
-        # 팀 구성원 (팀장 + 팀원 모두 포함)
-        team_members = User.objects.filter(
-            userprofile__team=team_name,
-            is_active=True
-        ).select_related('userprofile')
-        
-        team_manager = team_members.filter(userprofile__role__in=['manager', 'admin']).first()
-        team_agents = team_members  # 팀장 포함 전체를 agents로 사용
-        
-        # 팀 통화 기록
-        team_calls = CallRecord.objects.filter(
-            caller__in=team_members,  # team_agents 대신 team_members 사용
-            call_date__date__gte=date_from,
-            call_date__date__lte=date_to,
-            is_deleted=False
-        )
-        
-        total_calls = team_calls.count()
-        connected_calls = team_calls.filter(call_result='connected').count()
+    for team_name, team in team_metrics(teams, date_from, date_to).items():
+        total_calls = team['total_calls']
         
         # 팀 목표 및 달성률
-        team_daily_target = sum(
-            member.userprofile.daily_call_target 
-            for member in team_agents
-            if hasattr(member, 'userprofile')
-        )
-        
-        days_count = (date_to - date_from).days + 1
-        team_period_target = team_daily_target * days_count
+        team_period_target = team['daily_target'] * days_count
         
         achievement_rate = 0
         if team_period_target > 0:
@@ -2012,39 +1466,30 @@ def admin_dashboard(request):
         # 성공률
         success_rate = 0
         if total_calls > 0:
-            success_rate = round((connected_calls / total_calls) * 100, 1)
+            success_rate = round((team['connected_calls'] / total_calls) * 100, 1)
         
         # 관심 고객 및 후속조치
-        interested_customers = team_calls.filter(
-            interest_type__in=['insurance', 'maintenance', 'financing', 'multiple']
-        ).values('customer').distinct().count()
-        
         followup_completion_rate = 0
-        followup_required = team_calls.filter(requires_follow_up=True).count()
-        if followup_required > 0:
-            followup_completed = team_calls.filter(
-                requires_follow_up=True,
-                follow_up_completed=True
-            ).count()
-            followup_completion_rate = round((followup_completed / followup_required) * 100, 1)
+        if team['followup_required'] > 0:
+            followup_completion_rate = round((team['followup_completed'] / team['followup_required']) * 100, 1)
         
         # 관심 고객 비율 계산
         interested_ratio = 0
         if total_calls > 0:
-            interested_ratio = round((interested_customers / total_calls) * 100, 1)
+            interested_ratio = round((team['interested_customers'] / total_calls) * 100, 1)
         
         team_performances.append({
             'team_name': team_name,
-            'manager': team_manager,
-            'agent_count': team_agents.count(),
+            'manager': team['manager'],
+            'agent_count': team['agent_count'],
             'total_calls': total_calls,
-            'connected_calls': connected_calls,
+            'connected_calls': team['connected_calls'],
             'success_rate': success_rate,
-            'interested_customers': interested_customers,
+            'interested_customers': team['interested_customers'],
             'interested_ratio': interested_ratio,
             'achievement_rate': achievement_rate,
             'followup_completion_rate': followup_completion_rate,
-            'daily_target': team_daily_target,
+            'daily_target': team['daily_target'],
             'period_target': team_period_target,
         })
     
@@ -2052,66 +1497,56 @@ def admin_dashboard(request):
     team_performances = sorted(team_performances, key=lambda x: x['achievement_rate'], reverse=True)
     
     # 전체 통계
-    all_calls = CallRecord.objects.filter(
-        call_date__date__gte=date_from,
-        call_date__date__lte=date_to,
+    all_calls = CallRecord.objects.between_local_days(date_from, date_to).filter(
         is_deleted=False
     )
     
+    call_totals = AgentDailyStats.objects.filter(
+        stat_date__gte=date_from,
+        stat_date__lte=date_to
+    ).aggregate(
+        total_calls=Coalesce(Sum('total_calls'), 0),
+        total_connected=Coalesce(Sum('connected_calls'), 0)
+    )
+
     overall_stats = {
         'total_teams': len(teams),
         'total_managers': User.objects.filter(userprofile__role='manager', is_active=True).count(),
         'total_agents': User.objects.filter(userprofile__role='agent', is_active=True).count(),
-        'total_calls': all_calls.count(),
-        'total_connected': all_calls.filter(call_result='connected').count(),
-        'total_customers': Customer.objects.filter(
-            call_records__call_date__date__gte=date_from,
-            call_records__call_date__date__lte=date_to,
-            call_records__is_deleted=False
-        ).distinct().count(),
+        'total_calls': call_totals['total_calls'],
+        'total_connected': call_totals['total_connected'],
+        'total_customers': all_calls.values('customer').distinct().count(),
         'new_interested': all_calls.filter(
             interest_type__in=['insurance', 'maintenance', 'financing', 'multiple']
         ).values('customer').distinct().count(),
     }
     
-    # 일별 성과 추이
-    daily_performance = []
-    current_date = date_from
-    while current_date <= date_to:
-        day_calls = all_calls.filter(call_date__date=current_date)
-        daily_performance.append({
-            'date': current_date,
-            'total': day_calls.count(),
-            'connected': day_calls.filter(call_result='connected').count(),
-        })
-        current_date += timedelta(days=1)
-    
-    # 상담원별 TOP 10 (기간 내)
+    # 일/주/월별 성과 추이 (기간과 관계없이 1회 집계)
+    daily_performance = call_time_series(date_from, date_to, period=trend_period)
+    
+    # 상담원별 TOP 10 (기간 내, 상담원 일별 집계 기준)
+    top_rows = AgentDailyStats.objects.filter(
+        stat_date__gte=date_from,
+        stat_date__lte=date_to,
+        caller__userprofile__role='agent',
+        caller__is_active=True
+    ).values('caller_id').annotate(
+        total=Sum('total_calls'),
+        connected=Sum('connected_calls')
+    ).filter(total__gt=0).order_by('-total')[:10]
+    top_rows = list(top_rows)
+    top_users = User.objects.select_related('userprofile').in_bulk([row['caller_id'] for row in top_rows])
+
     top_agents = []
-    agents = User.objects.filter(userprofile__role='agent', is_active=True)
-    
-    for agent in agents:
-        agent_calls = CallRecord.objects.filter(
-            caller=agent,
-            call_date__date__gte=date_from,
-            call_date__date__lte=date_to,
-            is_deleted=False
-        )
-        total = agent_calls.count()
-        if total > 0:
-            connected = agent_calls.filter(call_result='connected').count()
-            success_rate = round((connected / total) * 100, 1) if total > 0 else 0
-            
-            top_agents.append({
-                'agent': agent,
-                'total_calls': total,
-                'connected_calls': connected,
-                'success_rate': success_rate,
-                'team': agent.userprofile.team if hasattr(agent, 'userprofile') else '-'
-            })
-    
-    # 통화 수 기준 정렬 후 상위 10명
-    top_agents = sorted(top_agents, key=lambda x: x['total_calls'], reverse=True)[:10]
+    for row in top_rows:
+        agent = top_users[row['caller_id']]
+        top_agents.append({
+            'agent': agent,
+            'total_calls': row['total'],
+            'connected_calls': row['connected'],
+            'success_rate': round((row['connected'] / row['total']) * 100, 1),
+            'team': agent.userprofile.team if hasattr(agent, 'userprofile') else '-'
+        })
     
     # 실시간 알림 생성
     alerts = []
@@ -2142,18 +1577,63 @@ def admin_dashboard(request):
             'time': '10분 전'
         })
     
-    sidebar_stats = get_sidebar_stats()
-    
-    context = {
+    return {
         'team_performances': team_performances,
         'overall_stats': overall_stats,
         'daily_performance': daily_performance,
         'top_agents': top_agents,
         'alerts': alerts,
+    }
+
+
+@login_required
+@admin_required
+def admin_dashboard(request):
+    """관리자 대시보드 - 전체 팀/팀장 성과 모니터링"""
+    today = timezone.localdate()
+    
+    # 기간 설정
+    date_from_str = request.GET.get('date_from')
+    date_to_str = request.GET.get('date_to')
+    
+    if date_from_str:
+        try:
+            date_from = datetime.strptime(date_from_str, '%Y-%m-%d').date()
+        except:
+            date_from = today - timedelta(days=7)
+    else:
+        date_from = today - timedelta(days=7)  # 기본 7일
+    
+    if date_to_str:
+        try:
+            date_to = datetime.strptime(date_to_str, '%Y-%m-%d').date()
+        except:
+            date_to = today
+    else:
+        date_to = today
+    
+    # 추이 집계 단위 (day/week/month)
+    trend_period = request.GET.get('period', 'day')
+    if trend_period not in SERIES_PERIODS:
+        trend_period = 'day'
+    
+    # 같은 기간 보드는 스냅샷 공유 (동시 요청은 첫 계산 결과를 기다림)
+    board = get_snapshot(
+        'admin_board',
+        [date_from, date_to, today, trend_period],
+        lambda: _build_admin_board(date_from, date_to, today, trend_period),
+    )
+    
+    sidebar_stats = get_sidebar_stats()
+    
+    context = {
         'date_from': date_from,
         'date_to': date_to,
         'today': today,
+        'trend_period': trend_period,
+        'live_events': live_events_config(),
     }
+    context.update(board)
     context.update(sidebar_stats)
     
     return render(request, 'admin_dashboard.html', context)
@@ -2164,12 +1644,12 @@ def admin_dashboard(request):
 def team_performance_api(request):
     """팀 성과 실시간 API"""
     team_name = request.GET.get('team')
-    date_str = request.GET.get('date', timezone.now().date().isoformat())
+    date_str = request.GET.get('date', timezone.localdate().isoformat())
     
     try:
         target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
     except:
-        target_date = timezone.now().date()
+        target_date = timezone.localdate()
     
     # 팀 구성원
     if team_name:
@@ -2183,30 +1663,71 @@ def team_performance_api(request):
             is_active=True
         )
     
-    # 실시간 데이터
-    performance_data = []
-    for member in team_members:
-        calls_today = CallRecord.objects.filter(
-            caller=member,
-            call_date__date=target_date,
-            is_deleted=False
-        )
-        
-        performance_data.append({
-            'id': member.id,
-            'name': member.username,
-            'total_calls': calls_today.count(),
-            'connected': calls_today.filter(call_result='connected').count(),
-            'last_call': calls_today.order_by('-call_date').first().call_date.isoformat() if calls_today.exists() else None,
-            'status': 'active' if calls_today.filter(
-                call_date__gte=timezone.now() - timedelta(minutes=30)
-            ).exists() else 'idle'
+    # 실시간 데이터 (구성원 수와 관계없이 1회 집계)
+    performance_data = member_activity(team_members, target_date)
+    
+    # 내용이 같으면 304 (폴링 응답 본문 생략)
+    etag = quote_etag(hashlib.md5(
+        json.dumps(performance_data, sort_keys=True).encode()
+    ).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse({
+            'success': True,
+            'data': performance_data,
+            'timestamp': timezone.now().isoformat()
         })
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required
+@ajax_manager_required
+def call_distribution_api(request):
+    """시간대별 통화 분포 API (차트용)"""
+    today = timezone.localdate()
+    try:
+        date_from = datetime.strptime(request.GET.get('date_from', today.isoformat()), '%Y-%m-%d').date()
+        date_to = datetime.strptime(request.GET.get('date_to', date_from.isoformat()), '%Y-%m-%d').date()
+        interval = int(request.GET.get('interval', 60))
+        start_hour = int(request.GET['start_hour']) if request.GET.get('start_hour') else None
+        end_hour = int(request.GET['end_hour']) if request.GET.get('end_hour') else None
+        agent_id = int(request.GET['agent']) if request.GET.get('agent') else None
+    except ValueError:
+        return JsonResponse({'success': False, 'error': '잘못된 조회 조건입니다.'}, status=400)
+    
+    if interval not in DISTRIBUTION_INTERVALS or date_from > date_to:
+        return JsonResponse({'success': False, 'error': '잘못된 조회 조건입니다.'}, status=400)
+    if any(hour is not None and not 0 <= hour <= 24 for hour in (start_hour, end_hour)):
+        return JsonResponse({'success': False, 'error': '업무 시간은 0~24시 사이여야 합니다.'}, status=400)
+    
+    # 대상 상담원 (상담원 지정 > 팀 지정 > 전체)
+    caller_ids = None
+    if agent_id:
+        caller_ids = [agent_id]
+    elif request.GET.get('team'):
+        caller_ids = list(User.objects.filter(
+            userprofile__team=request.GET['team'],
+            is_active=True
+        ).values_list('id', flat=True))
+    
+    distribution = call_distribution(
+        date_from, date_to,
+        caller_ids=caller_ids,
+        interval=interval,
+        start_hour=start_hour,
+        end_hour=end_hour,
+    )
     
     return JsonResponse({
         'success': True,
-        'data': performance_data,
-        'timestamp': timezone.now().isoformat()
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+        'interval': interval,
+        'data': distribution['buckets'],
+        'total': distribution['total'],
+        'outside_hours': distribution['outside_hours'],
     })
 
 
@@ -2221,28 +1742,19 @@ def agent_performance_api(request, agent_id):
             if request.user != agent:
                 return JsonResponse({'success': False, 'error': '권한이 없습니다.'})
         
-        # 기간 설정
+        # 기간 설정 (오늘 제외 최근 N일)
         days = int(request.GET.get('days', 7))
-        date_from = timezone.now().date() - timedelta(days=days)
+        date_from = timezone.localdate() - timedelta(days=days)
+        date_to = date_from + timedelta(days=days - 1)
+        period = request.GET.get('period', 'day')
+        if period not in SERIES_PERIODS:
+            period = 'day'
         
-        # 일별 성과
-        daily_data = []
-        for i in range(days):
-            target_date = date_from + timedelta(days=i)
-            day_calls = CallRecord.objects.filter(
-                caller=agent,
-                call_date__date=target_date,
-                is_deleted=False
-            )
-            
-            daily_data.append({
-                'date': target_date.isoformat(),
-                'total': day_calls.count(),
-                'connected': day_calls.filter(call_result='connected').count(),
-                'interested': day_calls.filter(
-                    interest_type__in=['insurance', 'maintenance', 'financing', 'multiple']
-                ).count()
-            })
+        # 일/주/월별 성과 (1회 집계)
+        daily_data = [
+            dict(row, date=row['date'].isoformat())
+            for row in call_time_series(date_from, date_to, caller_ids=[agent.id], period=period)
+        ]
         
         return JsonResponse({
             'success': True,
@@ -2251,6 +1763,7 @@ def agent_performance_api(request, agent_id):
                 'name': agent.username,
                 'team': agent.userprofile.team if hasattr(agent, 'userprofile') else None
             },
+            'period': period,
             'daily_data': daily_data
         })
         
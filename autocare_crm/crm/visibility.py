@@ -0,0 +1,68 @@
+# crm/visibility.py
+"""상담원별 조회 가능 고객 (CustomerVisibility) 관리
+
+상담원은 배정 중인 고객과 본인이 통화한 적이 있는 고객만 볼 수 있다.
+배정 생성/상태 변경과 통화 기록 저장/삭제 시 해당 (상담원, 고객) 한 행만 갱신하므로
+상담원 고객 목록은 통화 기록 전체를 조인하거나 DISTINCT 하지 않는다.
+bulk_create/update() 처럼 시그널이 없는 일괄 작업 후에는
+rebuild_customer_visibility 명령으로 전체 재계산한다.
+"""
+from django.db import transaction
+
+from .models import CallAssignment, CallRecord, Customer, CustomerVisibility
+
+
+ACTIVE_ASSIGNMENT_STATUSES = ['pending', 'in_progress']
+
+
+def sync_customer_visibility(agent_id, customer_id):
+    """원본 배정/통화 기록으로 (상담원, 고객) 한 행 다시 계산"""
+    is_assigned = CallAssignment.objects.filter(
+        assigned_to_id=agent_id,
+        customer_id=customer_id,
+        status__in=ACTIVE_ASSIGNMENT_STATUSES
+    ).exists()
+    has_called = CallRecord.objects.filter(caller_id=agent_id, customer_id=customer_id).exists()
+
+    if is_assigned or has_called:
+        CustomerVisibility.objects.update_or_create(
+            agent_id=agent_id,
+            customer_id=customer_id,
+            defaults={'is_assigned': is_assigned, 'has_called': has_called}
+        )
+    else:
+        CustomerVisibility.objects.filter(agent_id=agent_id, customer_id=customer_id).delete()
+
+
+def record_call_visibility(call_record):
+    """신규 통화 기록은 확인 없이 바로 통화이력 표시"""
+    CustomerVisibility.objects.update_or_create(
+        agent_id=call_record.caller_id,
+        customer_id=call_record.customer_id,
+        defaults={'has_called': True}
+    )
+
+
+def rebuild_customer_visibility():
+    """전체 재계산, 생성된 행 수 반환"""
+    assigned = set(CallAssignment.objects.filter(
+        status__in=ACTIVE_ASSIGNMENT_STATUSES
+    ).values_list('assigned_to_id', 'customer_id').distinct())
+    called = set(CallRecord.objects.values_list('caller_id', 'customer_id').distinct())
+
+    with transaction.atomic():
+        CustomerVisibility.objects.all().delete()
+        return len(CustomerVisibility.objects.bulk_create([
+            CustomerVisibility(
+                agent_id=agent_id,
+                customer_id=customer_id,
+                is_assigned=(agent_id, customer_id) in assigned,
+                has_called=(agent_id, customer_id) in called,
+            )
+            for agent_id, customer_id in assigned | called
+        ], batch_size=1000))
+
+
+def visible_customers(user):
+    """상담원이 조회할 수 있는 고객 (고유 제약이 있어 DISTINCT 불필요)"""
+    return Customer.objects.filter(visibility__agent=user)